@@ -1,38 +1,280 @@
-from flask import Flask, render_template, request, jsonify, redirect, url_for, session, flash, make_response
+from flask import Flask, render_template, request, jsonify, redirect, url_for, session, flash, make_response, send_file, abort, g, has_request_context, stream_with_context
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import load_only, with_expression
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from flask_migrate import Migrate
+from markupsafe import escape
+from jinja2 import nodes
+from jinja2.ext import Extension
 from werkzeug.security import generate_password_hash, check_password_hash
-from werkzeug.utils import secure_filename
+from werkzeug.utils import safe_join
 from functools import wraps
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta
+from collections import OrderedDict, Counter, deque
+from types import SimpleNamespace
 import os
+import re
+import sys
 import uuid
-from openpyxl import Workbook
+import threading
+import sqlite3
+import random
+import time
+import json
+import hashlib
+import base64
+import binascii
+from openpyxl import Workbook, load_workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, Alignment, PatternFill
-from io import BytesIO
+from openpyxl.utils import get_column_letter
+from io import StringIO, TextIOWrapper
+import csv
+import glob
+import gzip
+import zlib
+import mimetypes
+import html
+import unicodedata
+import click
+import tempfile
+import bisect
+import ipaddress
+import atexit
+import shutil
+import multiprocessing
 from urllib.parse import quote
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow 为可选依赖，未安装时上传图片只保存原图
+    Image = ImageOps = None
+try:
+    import fcntl
+except ImportError:  # Windows 下没有 fcntl，写缓冲的溢出文件按单进程处理
+    fcntl = None
+try:
+    import brotli
+except ImportError:  # brotli 为可选依赖，未安装时只生成 gzip 版本
+    brotli = None
 
 app = Flask(__name__)
 
 # 配置数据库
 basedir = os.path.abspath(os.path.dirname(__file__))
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///' + os.path.join(basedir, 'qhsf_hsd.db')
+# 设置环境变量 DATABASE_URL 可使用其他 SQLite 数据库文件（如测试用的临时数据库），默认使用项目目录下的 qhsf_hsd.db
+app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', 'sqlite:///' + os.path.join(basedir, 'qhsf_hsd.db'))
+# 写入路径使用 SQLite 的 INSERT ... ON CONFLICT、触发器和 FTS5，不支持其他数据库
+if not app.config['SQLALCHEMY_DATABASE_URI'].startswith('sqlite:'):
+    raise RuntimeError('DATABASE_URL 必须是 SQLite 数据库（sqlite:///...）')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 app.config['SECRET_KEY'] = 'qhsf-hsd-secret-key-2024'
 
+# SQLite 每个连接建立时执行的 PRAGMA
+app.config['SQLITE_PRAGMAS'] = {
+    'journal_mode': 'WAL',  # 读写互不阻塞，多个进程同时访问时必需
+    'synchronous': 'NORMAL',  # WAL 模式下不会损坏数据库，只在断电时可能丢失最后提交的事务
+    'busy_timeout': 5000,  # 遇到锁时等待的毫秒数
+    'cache_size': -20000,  # 负数单位为 KiB，即每个连接约 20MB 页缓存
+    'mmap_size': 256 * 1024 * 1024,
+    'temp_store': 'MEMORY',
+}
+# 写事务遇到数据库锁时的重试
+app.config['DB_LOCK_RETRIES'] = 5
+app.config['DB_LOCK_RETRY_DELAY'] = 0.05  # 第一次重试前等待的秒数，之后每次翻倍
+app.config['DB_LOCK_RETRY_MAX_DELAY'] = 1.0
+app.config['DB_LOCK_MAX_WAIT'] = 12  # 一次写事务等锁的总秒数上限（含每次执行的 busy_timeout），需小于 worker 的请求超时
+
 # 文件上传配置
 app.config['UPLOAD_FOLDER'] = os.path.join(basedir, 'static', 'uploads')
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
 ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg'}
+app.config['IMAGE_VARIANTS'] = {'thumb': 320, 'card': 640, 'full': 1280}  # 上传图片生成的版本及宽度（像素）
+app.config['IMAGE_QUALITY'] = {'webp': 80, 'jpeg': 82}
+app.config['IMAGE_WORKERS'] = 2  # 处理图片的线程数
+app.config['UPLOAD_SWEEP_GRACE'] = 3600  # 未被引用的上传文件至少保留的时间（秒），避免清理到刚上传、尚未保存记录的文件
+
+# 页面缓存配置
+app.config['PAGE_CACHE_SIZE'] = 256  # 最多缓存的页面数，超出后按LRU淘汰
+app.config['PAGE_CACHE_TTL'] = 300  # 缓存有效期（秒）
+app.config['FRAGMENT_CACHE_ENABLED'] = True  # 模板中 {% cache %} 片段缓存的开关（调试模式下不缓存）
+app.config['FRAGMENT_CACHE_SIZE'] = 512  # 最多缓存的模板片段数
+app.config['FRAGMENT_CACHE_TTL'] = 600  # {% cache %} 未指定有效期时的默认值（秒）
+app.config['QUERY_COUNT_HEADER'] = False  # 为True（或调试模式）时在响应头中返回本次请求的SQL查询次数
+app.config['QUERY_AUDIT'] = False  # 为True（或调试模式）时记录每个请求执行的SQL，同一形态的语句重复执行时在日志中警告（疑似N+1查询）
+app.config['QUERY_AUDIT_REPEAT_THRESHOLD'] = 3  # 同一形态的语句在一个请求中执行达到该次数即视为重复
+app.config['LIST_PAGE_SIZE'] = 12  # 活动/新闻/学生展示页每页条数，其余通过“加载更多”按游标获取
+
+# 请求指标配置
+app.config['METRICS_ENABLED'] = True  # 记录每个路由的耗时、SQL查询和响应大小，通过 /metrics 以 Prometheus 文本格式输出
+app.config['METRICS_ALLOWED_NETWORKS'] = []  # 无需登录即可读取 /metrics 的来源网段（如 ['10.0.0.5/32']）；默认只对管理员开放
+
+# 响应压缩配置
+app.config['COMPRESS_MIMETYPES'] = {'text/html', 'application/json', 'text/plain', 'text/csv', 'application/x-ndjson'}
+app.config['COMPRESS_MIN_SIZE'] = 500  # 小于该字节数的响应不压缩
+app.config['COMPRESS_LEVEL'] = 6  # gzip 压缩级别（1-9）
+app.config['COMPRESS_BROTLI_LEVEL'] = 4  # brotli 压缩级别（0-11），安装了 brotli 时优先使用
+app.config['COMPRESS_STREAMS'] = True  # 是否逐块压缩流式响应（如学生信息导出）
+
+# 密码哈希配置
+app.config['PASSWORD_HASH_METHOD'] = 'pbkdf2:sha256:600000'  # 修改后旧密码在用户下次登录时自动按新参数重新哈希
+app.config['PASSWORD_SALT_LENGTH'] = 16
+app.config['PASSWORD_HASH_WORKERS'] = 2  # 计算哈希的进程数，即认证最多占用的CPU核数；为0时在请求线程中直接计算
+app.config['PASSWORD_HASH_QUEUE'] = 16  # 排队等待的哈希任务上限，超出时返回503
+app.config['PASSWORD_HASH_TIMEOUT'] = 10  # 等待单个哈希任务的秒数
+
+# 公开表单写缓冲配置
+app.config['WRITE_BUFFER_ENABLED'] = False  # 为True时加入申请和联系表单先写入缓冲区，由后台线程批量入库
+app.config['WRITE_BUFFER_FLUSH_SIZE'] = 100  # 缓冲的提交达到该数量时立即写入
+app.config['WRITE_BUFFER_FLUSH_INTERVAL'] = 0.5  # 最长缓冲时间（秒）
+app.config['WRITE_BUFFER_FOLDER'] = os.path.join(basedir, 'write_buffer')  # 溢出文件目录，进程崩溃后重启时从这里恢复
+app.config['WRITE_BUFFER_FSYNC'] = True  # 每次提交后 fsync 溢出文件，断电也不丢失已受理的提交
+
+# 数据统计配置
+app.config['STATS_ROLLUP_ENABLED'] = False  # 为True时统计页读取由触发器增量维护的汇总表
+
+# 后台导出配置
+app.config['EXPORT_FOLDER'] = os.path.join(basedir, 'exports')
+app.config['EXPORT_WORKERS'] = 2  # 同时生成导出文件的线程数
+app.config['EXPORT_REUSE_SECONDS'] = 300  # 相同条件的导出在此时间内复用已生成的文件
+app.config['EXPORT_RETENTION_SECONDS'] = 3600  # 导出文件保留时间，过期后由后台线程删除
+app.config['EXPORT_GC_INTERVAL'] = 600  # 清理过期导出文件的间隔（秒）
+
+# 批量导入配置
+app.config['IMPORT_BATCH_SIZE'] = 1000  # 每批校验和写入的行数
+
+# 静态站点导出配置
+app.config['FREEZE_OUTPUT'] = os.path.join(basedir, 'site')  # flask freeze 的输出目录，内容可直接发布到 GitHub Pages
+app.config['FREEZE_DYNAMIC_URL'] = ''  # 动态站点地址（如 https://app.qhsf-hsd.com），静态页面中登录/加入/后台等链接指向这里
+app.config['FREEZE_WORKERS'] = os.cpu_count() or 1  # 并行渲染页面的进程数
 
 # 检查文件扩展名的函数
 def allowed_file(filename):
     return '.' in filename and \
            filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+# 由 SQLite 触发器维护的辅助表（全文索引等），不参与 Alembic 自动生成迁移
+def include_object(obj, name, type_, reflected, compare_to):
+    if type_ == 'table' and name.startswith('search_index'):
+        return False
+    return True
+
 # 初始化扩展
 db = SQLAlchemy(app)
-migrate = Migrate(app, db)
+migrate = Migrate(app, db, include_object=include_object)
+
+# 渲染结果缓存
+class PageCache:
+    """LRU + TTL 的页面缓存，每个条目带有标签，后台写操作按标签失效"""
+
+    def __init__(self, max_size=256, ttl=300):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (过期时间, 标签集合, 缓存值)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, tags, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, tags=(), ttl=None):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + (ttl or self.ttl), frozenset(tags), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *tags):
+        """删除带有任一指定标签的条目"""
+        tags = set(tags)
+        with self._lock:
+            stale = [key for key, (_, entry_tags, _) in self._entries.items() if entry_tags & tags]
+            for key in stale:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def variant(self, variants, encoding, build):
+        """取缓存值中按编码保存的压缩结果，没有时用 build() 生成后保存
+        
+        variants 字典在多个请求线程间共享，读写都在锁内进行；压缩在锁外，同时生成时保留先写入的结果。
+        """
+        with self._lock:
+            data = variants.get(encoding)
+        if data is None:
+            data = build()
+            with self._lock:
+                data = variants.setdefault(encoding, data)
+        return data
+
+    def __len__(self):
+        return len(self._entries)
+
+page_cache = PageCache(app.config['PAGE_CACHE_SIZE'], app.config['PAGE_CACHE_TTL'])
+
+def cached_page(*tags):
+    """缓存公开页面的渲染结果，tags 为页面依赖的数据表
+    
+    放在 conditional_get 之下使用：键为路径+查询字符串+本次请求的 ETag。ETag 由数据库中各表的最近修改时间算出，
+    其他进程（或其他 worker）写入数据后 ETag 改变，旧条目不会再被取到，之后按 LRU/TTL 淘汰；
+    按标签失效只是让本进程尽早释放旧条目
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            # 已登录用户的导航栏和闪现消息因人而异，不能共用缓存
+            if request.method != 'GET' or 'user_type' in session or '_flashes' in session:
+                return f(*args, **kwargs)
+            
+            key = (request.full_path, g.get('page_etag'))
+            cached = page_cache.get(key)
+            if cached is None:
+                response = make_response(f(*args, **kwargs))
+                if response.status_code != 200 or response.is_streamed:
+                    return response
+                # 压缩结果按编码保存在条目中，命中时直接使用，不再逐次压缩
+                cached = (response.get_data(), response.status_code, list(response.headers), {})
+                page_cache.set(key, cached, tags)
+            
+            body, status, headers, variants = cached
+            response = app.response_class(body, status=status, headers=headers)
+            encoding = cached_page_encoding(response)
+            if encoding is not None:
+                def build():
+                    compress, finish = make_compressor(encoding)
+                    return compress(body) + finish()
+                response.set_data(page_cache.variant(variants, encoding, build))
+                # 带上 Content-Encoding 后 compress_response 不再处理，只补充 Vary
+                response.headers['Content-Encoding'] = encoding
+            return response
+        return decorated_function
+    return decorator
+
+def cached_page_encoding(response):
+    """缓存页面应使用的压缩编码，条件与 compress_response 相同"""
+    if (response.mimetype not in app.config['COMPRESS_MIMETYPES'] or response.cache_control.no_transform
+            or len(response.get_data()) < app.config['COMPRESS_MIN_SIZE']):
+        return None
+    return choose_content_encoding()
 
 # 模板上下文处理器
 @app.context_processor
@@ -41,8 +283,462 @@ def inject_moment():
 
 @app.context_processor
 def inject_contact_info():
+    return dict(contact_info=get_contact_info())
+
+# 联系信息缓存：进程内只加载一次，admin_contact_edit 提交后刷新
+_contact_info_cache = {'loaded': False, 'value': None}
+_contact_info_lock = threading.Lock()
+
+def get_contact_info():
+    if not _contact_info_cache['loaded']:
+        with _contact_info_lock:
+            if not _contact_info_cache['loaded']:
+                refresh_contact_info()
+    return _contact_info_cache['value']
+
+def refresh_contact_info():
+    """从数据库重新加载联系信息，缓存为与会话无关的普通对象"""
     contact = ContactInfo.query.first()
-    return dict(contact_info=contact)
+    if contact:
+        value = SimpleNamespace(
+            email=contact.email,
+            phone=contact.phone,
+            address=contact.address,
+            updated_at=contact.updated_at
+        )
+    else:
+        value = None
+    _contact_info_cache['value'] = value
+    _contact_info_cache['loaded'] = True
+    return value
+
+# SQLite 连接参数与锁重试
+@event.listens_for(Engine, 'connect')
+def apply_sqlite_pragmas(dbapi_connection, connection_record):
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    for name, value in app.config['SQLITE_PRAGMAS'].items():
+        cursor.execute(f'PRAGMA {name} = {value}')
+    cursor.close()
+
+def is_lock_error(exc):
+    return isinstance(exc, sqlite3.OperationalError) and ('locked' in str(exc) or 'busy' in str(exc))
+
+def retry_on_lock(f):
+    """数据库被锁时回滚并重新执行 f，等待时间指数增长并带随机抖动
+    
+    f 必须是一个完整的写事务（最后提交），并且只做数据库操作：重试会把它从头再执行一遍，
+    上传文件、计算密码哈希等操作要放在 f 之外。最多重试 DB_LOCK_RETRIES 次，
+    且预计总等待（每次最多 busy_timeout）超过 DB_LOCK_MAX_WAIT 时不再重试，直接抛出异常。
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        retries = app.config['DB_LOCK_RETRIES']
+        busy_timeout = app.config['SQLITE_PRAGMAS'].get('busy_timeout', 0) / 1000
+        deadline = time.monotonic() + app.config['DB_LOCK_MAX_WAIT']
+        for attempt in range(retries + 1):
+            try:
+                return f(*args, **kwargs)
+            except OperationalError as e:
+                db.session.rollback()
+                delay = min(app.config['DB_LOCK_RETRY_DELAY'] * 2 ** attempt, app.config['DB_LOCK_RETRY_MAX_DELAY'])
+                if (not is_lock_error(e.orig) or attempt == retries
+                        or time.monotonic() + delay + busy_timeout > deadline):
+                    raise
+            time.sleep(delay * random.uniform(0.5, 1))
+    return decorated_function
+
+# 每个请求的SQL查询计数和耗时
+@event.listens_for(Engine, 'before_cursor_execute')
+def count_sql_query(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context():
+        g.sql_query_count = g.get('sql_query_count', 0) + 1
+        conn.info['query_started'] = time.perf_counter()
+        if app.debug or app.config['QUERY_AUDIT']:
+            g.setdefault('sql_statements', []).append(statement)
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def time_sql_query(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.pop('query_started', None)
+    if started is not None and has_request_context():
+        g.sql_seconds = g.get('sql_seconds', 0.0) + time.perf_counter() - started
+
+@app.after_request
+def add_query_count_header(response):
+    if app.debug or app.config['QUERY_COUNT_HEADER']:
+        response.headers['X-Query-Count'] = str(g.get('sql_query_count', 0))
+    return response
+
+# SQL审计：把语句中的字面量和 IN 列表替换为占位符得到“形态”，同一形态在一个请求中重复执行多次
+# 通常是在循环里逐条查询（N+1），应改为一次查询或 JOIN
+_fingerprint_literals = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_fingerprint_in_lists = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)')
+
+def query_fingerprint(statement):
+    fingerprint = _fingerprint_literals.sub('?', statement)
+    fingerprint = _fingerprint_in_lists.sub('(...)', fingerprint)
+    return ' '.join(fingerprint.split())
+
+def find_repeated_queries(statements, threshold=None):
+    """返回重复执行达到阈值的 [(语句形态, 次数)]，按次数从多到少"""
+    threshold = threshold or app.config['QUERY_AUDIT_REPEAT_THRESHOLD']
+    counts = Counter(query_fingerprint(statement) for statement in statements)
+    return [(fingerprint, count) for fingerprint, count in counts.most_common() if count >= threshold]
+
+@app.after_request
+def audit_queries(response):
+    statements = g.get('sql_statements')
+    if statements:
+        repeated = find_repeated_queries(statements)
+        if repeated:
+            app.logger.warning('疑似N+1查询：%s %s（endpoint=%s，共 %d 条SQL）\n%s',
+                               request.method, request.path, request.endpoint, len(statements),
+                               '\n'.join(f'  {count} 次: {fingerprint}' for fingerprint, count in repeated))
+    return response
+
+# 请求指标：每个路由（endpoint）的耗时直方图、每个请求的SQL查询次数/耗时和响应大小，
+# 只在进程内累计，多个 worker 时由 Prometheus 分别抓取。记录一次请求只需几次二分查找和一次加锁
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+RESPONSE_SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+class Histogram:
+    """按标签分组的累计直方图，输出 Prometheus 文本格式"""
+    
+    def __init__(self, name, help_text, label_names, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        self.series = {}  # 标签值 -> [各桶计数..., 总和, 总数]
+    
+    def observe(self, labels, value):
+        """调用方需持有 RequestMetrics.lock"""
+        series = self.series.get(labels)
+        if series is None:
+            series = self.series[labels] = [0] * len(self.buckets) + [0.0, 0]
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            series[index] += 1
+        series[-2] += value
+        series[-1] += 1
+    
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        for labels, series in sorted(self.series.items()):
+            label_text = ','.join(f'{name}="{escape_label(value)}"' for name, value in zip(self.label_names, labels))
+            prefix = label_text + ',' if label_text else ''
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_bucket{{{prefix}le="+Inf"}} {series[-1]}')
+            lines.append(f'{self.name}_sum{{{label_text}}} {series[-2]}')
+            lines.append(f'{self.name}_count{{{label_text}}} {series[-1]}')
+        return lines
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+class RequestMetrics:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latency = Histogram('hsd_request_duration_seconds', '请求处理耗时（秒）',
+                                 ('endpoint', 'method', 'status'), LATENCY_BUCKETS)
+        self.sql_queries = Histogram('hsd_request_sql_queries', '每个请求执行的SQL语句数',
+                                     ('endpoint',), QUERY_COUNT_BUCKETS)
+        self.sql_seconds = Histogram('hsd_request_sql_seconds', '每个请求执行SQL的总耗时（秒）',
+                                     ('endpoint',), LATENCY_BUCKETS)
+        self.response_size = Histogram('hsd_response_size_bytes', '响应体字节数（压缩后，流式响应不计）',
+                                       ('endpoint',), RESPONSE_SIZE_BUCKETS)
+    
+    def observe(self, endpoint, method, status, seconds, queries, sql_seconds, size):
+        with self.lock:
+            self.latency.observe((endpoint, method, str(status)), seconds)
+            self.sql_queries.observe((endpoint,), queries)
+            self.sql_seconds.observe((endpoint,), sql_seconds)
+            if size is not None:
+                self.response_size.observe((endpoint,), size)
+    
+    def render(self):
+        with self.lock:
+            lines = []
+            for histogram in (self.latency, self.sql_queries, self.sql_seconds, self.response_size):
+                lines += histogram.render()
+        return lines
+
+request_metrics = RequestMetrics()
+
+@app.before_request
+def start_request_timer():
+    if app.config['METRICS_ENABLED']:
+        g.request_started = time.perf_counter()
+
+# 在响应压缩之前注册，因此在压缩之后执行，记录的是实际发送的字节数
+@app.after_request
+def record_request_metrics(response):
+    started = g.get('request_started')
+    if started is not None:
+        request_metrics.observe(
+            request.endpoint or 'unmatched', request.method, response.status_code,
+            time.perf_counter() - started, g.get('sql_query_count', 0), g.get('sql_seconds', 0.0),
+            None if response.is_streamed else response.content_length,
+        )
+    return response
+
+# 响应压缩：HTML/JSON/CSV 等文本响应按 Accept-Encoding 使用 brotli（已安装时）或 gzip，
+# 流式响应逐块压缩；静态文件由 serve_static 直接返回预压缩版本，不经过这里
+def choose_content_encoding():
+    """按客户端给出的 q 值选择压缩方式，q 值相同时优先 brotli"""
+    best, best_quality = None, 0
+    for encoding in (('br', 'gzip') if brotli is not None else ('gzip',)):
+        quality = request.accept_encodings.quality(encoding)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+def make_compressor(encoding, level=None):
+    """返回 (compress, finish) 两个函数，用于整体或逐块压缩"""
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=app.config['COMPRESS_BROTLI_LEVEL'] if level is None else level)
+        return compressor.process, compressor.finish
+    # wbits=31 输出带 gzip 头的数据
+    compressor = zlib.compressobj(app.config['COMPRESS_LEVEL'] if level is None else level, zlib.DEFLATED, 31)
+    return compressor.compress, compressor.flush
+
+def compress_stream(chunks, encoding):
+    compress, finish = make_compressor(encoding)
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            data = compress(chunk)
+            if data:
+                yield data
+        yield finish()
+    finally:
+        # 原始迭代器可能是 stream_with_context 包装的生成器，需要关闭以释放请求上下文
+        if hasattr(chunks, 'close'):
+            chunks.close()
+
+@app.after_request
+def compress_response(response):
+    if response.mimetype not in app.config['COMPRESS_MIMETYPES']:
+        return response
+    # 304 也带上 Vary，与完整响应保持一致
+    response.vary.add('Accept-Encoding')
+    if (response.status_code < 200 or response.status_code in (204, 304) or response.direct_passthrough
+            or 'Content-Encoding' in response.headers or response.cache_control.no_transform):
+        return response
+    
+    encoding = choose_content_encoding()
+    if encoding is None:
+        return response
+    if response.is_streamed:
+        if not app.config['COMPRESS_STREAMS']:
+            return response
+        response.response = compress_stream(response.response, encoding)
+        response.headers.pop('Content-Length', None)
+    else:
+        data = response.get_data()
+        if len(data) < app.config['COMPRESS_MIN_SIZE']:
+            return response
+        compress, finish = make_compressor(encoding)
+        response.set_data(compress(data) + finish())
+    response.headers['Content-Encoding'] = encoding
+    
+    # 压缩后字节不同，强校验值改为弱校验值；conditional_get 生成的本来就是弱校验值
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+# 静态资源指纹：构建时把 css/js/images 复制为带内容哈希的文件名到 static/dist/，
+# 并预先生成 .gz（以及安装了 brotli 时的 .br）版本。模板中照常使用 url_for('static', ...)，
+# 有对应的指纹文件时自动输出 dist/ 下的地址，这些地址可以永久缓存
+ASSET_DIRS = ('css', 'js', 'images')
+ASSET_COMPRESSIBLE = {'.css', '.js', '.svg'}
+ASSET_DIST = 'dist'
+ASSET_MANIFEST = os.path.join(app.static_folder, ASSET_DIST, 'manifest.json')
+ASSET_ENCODINGS = [('br', '.br'), ('gzip', '.gz')]  # 按优先级排列
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+CONTENT_HASH_UPLOAD_PATTERN = re.compile(r'^uploads/[0-9a-f]{2}/[0-9a-f]{64}(_\w+)?\.\w+$')
+
+asset_manifest = {}
+
+def write_file_atomic(path, data):
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def build_assets():
+    """生成带哈希的资源文件及压缩版本，写入 manifest.json 并返回映射 {原路径: 指纹路径}"""
+    manifest = {}
+    for directory in ASSET_DIRS:
+        for root, _, files in os.walk(os.path.join(app.static_folder, directory)):
+            for name in sorted(files):
+                source = os.path.join(root, name)
+                filename = os.path.relpath(source, app.static_folder).replace(os.sep, '/')
+                with open(source, 'rb') as f:
+                    data = f.read()
+                
+                stem, ext = os.path.splitext(filename)
+                hashed = f'{stem}.{hashlib.sha256(data).hexdigest()[:12]}{ext}'
+                target = os.path.join(app.static_folder, ASSET_DIST, hashed)
+                manifest[filename] = hashed
+                if os.path.exists(target):
+                    continue
+                
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                if ext in ASSET_COMPRESSIBLE:
+                    write_file_atomic(target + '.gz', gzip.compress(data, compresslevel=9, mtime=0))
+                    if brotli is not None:
+                        write_file_atomic(target + '.br', brotli.compress(data, quality=11))
+                write_file_atomic(target, data)
+    
+    os.makedirs(os.path.dirname(ASSET_MANIFEST), exist_ok=True)
+    write_file_atomic(ASSET_MANIFEST, json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8'))
+    asset_manifest.clear()
+    asset_manifest.update(manifest)
+    return manifest
+
+def load_asset_manifest():
+    asset_manifest.clear()
+    if os.path.exists(ASSET_MANIFEST):
+        with open(ASSET_MANIFEST, encoding='utf-8') as f:
+            asset_manifest.update(json.load(f))
+
+@app.cli.command('build-assets')
+def build_assets_command():
+    """生成带内容哈希的静态资源及 gzip/brotli 压缩版本"""
+    manifest = build_assets()
+    print(f'已生成 {len(manifest)} 个静态资源' + ('' if brotli else '（未安装 brotli，只生成 gzip 版本）'))
+
+@app.url_defaults
+def fingerprint_static_url(endpoint, values):
+    # 调试模式下直接使用源文件，修改后无需重新构建
+    if endpoint == 'static' and not app.debug:
+        hashed = asset_manifest.get(values.get('filename'))
+        if hashed:
+            values['filename'] = f'{ASSET_DIST}/{hashed}'
+
+def serve_static(filename):
+    """静态文件：带哈希的文件永久缓存，并按 Accept-Encoding 返回预压缩版本"""
+    immutable = filename.startswith(ASSET_DIST + '/') or CONTENT_HASH_UPLOAD_PATTERN.match(filename)
+    if not immutable:
+        return app.send_static_file(filename)
+    
+    path = safe_join(app.static_folder, filename)
+    if path is None or not os.path.isfile(path):
+        abort(404)
+    
+    response = None
+    for encoding, suffix in ASSET_ENCODINGS:
+        if encoding in request.accept_encodings and os.path.isfile(path + suffix):
+            mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+            response = send_file(path + suffix, mimetype=mimetype, max_age=IMMUTABLE_MAX_AGE)
+            response.headers['Content-Encoding'] = encoding
+            break
+    if response is None:
+        response = send_file(path, max_age=IMMUTABLE_MAX_AGE)
+    if filename.startswith(ASSET_DIST + '/'):
+        response.vary.add('Accept-Encoding')
+    response.cache_control.immutable = True
+    return response
+
+app.view_functions['static'] = serve_static
+load_asset_manifest()
+
+# 密码哈希：PBKDF2 等算法故意消耗大量CPU，放到独立的进程池中计算，避免登录/注册高峰拖慢其他页面。
+# 进程池大小限制认证占用的CPU，排队任务达到上限时直接返回503，而不是让请求线程无限等待
+class PasswordHashBusy(Exception):
+    """密码哈希任务排队已满"""
+
+_password_pool = {'executor': None, 'slots': None}
+_password_pool_lock = threading.Lock()
+
+def get_password_pool():
+    """返回 (进程池, 任务名额)；首次使用时才按当前配置创建，flask 命令行和迁移不会启动多余的进程"""
+    with _password_pool_lock:
+        if _password_pool['executor'] is None:
+            workers = app.config['PASSWORD_HASH_WORKERS']
+            _password_pool['executor'] = ProcessPoolExecutor(max_workers=workers)
+            _password_pool['slots'] = threading.BoundedSemaphore(workers + app.config['PASSWORD_HASH_QUEUE'])
+        return _password_pool['executor'], _password_pool['slots']
+
+def discard_password_pool(executor):
+    """工作进程意外退出后进程池不可再用，丢弃后下次使用时重新创建"""
+    with _password_pool_lock:
+        if _password_pool['executor'] is executor:
+            _password_pool['executor'] = None
+
+def submit_password_task(func, *args, wait=False):
+    """提交到进程池并返回 future；名额已满时抛出 PasswordHashBusy，wait=True 时先等待至多 PASSWORD_HASH_TIMEOUT 秒"""
+    # 进程池在上一个任务中已损坏时，换一个新进程池再试一次
+    for _ in range(2):
+        executor, slots = get_password_pool()
+        acquired = slots.acquire(timeout=app.config['PASSWORD_HASH_TIMEOUT']) if wait else slots.acquire(blocking=False)
+        if not acquired:
+            raise PasswordHashBusy()
+        try:
+            future = executor.submit(func, *args)
+            break
+        except BrokenProcessPool:
+            slots.release()
+            discard_password_pool(executor)
+    else:
+        raise PasswordHashBusy()
+    
+    def task_done(future):
+        slots.release()
+        if not future.cancelled() and isinstance(future.exception(), BrokenProcessPool):
+            discard_password_pool(executor)
+    future.add_done_callback(task_done)
+    return future
+
+def password_task_result(future):
+    """等待任务结果；超时或工作进程退出时返回503，而不是500"""
+    try:
+        return future.result(timeout=app.config['PASSWORD_HASH_TIMEOUT'])
+    except BrokenProcessPool:
+        app.logger.error('密码哈希进程意外退出，进程池将在下次使用时重建')
+        raise PasswordHashBusy()
+    except FutureTimeoutError:
+        # 仍在排队的任务直接取消，释放名额；已开始计算的任务只能等它结束
+        future.cancel()
+        app.logger.warning('密码哈希任务等待超过 %s 秒', app.config['PASSWORD_HASH_TIMEOUT'])
+        raise PasswordHashBusy()
+
+def run_password_task(func, *args):
+    if not app.config['PASSWORD_HASH_WORKERS']:
+        return func(*args)
+    return password_task_result(submit_password_task(func, *args))
+
+def hash_password(password):
+    return run_password_task(generate_password_hash, password,
+                             app.config['PASSWORD_HASH_METHOD'], app.config['PASSWORD_SALT_LENGTH'])
+
+def verify_password(pwhash, password):
+    return run_password_task(check_password_hash, pwhash, password)
+
+def password_needs_rehash(pwhash):
+    """哈希方法或盐长度与当前配置不同时返回True"""
+    method, _, rest = pwhash.partition('$')
+    salt = rest.partition('$')[0]
+    return method != app.config['PASSWORD_HASH_METHOD'] or len(salt) != app.config['PASSWORD_SALT_LENGTH']
+
+@app.errorhandler(PasswordHashBusy)
+def password_hash_busy(e):
+    message = '当前登录/注册人数较多，请稍后再试'
+    if request.path.startswith('/api/'):
+        response = jsonify({'success': False, 'message': message})
+    else:
+        response = make_response(message)
+    response.status_code = 503
+    response.headers['Retry-After'] = '5'
+    return response
 
 # 数据库模型
 class Admin(db.Model):
@@ -55,10 +751,15 @@ class Admin(db.Model):
     last_login = db.Column(db.DateTime)
     
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = hash_password(password)
     
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        """验证密码，哈希参数已过时则顺便按当前配置重新哈希（由调用方提交）"""
+        if not verify_password(self.password_hash, password):
+            return False
+        if password_needs_rehash(self.password_hash):
+            self.password_hash = hash_password(password)
+        return True
 
 class Event(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -67,10 +768,20 @@ class Event(db.Model):
     location = db.Column(db.String(100), nullable=False)
     event_date = db.Column(db.DateTime, nullable=False)
     image_url = db.Column(db.String(200))
+    image_variants = db.Column(db.JSON)  # 上传图片生成的各尺寸版本
     category = db.Column(db.String(50), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     created_by = db.Column(db.Integer, db.ForeignKey('admin.id'))
     is_published = db.Column(db.Boolean, default=True)
+    excerpt = db.Column(db.String(300))  # 列表摘要，保存时由 description 生成
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    __table_args__ = (
+        db.Index('ix_event_event_date', 'event_date'),  # 首页/活动列表/API 按活动时间倒序
+        db.Index('ix_event_category_event_date', 'category', 'event_date'),  # 按分类筛选后再按时间排序
+        db.Index('ix_event_created_at', 'created_at'),  # 后台列表与月度统计
+        db.Index('ix_event_updated_at', 'updated_at'),  # 条件请求取最近修改时间
+    )
 
 class News(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -79,10 +790,20 @@ class News(db.Model):
     author = db.Column(db.String(100), nullable=False)
     publish_date = db.Column(db.DateTime, default=datetime.utcnow)
     image_url = db.Column(db.String(200))
+    image_variants = db.Column(db.JSON)  # 上传图片生成的各尺寸版本
     category = db.Column(db.String(50), nullable=False)
     created_by = db.Column(db.Integer, db.ForeignKey('admin.id'))
     is_published = db.Column(db.Boolean, default=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    excerpt = db.Column(db.String(300))  # 列表摘要，保存时由 content 生成
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    __table_args__ = (
+        db.Index('ix_news_publish_date', 'publish_date'),
+        db.Index('ix_news_category_publish_date', 'category', 'publish_date'),
+        db.Index('ix_news_created_at', 'created_at'),
+        db.Index('ix_news_updated_at', 'updated_at'),
+    )
 
 class Student(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -94,6 +815,7 @@ class Student(db.Model):
     password_hash = db.Column(db.String(128))  # 密码字段
     join_date = db.Column(db.DateTime, default=datetime.utcnow)
     avatar_url = db.Column(db.String(200))
+    avatar_variants = db.Column(db.JSON)  # 上传头像生成的各尺寸版本
     bio = db.Column(db.Text)
     grade = db.Column(db.String(20))  # 年级字段
     group = db.Column(db.String(50))  # 分组字段
@@ -101,9 +823,33 @@ class Student(db.Model):
     approved_by = db.Column(db.Integer, db.ForeignKey('admin.id'))
     approved_at = db.Column(db.DateTime)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    summary = db.query_expression()  # 展示页通过 with_expression 只取简介的前几个字
+    
+    __table_args__ = (
+        db.Index('ix_student_is_approved_created_at', 'is_approved', 'created_at'),  # 学生管理/申请审核
+        db.Index('ix_student_created_at', 'created_at'),  # 学生信息管理与月度统计
+        db.Index('ix_student_join_date', 'join_date'),  # 学生展示页与API
+        db.Index('ix_student_grade', 'grade'),  # 年级筛选与分布
+        db.Index('ix_student_group', 'group'),  # 分组筛选
+        db.Index('ix_student_university', 'university'),  # 合作高校去重统计
+        db.Index('ix_student_updated_at', 'updated_at'),  # 条件请求取最近修改时间
+    )
     
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = hash_password(password)
+    
+    def check_password(self, password):
+        """验证密码，哈希参数已过时则顺便按当前配置重新哈希（由调用方提交）"""
+        if not self.password_hash or not verify_password(self.password_hash, password):
+            return False
+        if password_needs_rehash(self.password_hash):
+            self.password_hash = hash_password(password)
+        return True
+
+def normalize_email(email):
+    """学生邮箱统一去掉首尾空白并转为小写后保存和查询，唯一约束和导入按邮箱去重因此不区分大小写"""
+    return email.strip().lower()
 
 class Timeline(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -116,6 +862,11 @@ class Timeline(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     created_by = db.Column(db.Integer, db.ForeignKey('admin.id'))
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    __table_args__ = (
+        db.Index('ix_timeline_published_order', 'is_published', 'order_index', 'created_at'),  # 关于我们页面
+        db.Index('ix_timeline_order', 'order_index', 'created_at'),  # 后台列表
+    )
 
 class Team(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -128,6 +879,11 @@ class Team(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     created_by = db.Column(db.Integer, db.ForeignKey('admin.id'))
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    __table_args__ = (
+        db.Index('ix_team_published_order', 'is_published', 'order_index', 'created_at'),  # 关于我们页面
+        db.Index('ix_team_order', 'order_index', 'created_at'),  # 后台列表
+    )
 
 class Partner(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -142,10 +898,10 @@ class Partner(db.Model):
     created_by = db.Column(db.Integer, db.ForeignKey('admin.id'))
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
-    def check_password(self, password):
-        if self.password_hash:
-            return check_password_hash(self.password_hash, password)
-        return False
+    __table_args__ = (
+        db.Index('ix_partner_published_order', 'is_published', 'order_index', 'created_at'),
+        db.Index('ix_partner_order', 'order_index', 'created_at'),
+    )
 
 class ContactInfo(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -166,6 +922,476 @@ class ContactMessage(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)  # 创建时间
     replied_at = db.Column(db.DateTime)  # 回复时间
     replied_by = db.Column(db.Integer, db.ForeignKey('admin.id'))  # 回复者
+    
+    __table_args__ = (
+        db.Index('ix_contact_message_created_at', 'created_at'),  # 消息管理按时间倒序
+    )
+
+class StatRollup(db.Model):
+    """统计汇总表：每个 (指标, 分桶) 一行，由 SQLite 触发器在写入时增量更新"""
+    __tablename__ = 'stat_rollup'
+    metric = db.Column(db.String(50), primary_key=True)  # 指标名，如 events、events_monthly
+    bucket = db.Column(db.String(100), primary_key=True)  # 分桶，如 all、2024-05、分类名
+    value = db.Column(db.Integer, nullable=False, default=0)
+
+class UploadedFile(db.Model):
+    """按内容哈希存放的上传文件，ref_count 由 SQLite 触发器随 News/Event/Student 的图片字段增减"""
+    __tablename__ = 'uploaded_file'
+    sha256 = db.Column(db.String(64), primary_key=True)
+    url = db.Column(db.String(200), unique=True, nullable=False)
+    size = db.Column(db.Integer, nullable=False)
+    ref_count = db.Column(db.Integer, nullable=False, default=0)
+    uploaded_at = db.Column(db.DateTime, default=datetime.utcnow)  # 最近一次上传该内容的时间
+
+class TableChange(db.Model):
+    """各内容表最近一次删除记录的时间，由 SQLite 触发器写入，删除不会改变剩余记录的 updated_at"""
+    __tablename__ = 'table_change'
+    table_name = db.Column(db.String(50), primary_key=True)
+    deleted_at = db.Column(db.DateTime)
+
+# 列表摘要：活动描述/新闻正文保存时生成，列表页和列表API只读取摘要
+EXCERPT_LENGTH = 150
+EXCERPT_BATCH_SIZE = 500
+HIDDEN_TAG_PATTERN = re.compile(r'<(script|style)\b.*?</\1\s*>', re.IGNORECASE | re.DOTALL)
+BLOCK_TAG_PATTERN = re.compile(r'<(?:br|/?(?:p|div|li|ul|ol|tr|td|h[1-6]|blockquote))\b[^>]*>', re.IGNORECASE)
+HTML_TAG_PATTERN = re.compile(r'<[^>]*>')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+def make_excerpt(text, length=EXCERPT_LENGTH):
+    """去掉HTML标签、压缩空白后截取前 length 个字符
+    
+    按Unicode字符截取，中文不会被截成半个字；不会把组合符号与前一个字符拆开，
+    英文单词尽量在空格处断开。截断时末尾加省略号。
+    """
+    if not text:
+        return ''
+    text = HIDDEN_TAG_PATTERN.sub('', text)
+    text = HTML_TAG_PATTERN.sub('', BLOCK_TAG_PATTERN.sub(' ', text))
+    text = WHITESPACE_PATTERN.sub(' ', html.unescape(text)).strip()
+    if len(text) <= length:
+        return text
+    
+    end = length
+    while end > 0 and unicodedata.combining(text[end]):
+        end -= 1
+    if text[end].isascii() and text[end].isalnum():
+        space = text.rfind(' ', end - 20, end)
+        if space > 0:
+            end = space
+    return text[:end].rstrip() + '…'
+
+@event.listens_for(Event, 'before_insert')
+@event.listens_for(Event, 'before_update')
+def update_event_excerpt(mapper, connection, target):
+    target.excerpt = make_excerpt(target.description)
+
+@event.listens_for(News, 'before_insert')
+@event.listens_for(News, 'before_update')
+def update_news_excerpt(mapper, connection, target):
+    target.excerpt = make_excerpt(target.content)
+
+@app.cli.command('backfill-excerpts')
+@click.option('--all', 'refresh_all', is_flag=True, help='重新生成所有记录的摘要，而不只是为空的')
+def backfill_excerpts_command(refresh_all):
+    """为已有的活动和新闻生成列表摘要"""
+    for model, source in ((Event, Event.description), (News, News.content)):
+        query = db.session.query(model.id, source)
+        if not refresh_all:
+            query = query.filter(model.excerpt.is_(None))
+        
+        last_id = updated = 0
+        while True:
+            rows = query.filter(model.id > last_id).order_by(model.id).limit(EXCERPT_BATCH_SIZE).all()
+            if not rows:
+                break
+            db.session.execute(db.update(model), [{'id': row_id, 'excerpt': make_excerpt(text)} for row_id, text in rows])
+            db.session.commit()
+            last_id = rows[-1][0]
+            updated += len(rows)
+        print(f'{model.__tablename__}: 已生成 {updated} 条摘要')
+
+# 上传文件按内容寻址：static/uploads/<哈希前两位>/<sha256>.<扩展名>
+# 相同内容只保存一份，uploaded_file 记录每个文件被 News/Event/Student 引用的次数，
+# 引用数为0的文件由 flask sweep-uploads 清理
+UPLOAD_URL_PREFIX = '/static/uploads/'
+UPLOAD_CHUNK_SIZE = 64 * 1024
+IMAGE_SIGNATURES = [
+    (b'\x89PNG\r\n\x1a\n', 'png'),
+    (b'\xff\xd8\xff', 'jpg'),
+]
+
+# 引用计数触发器：表名 -> 图片URL字段
+UPLOAD_REFERENCE_COLUMNS = {'news': 'image_url', 'event': 'image_url', 'student': 'avatar_url'}
+
+def upload_refcount_ddl():
+    statements = []
+    for table, column in UPLOAD_REFERENCE_COLUMNS.items():
+        statements += [
+            f"""CREATE TRIGGER IF NOT EXISTS {table}_upload_ref_insert AFTER INSERT ON {table}
+                WHEN new.{column} IS NOT NULL BEGIN
+                UPDATE uploaded_file SET ref_count = ref_count + 1 WHERE url = new.{column};
+            END""",
+            f"""CREATE TRIGGER IF NOT EXISTS {table}_upload_ref_delete AFTER DELETE ON {table}
+                WHEN old.{column} IS NOT NULL BEGIN
+                UPDATE uploaded_file SET ref_count = ref_count - 1 WHERE url = old.{column};
+            END""",
+            f"""CREATE TRIGGER IF NOT EXISTS {table}_upload_ref_update AFTER UPDATE OF {column} ON {table}
+                WHEN old.{column} IS NOT new.{column} BEGIN
+                UPDATE uploaded_file SET ref_count = ref_count - 1 WHERE url = old.{column};
+                UPDATE uploaded_file SET ref_count = ref_count + 1 WHERE url = new.{column};
+            END""",
+        ]
+    return statements
+
+def init_upload_refcount():
+    """创建维护上传文件引用计数的触发器（已存在时跳过）"""
+    for statement in upload_refcount_ddl():
+        db.session.execute(db.text(statement))
+    db.session.commit()
+
+def detect_image_type(header):
+    for signature, ext in IMAGE_SIGNATURES:
+        if header.startswith(signature):
+            return ext
+    return None
+
+def save_upload(file):
+    """保存上传的图片并返回访问URL；没有文件、类型不允许或内容不是PNG/JPEG时返回None
+    
+    边写临时文件边计算 SHA-256，内容已存在时直接丢弃临时文件。
+    扩展名由文件内容决定，同样的字节总是得到同一个URL。
+    """
+    if not file or file.filename == '' or not allowed_file(file.filename):
+        return None
+    
+    tmp_dir = os.path.join(app.config['UPLOAD_FOLDER'], '.tmp')
+    os.makedirs(tmp_dir, exist_ok=True)
+    digest = hashlib.sha256()
+    size = 0
+    ext = None
+    with tempfile.NamedTemporaryFile(dir=tmp_dir, delete=False) as tmp:
+        while True:
+            chunk = file.stream.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            if size == 0:
+                ext = detect_image_type(chunk)
+                if ext is None:
+                    break
+            digest.update(chunk)
+            tmp.write(chunk)
+            size += len(chunk)
+    
+    if ext is None:
+        os.remove(tmp.name)
+        return None
+    sha256 = digest.hexdigest()
+    relative_path = f'{sha256[:2]}/{sha256}.{ext}'
+    path = os.path.join(app.config['UPLOAD_FOLDER'], relative_path)
+    if os.path.exists(path):
+        os.remove(tmp.name)
+    else:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(tmp.name, path)
+    
+    # 登记文件（引用数由触发器在记录保存时增加），重复上传只刷新上传时间
+    url = UPLOAD_URL_PREFIX + relative_path
+    now = datetime.utcnow()
+    db.session.execute(
+        sqlite_insert(UploadedFile)
+        .values(sha256=sha256, url=url, size=size, ref_count=0, uploaded_at=now)
+        .on_conflict_do_update(index_elements=['sha256'], set_={'uploaded_at': now})
+    )
+    return url
+
+def upload_file_path(url):
+    """上传文件URL对应的 UPLOAD_FOLDER 下的磁盘路径，外部链接等非上传文件返回None"""
+    if not url or not url.startswith(UPLOAD_URL_PREFIX):
+        return None
+    # safe_join 拒绝 .. 等越出上传目录的路径，避免清理时误删其他文件
+    return safe_join(app.config['UPLOAD_FOLDER'], url[len(UPLOAD_URL_PREFIX):])
+
+def upload_file_url(path):
+    """upload_file_path 的逆操作"""
+    return UPLOAD_URL_PREFIX + os.path.relpath(path, app.config['UPLOAD_FOLDER']).replace(os.sep, '/')
+
+def referenced_upload_urls():
+    """所有记录当前引用的上传文件URL（包括各尺寸版本）"""
+    urls = set()
+    for column, variants_column in ((Event.image_url, Event.image_variants),
+                                    (News.image_url, News.image_variants),
+                                    (Student.avatar_url, Student.avatar_variants)):
+        for url, variants in db.session.query(column, variants_column).filter(column.isnot(None)):
+            urls.add(url)
+            for variant in (variants or {}).values():
+                urls.update(variant[fmt] for fmt in IMAGE_FORMATS)
+    return urls
+
+def sweep_uploads(dry_run=False):
+    """删除没有被引用的上传文件，返回删除的文件路径列表
+    
+    先删除引用数为0的已登记文件及其各尺寸版本，再删除未登记、也没有记录引用的遗留文件
+    （例如按旧方式命名的上传文件和中断上传留下的临时文件）。只处理超过保留时间的文件。
+    """
+    folder = app.config['UPLOAD_FOLDER']
+    grace = app.config['UPLOAD_SWEEP_GRACE']
+    cutoff = datetime.utcnow() - timedelta(seconds=grace)
+    removed = []
+    
+    unreferenced = UploadedFile.query.filter(UploadedFile.ref_count <= 0, UploadedFile.uploaded_at < cutoff).all()
+    for item in unreferenced:
+        path = upload_file_path(item.url)
+        if path:
+            removed += [path] if os.path.exists(path) else []
+            removed += glob.glob(os.path.splitext(path)[0] + '_*')
+        if not dry_run:
+            db.session.delete(item)
+    if not dry_run:
+        db.session.commit()
+    
+    tracked = {os.path.splitext(os.path.basename(url))[0] for (url,) in db.session.query(UploadedFile.url)}
+    referenced = {upload_file_path(url) for url in referenced_upload_urls()}
+    for root, _, files in os.walk(folder):
+        for name in files:
+            path = os.path.join(root, name)
+            # 已登记的文件及其版本（<sha256>_<尺寸>.<扩展名>）按哈希判断
+            if name.split('_', 1)[0].split('.', 1)[0] in tracked or path in referenced or path in removed:
+                continue
+            if time.time() - os.path.getmtime(path) > grace:
+                removed.append(path)
+    
+    if not dry_run:
+        for path in removed:
+            if os.path.exists(path):
+                os.remove(path)
+    return removed
+
+@app.cli.command('sweep-uploads')
+@click.option('--dry-run', is_flag=True, help='只列出将被删除的文件，不实际删除')
+def sweep_uploads_command(dry_run):
+    """删除不再被任何记录引用的上传文件"""
+    init_upload_refcount()
+    removed = sweep_uploads(dry_run)
+    for path in removed:
+        print(os.path.relpath(path, app.config['UPLOAD_FOLDER']))
+    print(f"{'将删除' if dry_run else '已删除'} {len(removed)} 个文件")
+
+# 上传图片处理：保存原图后在后台线程池中生成多种宽度的 WebP/JPEG 版本
+# 生成的文件与原图放在同一目录、以原图文件名加尺寸命名，相同内容的图片共用同一组版本；
+# 版本信息以 {尺寸: {'width', 'webp', 'jpeg'}} 的形式记录在 *_variants 字段
+IMAGE_FORMATS = {
+    'webp': ('WEBP', 'webp'),
+    'jpeg': ('JPEG', 'jpg'),
+}
+
+image_executor = ThreadPoolExecutor(max_workers=app.config['IMAGE_WORKERS'], thread_name_prefix='image')
+
+def generate_image_variants(source_path):
+    """按配置的宽度生成 WebP/JPEG 版本，不放大小图，不保留EXIF等元数据"""
+    stem = os.path.splitext(source_path)[0]
+    variants = {}
+    with Image.open(source_path) as original:
+        image = ImageOps.exif_transpose(original)
+        has_alpha = image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+        image = image.convert('RGBA' if has_alpha else 'RGB')
+        
+        # 从大到小依次缩放，每次在上一个尺寸的基础上处理；原图比某个尺寸还小时沿用上一个版本
+        variant = None
+        for name, width in sorted(app.config['IMAGE_VARIANTS'].items(), key=lambda item: -item[1]):
+            if image.width > width:
+                image = image.resize((width, max(1, round(image.height * width / image.width))), Image.LANCZOS)
+            elif variant:
+                variants[name] = variant
+                continue
+            
+            variant = {'width': image.width}
+            for fmt, (pil_format, ext) in IMAGE_FORMATS.items():
+                output = image
+                if pil_format == 'JPEG' and has_alpha:
+                    # JPEG 不支持透明通道，铺白色背景
+                    output = Image.new('RGB', image.size, (255, 255, 255))
+                    output.paste(image, mask=image.getchannel('A'))
+                path = f'{stem}_{name}.{ext}'
+                if not os.path.exists(path):
+                    output.save(path, pil_format, quality=app.config['IMAGE_QUALITY'][fmt], optimize=True)
+                variant[fmt] = upload_file_url(path)
+            variants[name] = variant
+    return variants
+
+def process_image(model, row_id, url_column, variants_column, url, cache_tag):
+    """在线程池中执行：生成图片版本并写回记录"""
+    try:
+        variants = generate_image_variants(upload_file_path(url))
+    except Exception:
+        app.logger.exception('图片处理失败：%s', url)
+        return
+    
+    @retry_on_lock
+    def save_variants():
+        # 处理期间记录可能已换图或被删除，只更新仍指向这张原图的记录
+        result = db.session.execute(
+            db.update(model)
+            .where(model.id == row_id, getattr(model, url_column) == url)
+            .values({variants_column: variants})
+        )
+        db.session.commit()
+        return result.rowcount
+    
+    with app.app_context():
+        updated = save_variants()
+        db.session.remove()
+    if updated:
+        page_cache.invalidate(cache_tag)
+
+def schedule_image_processing(obj, url_column, variants_column, cache_tag):
+    """记录提交后调用；已有版本、未安装 Pillow 或不是本站上传的图片时跳过"""
+    url = getattr(obj, url_column)
+    if Image is None or not upload_file_path(url) or getattr(obj, variants_column):
+        return
+    image_executor.submit(process_image, type(obj), obj.id, url_column, variants_column, url, cache_tag)
+
+@app.template_filter('srcset')
+def srcset_filter(variants, fmt):
+    widths = {variant['width']: variant[fmt] for variant in variants.values()}
+    return ', '.join(f'{widths[width]} {width}w' for width in sorted(widths))
+
+# 条件请求：公开页面和列表API根据数据表的最近修改时间生成 ETag / Last-Modified，
+# 客户端带 If-None-Match / If-Modified-Since 且数据未变化时直接返回 304，不执行列表查询和模板渲染
+CHANGE_TRACKED_TABLES = ('event', 'news', 'student', 'timeline', 'team', 'partner')
+
+def table_change_ddl():
+    return [
+        f"""CREATE TRIGGER IF NOT EXISTS {table}_change_delete AFTER DELETE ON {table} BEGIN
+            INSERT INTO table_change (table_name, deleted_at) VALUES ('{table}', strftime('%Y-%m-%d %H:%M:%f', 'now'))
+            ON CONFLICT(table_name) DO UPDATE SET deleted_at = excluded.deleted_at;
+        END"""
+        for table in CHANGE_TRACKED_TABLES
+    ]
+
+def init_table_change():
+    """创建记录删除时间的触发器（已存在时跳过）"""
+    for statement in table_change_ddl():
+        db.session.execute(db.text(statement))
+    db.session.commit()
+
+def data_last_modified(*models):
+    """各表最近一次新增、修改或删除的时间（UTC），一条查询走 updated_at 索引和 table_change 主键"""
+    columns = []
+    for model in models:
+        columns.append(db.select(db.func.max(model.updated_at)).scalar_subquery())
+        columns.append(db.select(TableChange.deleted_at)
+                       .where(TableChange.table_name == model.__tablename__).scalar_subquery())
+    values = db.session.execute(db.select(*columns)).one()
+    return max((value for value in values if value is not None), default=None)
+
+def data_version(*models):
+    """本次请求中 models 的最近修改时间，条件请求和片段缓存键共用，同一请求内只查询一次"""
+    key = tuple(model.__tablename__ for model in models)
+    versions = g.setdefault('data_versions', {})
+    if key not in versions:
+        versions[key] = data_last_modified(*models)
+    return versions[key]
+
+_deploy_version = {}
+
+def deploy_version():
+    """代码、模板和静态资源清单的版本，重新部署后所有 ETag 随之失效"""
+    if app.debug or 'value' not in _deploy_version:
+        digest = hashlib.sha1(json.dumps(asset_manifest, sort_keys=True).encode('utf-8'))
+        paths = [os.path.abspath(__file__)] + sorted(
+            glob.glob(os.path.join(app.root_path, app.template_folder, '**', '*.html'), recursive=True))
+        for path in paths:
+            digest.update(f'{path}:{os.path.getmtime(path)}'.encode('utf-8'))
+        _deploy_version['value'] = digest.hexdigest()[:12]
+    return _deploy_version['value']
+
+def conditional_get(*models, html=True):
+    """为依赖 models 的 GET 接口加上 ETag / Last-Modified 校验
+    
+    html=True 的页面还包含联系信息、登录状态和“即将开始/已结束”等随时间变化的内容，
+    因此校验值额外带上联系信息的修改时间、当前登录身份和 PAGE_CACHE_TTL 时间段。
+    ETag 为弱校验值，响应经过压缩后仍可用于比较。
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            # 闪现消息只显示一次，带闪现消息的页面不参与协商
+            if request.method != 'GET' or '_flashes' in session:
+                return f(*args, **kwargs)
+            
+            last_modified = data_version(*models)
+            parts = [deploy_version(), str(last_modified)]
+            if html:
+                ttl = app.config['PAGE_CACHE_TTL']
+                period = int(time.time() // ttl)
+                contact = get_contact_info()
+                contact_updated_at = contact.updated_at if contact else None
+                parts += [period, str(contact_updated_at),
+                          session.get('user_type'), session.get('admin_id'), session.get('user_id')]
+                last_modified = max(value for value in (last_modified, contact_updated_at,
+                                                        datetime.utcfromtimestamp(period * ttl))
+                                    if value is not None)
+            etag = hashlib.sha1(json.dumps(parts).encode('utf-8')).hexdigest()[:20]
+            http_last_modified = last_modified.replace(microsecond=0) if last_modified else None
+            
+            # 同时携带两个条件头时以 If-None-Match 为准
+            if request.if_none_match:
+                not_modified = request.if_none_match.contains_weak(etag)
+            elif request.if_modified_since and http_last_modified:
+                not_modified = http_last_modified <= request.if_modified_since.replace(tzinfo=None)
+            else:
+                not_modified = False
+            
+            if not_modified:
+                response = app.response_class(status=304)
+            else:
+                g.page_etag = etag  # cached_page 的缓存键，保证缓存的正文与 ETag 对应同一份数据
+                response = make_response(f(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag, weak=True)
+            if http_last_modified:
+                response.last_modified = http_last_modified
+            # 允许浏览器保存，但每次使用前都要带条件头回源校验
+            response.cache_control.no_cache = True
+            if html and 'user_type' in session:
+                response.cache_control.private = True
+            return response
+        return decorated_function
+    return decorator
+
+# 模板片段缓存：{% cache key, ttl %}...{% endcache %} 把块内渲染结果按 key 缓存 ttl 秒（省略时为 FRAGMENT_CACHE_TTL），
+# 用于导航栏、页脚、后台侧边栏等每个页面都要渲染、但只随少数几个值变化的部分。key 中应包含片段用到的
+# 所有可变值，依赖数据表时用 data_version('timeline', ...) 取表的最近修改时间，记录修改后自动换新键。
+# 缓存键还包含模板名、行号和部署版本，修改模板后不会取到旧片段
+fragment_cache = PageCache(app.config['FRAGMENT_CACHE_SIZE'], app.config['FRAGMENT_CACHE_TTL'])
+
+class FragmentCacheExtension(Extension):
+    tags = {'cache'}
+    
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        args = [nodes.Const(f'{parser.name}:{lineno}'), parser.parse_expression()]
+        args.append(parser.parse_expression() if parser.stream.skip_if('comma') else nodes.Const(None))
+        body = parser.parse_statements(('name:endcache',), drop_needle=True)
+        return nodes.CallBlock(self.call_method('_render_cached', args), [], [], body).set_lineno(lineno)
+    
+    def _render_cached(self, location, key, ttl, caller):
+        if app.debug or not app.config['FRAGMENT_CACHE_ENABLED']:
+            return caller()
+        cache_key = (location, deploy_version(), repr(key))
+        value = fragment_cache.get(cache_key)
+        if value is None:
+            value = caller()
+            fragment_cache.set(cache_key, value, ttl=ttl)
+        return value
+
+app.jinja_env.add_extension(FragmentCacheExtension)
+
+@app.template_global('data_version')
+def template_data_version(*table_names):
+    models = {model.__tablename__: model for model in (Event, News, Student, Timeline, Team, Partner)}
+    return str(data_version(*(models[name] for name in table_names)))
 
 # 管理员认证装饰器
 def login_required(f):
@@ -178,11 +1404,11 @@ def login_required(f):
 
 # 路由
 @app.route('/')
+@conditional_get(Event, News)
+@cached_page('events', 'news')
 def index():
     """首页"""
-    recent_events = Event.query.order_by(Event.event_date.desc()).limit(3).all()
-    recent_news = News.query.order_by(News.publish_date.desc()).limit(4).all()
-    return render_template('index.html', events=recent_events, news=recent_news)
+    return render_template('index.html', events=home_events_query().all(), news=home_news_query().all())
 
 # 用户登录路由
 @app.route('/login', methods=['GET', 'POST'])
@@ -203,11 +1429,12 @@ def user_login():
             return redirect(url_for('admin_dashboard'))
         
         # 检查是否为普通用户（学生）
-        student = Student.query.filter_by(email=email).first()
+        student = Student.query.filter_by(email=normalize_email(email)).first()
         if student and student.check_password(password) and student.is_approved:
             session['user_id'] = student.id
             session['username'] = student.name
             session['user_type'] = 'student'
+            db.session.commit()  # 保存可能重新生成的密码哈希
             flash('登录成功！', 'success')
             return redirect(url_for('index'))
         elif student and not student.is_approved:
@@ -298,13 +1525,15 @@ def admin_events_create():
             location=request.form['location'],
             category=request.form['category'],
             max_participants=int(request.form['max_participants']) if request.form['max_participants'] else None,
-            image_url=request.form['image_url'] if request.form['image_url'] else None,
+            image_url=save_upload(request.files.get('image')) or request.form['image_url'] or None,
             created_by=session['admin_id'],
             is_published=bool(request.form.get('is_published'))
         )
         
         db.session.add(event)
         db.session.commit()
+        schedule_image_processing(event, 'image_url', 'image_variants', 'events')
+        page_cache.invalidate('events')
         flash('活动创建成功！', 'success')
         return redirect(url_for('admin_events'))
     
@@ -322,10 +1551,17 @@ def admin_events_edit(id):
         event.location = request.form['location']
         event.category = request.form['category']
         event.max_participants = int(request.form['max_participants']) if request.form['max_participants'] else None
-        event.image_url = request.form['image_url'] if request.form['image_url'] else None
         event.is_published = bool(request.form.get('is_published'))
         
+        # 上传的图片优先于填写的URL；旧文件不再被引用后由 sweep-uploads 清理
+        image_url = save_upload(request.files.get('image')) or request.form['image_url'] or None
+        if image_url != event.image_url:
+            event.image_url = image_url
+            event.image_variants = None
+        
         db.session.commit()
+        schedule_image_processing(event, 'image_url', 'image_variants', 'events')
+        page_cache.invalidate('events')
         flash('活动更新成功！', 'success')
         return redirect(url_for('admin_events'))
     
@@ -337,9 +1573,23 @@ def admin_events_delete(id):
     event = Event.query.get_or_404(id)
     db.session.delete(event)
     db.session.commit()
+    page_cache.invalidate('events')
     flash('活动删除成功！', 'success')
     return redirect(url_for('admin_events'))
 
+def filter_students(query, search='', grade='', group=''):
+    """学生列表与导出共用的关键词/年级/分组筛选"""
+    if search:
+        query = query.filter(student_search_filter(search))
+    
+    if grade:
+        query = query.filter(Student.grade == grade)
+        
+    if group:
+        query = query.filter(Student.group == group)
+    
+    return query
+
 # 学生管理（已注册学生的信息管理）
 @app.route('/admin/students')
 @login_required
@@ -350,23 +1600,7 @@ def admin_students():
     group = request.args.get('group', '')
     
     # 只显示已批准的学生
-    query = Student.query.filter(Student.is_approved == True)
-    
-    if search:
-        query = query.filter(
-            db.or_(
-                Student.name.contains(search),
-                Student.university.contains(search),
-                Student.major.contains(search),
-                Student.email.contains(search)
-            )
-        )
-    
-    if grade:
-        query = query.filter(Student.grade == grade)
-        
-    if group:
-        query = query.filter(Student.group == group)
+    query = filter_students(Student.query.filter(Student.is_approved == True), search, grade, group)
     
     students = query.order_by(Student.created_at.desc()).paginate(
         page=page, per_page=15, error_out=False
@@ -410,6 +1644,7 @@ def admin_students_approve(id):
     student.approved_at = datetime.utcnow()
     
     db.session.commit()
+    page_cache.invalidate('students')
     flash(f'已批准 {student.name} 的申请！', 'success')
     return redirect(url_for('admin_applications'))
 
@@ -422,6 +1657,7 @@ def admin_students_reject(id):
     student.approved_at = None
     
     db.session.commit()
+    page_cache.invalidate('students')
     flash(f'已拒绝 {student.name} 的申请！', 'warning')
     return redirect(url_for('admin_applications'))
 
@@ -434,6 +1670,7 @@ def admin_students_group(id):
     student.group = group
     
     db.session.commit()
+    page_cache.invalidate('students')
     flash(f'已将 {student.name} 分配到 {group} 组！', 'success')
     return redirect(url_for('admin_students'))
 
@@ -443,9 +1680,73 @@ def admin_students_delete(id):
     student = Student.query.get_or_404(id)
     db.session.delete(student)
     db.session.commit()
+    page_cache.invalidate('students')
     flash('学生信息删除成功！', 'success')
     return redirect(url_for('admin_students'))
 
+# 批量操作：后台列表勾选多条记录后一次提交，每个请求只执行一条 UPDATE/DELETE 并提交一次，
+# 通过 RETURNING 得到实际处理的记录，逐个返回结果（ok / not_found）
+BULK_MAX_IDS = 1000
+
+def get_bulk_ids(data):
+    """校验并去重请求中的 ids，格式不对时返回 None"""
+    ids = data.get('ids')
+    if not isinstance(ids, list) or not ids or len(ids) > BULK_MAX_IDS:
+        return None
+    if not all(isinstance(i, int) and not isinstance(i, bool) for i in ids):
+        return None
+    return list(dict.fromkeys(ids))
+
+@retry_on_lock
+def bulk_execute(statement, model, ids):
+    processed = set(db.session.scalars(
+        statement.where(model.id.in_(ids)).returning(model.id)
+        .execution_options(synchronize_session=False)
+    ))
+    db.session.commit()
+    return {str(i): 'ok' if i in processed else 'not_found' for i in ids}
+
+def bulk_response(results, message):
+    count = sum(1 for result in results.values() if result == 'ok')
+    return jsonify({'success': True, 'message': message.format(count=count), 'count': count, 'results': results})
+
+@app.route('/admin/students/bulk', methods=['POST'])
+@login_required
+def admin_students_bulk():
+    """批量批准/拒绝/分组/删除学生"""
+    data = request.get_json(silent=True) or {}
+    ids = get_bulk_ids(data)
+    if ids is None:
+        return jsonify({'success': False, 'message': f'请选择 1-{BULK_MAX_IDS} 条记录！'})
+    
+    action = data.get('action')
+    if action == 'approve':
+        statement = db.update(Student).values(is_approved=True, approved_by=session['admin_id'],
+                                              approved_at=datetime.utcnow())
+        message = '已批准 {count} 份申请！'
+    elif action == 'reject':
+        statement = db.update(Student).values(is_approved=False, approved_by=None, approved_at=None)
+        message = '已拒绝 {count} 份申请！'
+    elif action == 'group':
+        group = data.get('group') or ''
+        if not isinstance(group, str):
+            return jsonify({'success': False, 'message': '分组名称格式不正确！'})
+        if len(group.strip()) > 50:
+            return jsonify({'success': False, 'message': '分组名称不能超过50个字符！'})
+        # 空分组保存为 NULL，与未分组的学生一致
+        group = group.strip() or None
+        statement = db.update(Student).values(group=group)
+        message = f'已将 {{count}} 名学生分配到 {group} 组！' if group else '已取消 {count} 名学生的分组！'
+    elif action == 'delete':
+        statement = db.delete(Student)
+        message = '已删除 {count} 名学生！'
+    else:
+        return jsonify({'success': False, 'message': '不支持的操作！'})
+    
+    results = bulk_execute(statement, Student, ids)
+    page_cache.invalidate('students')
+    return bulk_response(results, message)
+
 # 新闻管理
 @app.route('/admin/news')
 @login_required
@@ -460,35 +1761,19 @@ def admin_news():
 @login_required
 def admin_news_create():
     if request.method == 'POST':
-        # 处理文件上传
-        image_url = None
-        if 'image' in request.files:
-            file = request.files['image']
-            if file and file.filename != '' and allowed_file(file.filename):
-                # 生成安全的文件名
-                filename = secure_filename(file.filename)
-                # 添加UUID前缀避免文件名冲突
-                unique_filename = f"{uuid.uuid4().hex}_{filename}"
-                # 确保上传目录存在
-                news_upload_path = os.path.join(app.config['UPLOAD_FOLDER'], 'news')
-                os.makedirs(news_upload_path, exist_ok=True)
-                # 保存文件
-                file_path = os.path.join(news_upload_path, unique_filename)
-                file.save(file_path)
-                # 设置相对URL路径
-                image_url = f"/static/uploads/news/{unique_filename}"
-        
         news = News(
             title=request.form['title'],
             content=request.form['content'],
             category=request.form['category'],
-            image_url=image_url,
+            image_url=save_upload(request.files.get('image')),
             created_by=session['admin_id'],
             is_published=bool(request.form.get('is_published'))
         )
         
         db.session.add(news)
         db.session.commit()
+        schedule_image_processing(news, 'image_url', 'image_variants', 'news')
+        page_cache.invalidate('news')
         flash('新闻创建成功！', 'success')
         return redirect(url_for('admin_news'))
     
@@ -500,28 +1785,11 @@ def admin_news_edit(id):
     news = News.query.get_or_404(id)
     
     if request.method == 'POST':
-        # 处理文件上传
-        if 'image' in request.files:
-            file = request.files['image']
-            if file and file.filename != '' and allowed_file(file.filename):
-                # 删除旧图片文件（如果存在）
-                if news.image_url and news.image_url.startswith('/static/uploads/'):
-                    old_file_path = os.path.join(basedir, news.image_url.lstrip('/'))
-                    if os.path.exists(old_file_path):
-                        os.remove(old_file_path)
-                
-                # 生成安全的文件名
-                filename = secure_filename(file.filename)
-                # 添加UUID前缀避免文件名冲突
-                unique_filename = f"{uuid.uuid4().hex}_{filename}"
-                # 确保上传目录存在
-                news_upload_path = os.path.join(app.config['UPLOAD_FOLDER'], 'news')
-                os.makedirs(news_upload_path, exist_ok=True)
-                # 保存文件
-                file_path = os.path.join(news_upload_path, unique_filename)
-                file.save(file_path)
-                # 设置相对URL路径
-                news.image_url = f"/static/uploads/news/{unique_filename}"
+        # 处理文件上传，旧图片不再被引用后由 sweep-uploads 清理
+        image_url = save_upload(request.files.get('image'))
+        if image_url and image_url != news.image_url:
+            news.image_url = image_url
+            news.image_variants = None
         
         news.title = request.form['title']
         news.content = request.form['content']
@@ -529,6 +1797,8 @@ def admin_news_edit(id):
         news.is_published = bool(request.form.get('is_published'))
         
         db.session.commit()
+        schedule_image_processing(news, 'image_url', 'image_variants', 'news')
+        page_cache.invalidate('news')
         flash('新闻更新成功！', 'success')
         return redirect(url_for('admin_news'))
     
@@ -540,6 +1810,7 @@ def admin_news_delete(id):
     news = News.query.get_or_404(id)
     db.session.delete(news)
     db.session.commit()
+    page_cache.invalidate('news')
     flash('新闻删除成功！', 'success')
     return redirect(url_for('admin_news'))
 
@@ -548,8 +1819,7 @@ def admin_news_delete(id):
 @login_required
 def admin_timeline():
     page = request.args.get('page', 1, type=int)
-    timelines = Timeline.query.order_by(Timeline.order_index.asc(), Timeline.created_at.desc()).paginate(
-        page=page, per_page=10, error_out=False)
+    timelines = display_order_query(Timeline).paginate(page=page, per_page=10, error_out=False)
     return render_template('admin/timeline.html', timelines=timelines)
 
 @app.route('/admin/timeline/create', methods=['GET', 'POST'])
@@ -567,6 +1837,7 @@ def admin_timeline_create():
         )
         db.session.add(timeline)
         db.session.commit()
+        page_cache.invalidate('timeline')
         flash('时间线事件创建成功！', 'success')
         return redirect(url_for('admin_timeline'))
     return render_template('admin/timeline_form.html')
@@ -584,6 +1855,7 @@ def admin_timeline_edit(id):
         timeline.is_published = bool(request.form.get('is_published'))
         timeline.updated_at = datetime.utcnow()
         db.session.commit()
+        page_cache.invalidate('timeline')
         flash('时间线事件更新成功！', 'success')
         return redirect(url_for('admin_timeline'))
     return render_template('admin/timeline_form.html', timeline=timeline)
@@ -594,6 +1866,7 @@ def admin_timeline_delete(id):
     timeline = Timeline.query.get_or_404(id)
     db.session.delete(timeline)
     db.session.commit()
+    page_cache.invalidate('timeline')
     flash('时间线事件删除成功！', 'success')
     return redirect(url_for('admin_timeline'))
 
@@ -602,8 +1875,7 @@ def admin_timeline_delete(id):
 @login_required
 def admin_team():
     page = request.args.get('page', 1, type=int)
-    teams = Team.query.order_by(Team.order_index.asc(), Team.created_at.desc()).paginate(
-        page=page, per_page=10, error_out=False)
+    teams = display_order_query(Team).paginate(page=page, per_page=10, error_out=False)
     return render_template('admin/team.html', teams=teams)
 
 @app.route('/admin/team/create', methods=['GET', 'POST'])
@@ -621,6 +1893,7 @@ def admin_team_create():
         )
         db.session.add(team)
         db.session.commit()
+        page_cache.invalidate('team')
         flash('团队成员创建成功！', 'success')
         return redirect(url_for('admin_team'))
     return render_template('admin/team_form.html')
@@ -638,6 +1911,7 @@ def admin_team_edit(id):
         team.is_published = bool(request.form.get('is_published'))
         team.updated_at = datetime.utcnow()
         db.session.commit()
+        page_cache.invalidate('team')
         flash('团队成员更新成功！', 'success')
         return redirect(url_for('admin_team'))
     return render_template('admin/team_form.html', team=team)
@@ -648,6 +1922,7 @@ def admin_team_delete(id):
     team = Team.query.get_or_404(id)
     db.session.delete(team)
     db.session.commit()
+    page_cache.invalidate('team')
     flash('团队成员删除成功！', 'success')
     return redirect(url_for('admin_team'))
 
@@ -656,8 +1931,7 @@ def admin_team_delete(id):
 @login_required
 def admin_partners():
     page = request.args.get('page', 1, type=int)
-    partners = Partner.query.order_by(Partner.order_index.asc(), Partner.created_at.desc()).paginate(
-        page=page, per_page=12, error_out=False)
+    partners = display_order_query(Partner).paginate(page=page, per_page=12, error_out=False)
     return render_template('admin/partners.html', partners=partners)
 
 @app.route('/admin/partners/create', methods=['GET', 'POST'])
@@ -676,6 +1950,7 @@ def admin_partners_create():
         )
         db.session.add(partner)
         db.session.commit()
+        page_cache.invalidate('partners')
         flash('合作伙伴创建成功！', 'success')
         return redirect(url_for('admin_partners'))
     return render_template('admin/partners_form.html')
@@ -694,6 +1969,7 @@ def admin_partners_edit(id):
         partner.is_published = bool(request.form.get('is_published'))
         partner.updated_at = datetime.utcnow()
         db.session.commit()
+        page_cache.invalidate('partners')
         flash('合作伙伴更新成功！', 'success')
         return redirect(url_for('admin_partners'))
     return render_template('admin/partners_form.html', partner=partner)
@@ -704,9 +1980,31 @@ def admin_partners_delete(id):
     partner = Partner.query.get_or_404(id)
     db.session.delete(partner)
     db.session.commit()
+    page_cache.invalidate('partners')
     flash('合作伙伴删除成功！', 'success')
     return redirect(url_for('admin_partners'))
 
+# 排序调整：时间线/团队/合作伙伴列表中修改多条记录的排序后一次保存
+REORDER_MODELS = {'timeline': Timeline, 'team': Team, 'partners': Partner}
+
+@app.route('/admin/<any(timeline, team, partners):kind>/reorder', methods=['POST'])
+@login_required
+def admin_reorder(kind):
+    """请求体为 {"items": [{"id": 1, "order_index": 0}, ...]}，用一条 UPDATE ... CASE 写入"""
+    model = REORDER_MODELS[kind]
+    items = (request.get_json(silent=True) or {}).get('items')
+    try:
+        order = {int(item['id']): int(item['order_index']) for item in items}
+    except (TypeError, KeyError, ValueError):
+        return jsonify({'success': False, 'message': '排序数据格式错误！'})
+    if not order or len(order) > BULK_MAX_IDS:
+        return jsonify({'success': False, 'message': f'请提交 1-{BULK_MAX_IDS} 条记录的排序！'})
+    
+    statement = db.update(model).values(order_index=db.case(order, value=model.id))
+    results = bulk_execute(statement, model, list(order))
+    page_cache.invalidate(kind)
+    return bulk_response(results, '已更新 {count} 条记录的排序！')
+
 # 联系信息管理
 @app.route('/admin/contact')
 @login_required
@@ -738,6 +2036,8 @@ def admin_contact_edit():
             db.session.add(contact)
         
         db.session.commit()
+        refresh_contact_info()
+        page_cache.clear()  # 联系信息出现在所有页面的页脚
         flash('联系信息更新成功！', 'success')
         return redirect(url_for('admin_contact'))
     
@@ -780,6 +2080,28 @@ def admin_message_delete(message_id):
     flash('消息删除成功！', 'success')
     return redirect(url_for('admin_messages'))
 
+@app.route('/admin/messages/bulk', methods=['POST'])
+@login_required
+def admin_messages_bulk():
+    """批量标记已读/删除消息"""
+    data = request.get_json(silent=True) or {}
+    ids = get_bulk_ids(data)
+    if ids is None:
+        return jsonify({'success': False, 'message': f'请选择 1-{BULK_MAX_IDS} 条消息！'})
+    
+    action = data.get('action')
+    if action == 'read':
+        statement = db.update(ContactMessage).values(is_read=True, replied_by=session['admin_id'],
+                                                     replied_at=datetime.utcnow())
+        message = '已将 {count} 条消息标记为已读'
+    elif action == 'delete':
+        statement = db.delete(ContactMessage)
+        message = '已删除 {count} 条消息'
+    else:
+        return jsonify({'success': False, 'message': '不支持的操作！'})
+    
+    return bulk_response(bulk_execute(statement, ContactMessage, ids), message)
+
 # 学生信息管理
 @app.route('/admin/students/info')
 @login_required
@@ -788,20 +2110,7 @@ def admin_students_info():
     search = request.args.get('search', '')
     grade = request.args.get('grade', '')
     
-    query = Student.query
-    
-    if search:
-        query = query.filter(
-            db.or_(
-                Student.name.contains(search),
-                Student.university.contains(search),
-                Student.major.contains(search),
-                Student.email.contains(search)
-            )
-        )
-    
-    if grade:
-        query = query.filter(Student.grade == grade)
+    query = filter_students(Student.query, search, grade)
     
     students = query.order_by(Student.created_at.desc()).paginate(
         page=page, per_page=15, error_out=False
@@ -827,181 +2136,962 @@ def admin_students_edit(id):
         student.university = request.form['university']
         student.major = request.form['major']
         student.grade = request.form['grade']
-        student.email = request.form['email']
+        student.email = normalize_email(request.form['email'])
         student.phone = request.form['phone']
         student.bio = request.form['bio']
         
+        avatar_url = save_upload(request.files.get('avatar'))
+        if avatar_url and avatar_url != student.avatar_url:
+            student.avatar_url = avatar_url
+            student.avatar_variants = None
+        
         db.session.commit()
+        schedule_image_processing(student, 'avatar_url', 'avatar_variants', 'students')
+        page_cache.invalidate('students')
         flash('学生信息更新成功！', 'success')
         return redirect(url_for('admin_students_info'))
     
     return render_template('admin/students_edit.html', student=student)
 
-# 导出学生信息为Excel
-@app.route('/admin/students/export')
-@login_required
-def admin_students_export():
-    # 获取所有学生信息
-    students = Student.query.all()
+# 导出学生信息（Excel / CSV / NDJSON），按批次读取并流式输出
+EXPORT_BATCH_SIZE = 1000
+EXPORT_COLUMNS = [
+    ('id', 'ID', 8),
+    ('name', '姓名', 15),
+    ('university', '大学', 25),
+    ('major', '专业', 20),
+    ('grade', '年级', 10),
+    ('email', '邮箱', 25),
+    ('phone', '电话', 15),
+    ('join_date', '加入日期', 12),
+    ('is_approved', '审核状态', 10),
+    ('bio', '个人简介', 30),
+]
+EXPORT_FORMATS = {
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+def iter_export_students(search='', grade='', group=''):
+    """只查询导出需要的字段，用 yield_per 分批从数据库读取"""
+    columns = [getattr(Student, name) for name, _, _ in EXPORT_COLUMNS]
+    query = filter_students(db.session.query(*columns), search, grade, group)
+    return query.order_by(Student.id).yield_per(EXPORT_BATCH_SIZE)
+
+def format_export_row(row):
+    return [
+        row.id,
+        row.name,
+        row.university,
+        row.major,
+        row.grade or '未设置',
+        row.email,
+        row.phone or '未填写',
+        row.join_date.strftime('%Y-%m-%d') if row.join_date else '未知',
+        '已审核' if row.is_approved else '待审核',
+        row.bio or '无'
+    ]
+
+def write_students_xlsx(rows, fileobj):
+    """使用 openpyxl 只写模式生成Excel写入 fileobj
     
-    # 创建工作簿和工作表
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "学生信息"
+    行数据逐行写入 openpyxl 的临时文件，不在内存中保留；全部行写完后 wb.save() 才把它们打包成 xlsx（zip）写入 fileobj。
+    """
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("学生信息")
     
-    # 设置表头
-    headers = ['ID', '姓名', '大学', '专业', '年级', '邮箱', '电话', '加入日期', '审核状态', '个人简介']
-    ws.append(headers)
+    for i, (_, _, width) in enumerate(EXPORT_COLUMNS, 1):
+        ws.column_dimensions[get_column_letter(i)].width = width
     
     # 设置表头样式
     header_font = Font(bold=True, color="FFFFFF")
     header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
     header_alignment = Alignment(horizontal="center", vertical="center")
-    
-    for col_num, header in enumerate(headers, 1):
-        cell = ws.cell(row=1, column=col_num)
+    header = []
+    for _, title, _ in EXPORT_COLUMNS:
+        cell = WriteOnlyCell(ws, value=title)
         cell.font = header_font
         cell.fill = header_fill
         cell.alignment = header_alignment
+        header.append(cell)
+    ws.append(header)
     
-    # 添加学生数据
-    for student in students:
-        row_data = [
-            student.id,
-            student.name,
-            student.university,
-            student.major,
-            student.grade or '未设置',
-            student.email,
-            student.phone or '未填写',
-            student.join_date.strftime('%Y-%m-%d') if student.join_date else '未知',
-            '已审核' if student.is_approved else '待审核',
-            student.bio or '无'
-        ]
-        ws.append(row_data)
-    
-    # 调整列宽
-    column_widths = [8, 15, 25, 20, 10, 25, 15, 12, 10, 30]
-    for i, width in enumerate(column_widths, 1):
-        ws.column_dimensions[ws.cell(row=1, column=i).column_letter].width = width
+    for row in rows:
+        ws.append(format_export_row(row))
     
-    # 创建内存中的文件
-    output = BytesIO()
-    wb.save(output)
-    output.seek(0)
+    wb.save(fileobj)
+
+def stream_students_xlsx(rows, chunk_size=64 * 1024):
+    """xlsx 是 zip 格式，无法边查询边输出：先把整个文件写入临时文件，再分块发送，第一个字节要等全部行写完才发出"""
+    with tempfile.TemporaryFile() as fileobj:
+        write_students_xlsx(rows, fileobj)
+        fileobj.seek(0)
+        while True:
+            chunk = fileobj.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+def stream_students_csv(rows):
+    buffer = StringIO()
+    writer = csv.writer(buffer)
+    # 带BOM，Excel 打开时能正确识别UTF-8中文
+    buffer.write('\ufeff')
+    writer.writerow([title for _, title, _ in EXPORT_COLUMNS])
+    for count, row in enumerate(rows, 1):
+        writer.writerow(format_export_row(row))
+        if count % EXPORT_BATCH_SIZE == 0:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode('utf-8')
+
+def stream_students_ndjson(rows):
+    lines = []
+    for row in rows:
+        record = dict(row._mapping)
+        record['join_date'] = row.join_date.isoformat() if row.join_date else None
+        lines.append(json.dumps(record, ensure_ascii=False))
+        if len(lines) >= EXPORT_BATCH_SIZE:
+            yield ('\n'.join(lines) + '\n').encode('utf-8')
+            lines = []
+    if lines:
+        yield ('\n'.join(lines) + '\n').encode('utf-8')
+
+EXPORT_WRITERS = {
+    'xlsx': stream_students_xlsx,
+    'csv': stream_students_csv,
+    'ndjson': stream_students_ndjson,
+}
+
+def export_filename(fmt):
+    return f'学生信息_{datetime.now().strftime("%Y%m%d_%H%M%S")}.{fmt}'
+
+@app.route('/admin/students/export')
+@login_required
+def admin_students_export():
+    fmt = request.args.get('format', 'xlsx')
+    if fmt not in EXPORT_FORMATS:
+        flash('不支持的导出格式！', 'error')
+        return redirect(url_for('admin_students_info'))
     
-    # 创建响应
-    response = make_response(output.getvalue())
-    response.headers['Content-Type'] = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+    rows = iter_export_students(
+        request.args.get('search', ''),
+        request.args.get('grade', ''),
+        request.args.get('group', '')
+    )
+    response = app.response_class(stream_with_context(EXPORT_WRITERS[fmt](rows)), mimetype=EXPORT_FORMATS[fmt])
     
     # 使用URL编码处理中文文件名
-    filename = f'学生信息_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx'
-    encoded_filename = quote(filename.encode('utf-8'))
-    response.headers['Content-Disposition'] = f'attachment; filename*=UTF-8\'\'\'{encoded_filename}'
+    encoded_filename = quote(export_filename(fmt).encode('utf-8'))
+    response.headers['Content-Disposition'] = f"attachment; filename*=UTF-8''{encoded_filename}"
     
     return response
 
-# 数据统计和分析
-@app.route('/admin/statistics')
+# 后台导出任务：在线程池中生成文件到磁盘，前端轮询进度后下载。
+# 任务状态保存为导出目录中的 <id>.json，轮询和下载请求可以由任意工作进程处理；
+# 生成文件的进程在任务结束前持有 <id>.lock 的文件锁，锁可以获取说明该进程已退出
+EXPORT_JOB_ID_PATTERN = re.compile(r'^[0-9a-f]{32}$')
+EXPORT_JOB_STATE_PATTERN = re.compile(r'^([0-9a-f]{32})\.json$')
+EXPORT_PROGRESS_SAVE_INTERVAL = 0.5  # 生成过程中写入进度的最小间隔（秒）
+
+class ExportJob:
+    def __init__(self, fmt, filters, job_id=None):
+        self.id = job_id or uuid.uuid4().hex
+        self.key = export_job_key(fmt, filters)
+        self.format = fmt
+        self.filters = filters
+        self.status = 'queued'  # queued / running / done / failed
+        self.processed = 0
+        self.total = None
+        self.error = None
+        self.created_at = time.time()
+        self.finished_at = None
+        self.lock_file = None
+    
+    @property
+    def path(self):
+        return os.path.join(app.config['EXPORT_FOLDER'], f'{self.id}.{self.format}')
+    
+    @property
+    def state_path(self):
+        return os.path.join(app.config['EXPORT_FOLDER'], f'{self.id}.json')
+    
+    @property
+    def lock_path(self):
+        return os.path.join(app.config['EXPORT_FOLDER'], f'{self.id}.lock')
+    
+    @property
+    def finished(self):
+        return self.status in ('done', 'failed')
+    
+    def save(self):
+        write_file_atomic(self.state_path, json.dumps(self.to_dict(), ensure_ascii=False).encode('utf-8'))
+    
+    @classmethod
+    def load(cls, job_id):
+        """读取任务状态，不存在或无法解析时返回None"""
+        try:
+            with open(os.path.join(app.config['EXPORT_FOLDER'], f'{job_id}.json'), encoding='utf-8') as f:
+                data = json.load(f)
+            job = cls(data['format'], data['filters'], job_id)
+            for name in ('status', 'processed', 'total', 'error', 'created_at', 'finished_at'):
+                setattr(job, name, data[name])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        return job
+    
+    def lock(self):
+        """创建任务的进程持有锁直到任务结束"""
+        self.lock_file = open(self.lock_path, 'wb')
+        if fcntl is not None:
+            fcntl.flock(self.lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    
+    def unlock(self):
+        os.remove(self.lock_path)
+        self.lock_file.close()
+        self.lock_file = None
+    
+    def owner_exited(self):
+        """锁文件不存在或锁可以获取时，说明生成该任务的进程已退出（没有 fcntl 时无法判断，视为仍在运行）"""
+        if fcntl is None:
+            return False
+        try:
+            fileobj = open(self.lock_path, 'rb')
+        except FileNotFoundError:
+            return True
+        with fileobj:
+            try:
+                fcntl.flock(fileobj, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                return False
+        return True
+    
+    @property
+    def percent(self):
+        if self.status == 'done':
+            return 100
+        if not self.total:
+            return 0
+        return min(99, self.processed * 100 // self.total)
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'format': self.format,
+            'filters': self.filters,
+            'status': self.status,
+            'processed': self.processed,
+            'total': self.total,
+            'percent': self.percent,
+            'error': self.error,
+            'created_at': self.created_at,
+            'finished_at': self.finished_at,
+        }
+
+export_jobs_lock = threading.Lock()
+export_executor = ThreadPoolExecutor(max_workers=app.config['EXPORT_WORKERS'], thread_name_prefix='export')
+export_gc_started = threading.Event()
+
+def export_job_key(fmt, filters):
+    return json.dumps([fmt, filters], ensure_ascii=False, sort_keys=True)
+
+def load_export_job(job_id):
+    """读取任务状态；任务未结束而生成它的进程已退出时，标记为失败"""
+    job = ExportJob.load(job_id)
+    if job and not job.finished and job.owner_exited():
+        # 任务正常结束时先写入最终状态再删除锁文件，重新读取一次以免误判
+        job = ExportJob.load(job_id)
+        if job and not job.finished:
+            job.status = 'failed'
+            job.error = '导出进程已退出，请重新导出'
+            job.finished_at = time.time()
+            job.save()
+    return job
+
+def list_export_jobs():
+    folder = app.config['EXPORT_FOLDER']
+    if not os.path.isdir(folder):
+        return []
+    jobs = []
+    for name in sorted(os.listdir(folder)):
+        match = EXPORT_JOB_STATE_PATTERN.match(name)
+        job = match and load_export_job(match.group(1))
+        if job:
+            jobs.append(job)
+    return jobs
+
+def find_reusable_export_job(key):
+    """相同格式和筛选条件的任务：进行中的直接复用，已完成的在复用窗口内且文件仍在时复用"""
+    now = time.time()
+    for job in list_export_jobs():
+        if job.key != key:
+            continue
+        if job.status in ('queued', 'running'):
+            return job
+        if job.status == 'done' and now - job.finished_at < app.config['EXPORT_REUSE_SECONDS'] \
+                and os.path.exists(job.path):
+            return job
+    return None
+
+def run_export_job(job):
+    partial_path = job.path + '.part'
+    try:
+        job.status = 'running'
+        job.save()
+        with app.app_context():
+            count_query = filter_students(db.session.query(db.func.count(Student.id)), **job.filters)
+            job.total = count_query.scalar()
+            job.save()
+            
+            def counted(rows):
+                saved_at = time.monotonic()
+                for count, row in enumerate(rows, 1):
+                    job.processed = count
+                    if time.monotonic() - saved_at >= EXPORT_PROGRESS_SAVE_INTERVAL:
+                        job.save()
+                        saved_at = time.monotonic()
+                    yield row
+            
+            rows = counted(iter_export_students(**job.filters))
+            with open(partial_path, 'wb') as fileobj:
+                if job.format == 'xlsx':
+                    write_students_xlsx(rows, fileobj)
+                else:
+                    for chunk in EXPORT_WRITERS[job.format](rows):
+                        fileobj.write(chunk)
+            db.session.remove()
+        os.replace(partial_path, job.path)
+        job.status = 'done'
+    except Exception as e:
+        app.logger.exception('导出任务 %s 失败', job.id)
+        job.status = 'failed'
+        job.error = str(e)
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+    finally:
+        job.finished_at = time.time()
+        try:
+            job.save()
+        finally:
+            job.unlock()
+
+def submit_export_job(fmt, filters):
+    """返回 (任务, 是否复用了已有任务)
+    
+    同一进程内相同条件的并发提交只会创建一个任务；不同进程同时提交时可能各自生成一份。
+    """
+    start_export_gc()
+    key = export_job_key(fmt, filters)
+    os.makedirs(app.config['EXPORT_FOLDER'], exist_ok=True)
+    with export_jobs_lock:
+        job = find_reusable_export_job(key)
+        if job:
+            return job, True
+        job = ExportJob(fmt, filters)
+        # 先持有锁再写状态，其他进程读到未结束的状态时锁文件一定存在
+        job.lock()
+        job.save()
+    export_executor.submit(run_export_job, job)
+    return job, False
+
+def cleanup_export_jobs(now=None):
+    """删除超过保留时间的任务状态和导出文件（包括进程重启前遗留的文件），返回删除的文件数"""
+    now = now or time.time()
+    retention = app.config['EXPORT_RETENTION_SECONDS']
+    active = set()
+    for job in list_export_jobs():
+        if not job.finished or now - job.finished_at <= retention:
+            active.update(os.path.basename(path) for path in (job.path, job.path + '.part', job.state_path, job.lock_path))
+    
+    removed = 0
+    folder = app.config['EXPORT_FOLDER']
+    if not os.path.isdir(folder):
+        return removed
+    for name in os.listdir(folder):
+        path = os.path.join(folder, name)
+        if name in active or not os.path.isfile(path):
+            continue
+        if now - os.path.getmtime(path) > retention:
+            os.remove(path)
+            removed += 1
+    return removed
+
+def export_gc_loop():
+    while True:
+        time.sleep(app.config['EXPORT_GC_INTERVAL'])
+        try:
+            cleanup_export_jobs()
+        except Exception:
+            app.logger.exception('清理导出文件失败')
+
+def start_export_gc():
+    if not export_gc_started.is_set():
+        export_gc_started.set()
+        threading.Thread(target=export_gc_loop, name='export-gc', daemon=True).start()
+
+@app.cli.command('cleanup-exports')
+def cleanup_exports_command():
+    """立即清理过期的导出文件"""
+    removed = cleanup_export_jobs()
+    print(f'已删除 {removed} 个过期导出文件')
+
+def get_export_job_or_404(job_id):
+    job = load_export_job(job_id) if EXPORT_JOB_ID_PATTERN.match(job_id) else None
+    if job is None:
+        abort(404)
+    return job
+
+@app.route('/admin/students/export/jobs', methods=['POST'])
 @login_required
-def admin_statistics():
-    # 基础统计数据
-    total_events = Event.query.count()
-    published_events = Event.query.filter_by(is_published=True).count()
-    total_news = News.query.count()
-    published_news = News.query.filter_by(is_published=True).count()
-    total_students = Student.query.count()
-    approved_students = Student.query.filter_by(is_approved=1).count()
-    pending_students = Student.query.filter(Student.is_approved.is_(None)).count()
+def admin_students_export_job_create():
+    data = request.get_json(silent=True) or request.form
+    if not isinstance(data, dict):
+        return jsonify({'success': False, 'message': '请求数据格式不正确！'})
+    fmt = data.get('format', 'xlsx')
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({'success': False, 'message': '不支持的导出格式！'})
+    
+    filters = {name: data.get(name, '') for name in ('search', 'grade', 'group')}
+    if not all(isinstance(value, str) for value in filters.values()):
+        return jsonify({'success': False, 'message': '筛选条件格式不正确！'})
+    job, reused = submit_export_job(fmt, filters)
+    return jsonify({
+        'success': True,
+        'reused': reused,
+        'job': job.to_dict(),
+        'status_url': url_for('admin_students_export_job_status', job_id=job.id),
+        'download_url': url_for('admin_students_export_job_download', job_id=job.id),
+    }), 202
+
+@app.route('/admin/students/export/jobs/<job_id>')
+@login_required
+def admin_students_export_job_status(job_id):
+    job = get_export_job_or_404(job_id)
+    return jsonify({'success': True, 'job': job.to_dict()})
+
+@app.route('/admin/students/export/jobs/<job_id>/download')
+@login_required
+def admin_students_export_job_download(job_id):
+    job = get_export_job_or_404(job_id)
+    if job.status != 'done' or not os.path.exists(job.path):
+        flash('导出文件尚未生成或已过期！', 'error')
+        return redirect(url_for('admin_students_info'))
     
-    # 月度统计数据
-    from datetime import datetime, timedelta
-    import calendar
+    return send_file(job.path, mimetype=EXPORT_FORMATS[job.format], as_attachment=True,
+                     download_name=export_filename(job.format))
+
+# 批量导入学生：流式读取 XLSX（openpyxl 只读模式）或 CSV，按批校验后用一条 INSERT ... ON CONFLICT(email)
+# 批量写入，已存在的邮箱只更新文件中提供的列。出错的行写入错误报告（保存在导出目录，随导出文件一起过期清理）
+# 列名 -> (表头别名, 最大长度, 是否必填)，表头可以用字段名或中文名（与导出文件一致）
+IMPORT_COLUMNS = {
+    'name': (('姓名',), 100, True),
+    'university': (('大学', '学校'), 200, True),
+    'major': (('专业',), 100, True),
+    'email': (('邮箱',), 120, True),
+    'grade': (('年级',), 20, False),
+    'group': (('分组',), 50, False),
+    'phone': (('电话', '手机'), 20, False),
+    'bio': (('个人简介', '简介'), None, False),
+    'password': (('密码',), None, False),
+}
+IMPORT_HEADER_ALIASES = {alias: name for name, (aliases, _, _) in IMPORT_COLUMNS.items() for alias in (name,) + aliases}
+EMAIL_PATTERN = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+
+class StudentImportError(ValueError):
+    """导入文件格式错误（缺少必填列、无法解析等）"""
+
+def iter_import_file(fileobj, filename):
+    """逐行读取导入文件，返回 (表头对应的字段列表, 行迭代器)，行迭代器产生 (行号, 单元格列表)"""
+    if filename.lower().endswith('.xlsx'):
+        try:
+            workbook = load_workbook(fileobj, read_only=True, data_only=True)
+        except Exception as e:
+            raise StudentImportError(f'无法读取Excel文件：{e}')
+        rows = workbook.active.iter_rows(values_only=True)
+    elif filename.lower().endswith('.csv'):
+        rows = csv.reader(TextIOWrapper(fileobj, encoding='utf-8-sig', newline=''))
+    else:
+        raise StudentImportError('只支持 .xlsx 和 .csv 文件')
     
-    # 获取最近12个月的数据
+    header = next(rows, None) or []
+    fields = [IMPORT_HEADER_ALIASES.get(str(cell).strip()) if cell is not None else None for cell in header]
+    missing = [IMPORT_COLUMNS[name][0][0] for name, (_, _, required) in IMPORT_COLUMNS.items()
+               if required and name not in fields]
+    if missing:
+        raise StudentImportError('缺少必填列：' + '、'.join(missing))
+    return fields, enumerate(rows, 2)
+
+def validate_import_row(fields, cells):
+    """返回 (记录, 错误信息)，记录只包含文件中提供的列"""
+    record = {}
+    for name, value in zip(fields, cells):
+        if name is None:
+            continue
+        if isinstance(value, float) and value.is_integer():
+            value = int(value)  # Excel 中的电话、年级等数字列
+        record[name] = '' if value is None else str(value).strip()
+    
+    for name, (aliases, max_length, required) in IMPORT_COLUMNS.items():
+        value = record.get(name, '')
+        if required and not value:
+            return None, f'{aliases[0]}不能为空'
+        if max_length and len(value) > max_length:
+            return None, f'{aliases[0]}超过{max_length}个字符'
+    record['email'] = normalize_email(record['email'])
+    if not EMAIL_PATTERN.match(record['email']):
+        return None, '邮箱格式不正确'
+    return record, None
+
+# 每个进程池任务计算的哈希数：任务较小，登录/注册的哈希任务不必排在一大批导入之后
+IMPORT_HASH_CHUNK = 8
+
+def generate_password_hashes(passwords, method, salt_length):
+    return [generate_password_hash(password, method, salt_length) for password in passwords]
+
+def hash_import_passwords(records):
+    """用登录共用的密码进程池计算一批记录的密码哈希，没有密码的记录为 None
+    
+    同时在途的任务数不超过 PASSWORD_HASH_WORKERS，导入不会占满排队名额，也不会额外启动进程
+    """
+    indexes = [i for i, record in enumerate(records) if record.get('password')]
+    passwords = [records[i]['password'] for i in indexes]
+    method, salt_length = app.config['PASSWORD_HASH_METHOD'], app.config['PASSWORD_SALT_LENGTH']
+    if not app.config['PASSWORD_HASH_WORKERS']:
+        hashes = generate_password_hashes(passwords, method, salt_length)
+    else:
+        hashes, pending = [], deque()
+        for start in range(0, len(passwords), IMPORT_HASH_CHUNK):
+            if len(pending) >= app.config['PASSWORD_HASH_WORKERS']:
+                hashes += password_task_result(pending.popleft())
+            pending.append(submit_password_task(generate_password_hashes, passwords[start:start + IMPORT_HASH_CHUNK],
+                                                method, salt_length, wait=True))
+        while pending:
+            hashes += password_task_result(pending.popleft())
+    result = [None] * len(records)
+    for i, pwhash in zip(indexes, hashes):
+        result[i] = pwhash
+    return result
+
+def upsert_students(records, fields, approve, admin_id):
+    """写入一批已校验的记录，返回 (新增数, 更新数)"""
+    # 同一批中邮箱重复时保留最后一行
+    records = list({record['email']: record for record in records}.values())
+    emails = [record['email'] for record in records]
+    now = datetime.utcnow()
+    columns = [name for name in IMPORT_COLUMNS if name != 'password' and name in fields]
+    password_hashes = hash_import_passwords(records) if 'password' in fields else [None] * len(records)
+    rows = [
+        dict({name: record.get(name) or None for name in columns}, password_hash=pwhash,
+             is_approved=approve, approved_by=admin_id if approve else None, approved_at=now if approve else None)
+        for record, pwhash in zip(records, password_hashes)
+    ]
+    
+    statement = sqlite_insert(Student)
+    update = {name: statement.excluded[name] for name in columns if name != 'email'}
+    update['updated_at'] = now
+    if 'password' in fields:
+        # 密码留空的行保留原密码
+        update['password_hash'] = db.func.coalesce(statement.excluded.password_hash, Student.password_hash)
+    
+    @retry_on_lock
+    def save():
+        existing = set(db.session.scalars(db.select(Student.email).where(Student.email.in_(emails))))
+        db.session.execute(statement.on_conflict_do_update(index_elements=['email'], set_=update), rows)
+        db.session.commit()
+        return len(records) - len(existing), len(existing)
+    return save()
+
+def import_students(fileobj, filename, approve=True, admin_id=None, report_path=None):
+    """导入学生，返回统计结果；有错误行时写入 report_path（CSV）"""
+    fields, rows = iter_import_file(fileobj, filename)
+    batch_size = app.config['IMPORT_BATCH_SIZE']
+    result = {'total': 0, 'created': 0, 'updated': 0, 'failed': 0, 'report': None}
+    report_file = report_writer = None
+    try:
+        batch = []
+        for line, cells in rows:
+            if not any(cell not in (None, '') for cell in cells):
+                continue  # 跳过空行
+            result['total'] += 1
+            record, error = validate_import_row(fields, cells)
+            if error:
+                result['failed'] += 1
+                if report_writer is None and report_path:
+                    report_file = open(report_path, 'w', encoding='utf-8-sig', newline='')
+                    report_writer = csv.writer(report_file)
+                    report_writer.writerow(['行号', '错误', '原始数据'])
+                if report_writer:
+                    report_writer.writerow([line, error, ','.join('' if cell is None else str(cell) for cell in cells)])
+                continue
+            batch.append(record)
+            if len(batch) >= batch_size:
+                created, updated = upsert_students(batch, fields, approve, admin_id)
+                result['created'] += created
+                result['updated'] += updated
+                batch = []
+        if batch:
+            created, updated = upsert_students(batch, fields, approve, admin_id)
+            result['created'] += created
+            result['updated'] += updated
+    finally:
+        if report_file is not None:
+            report_file.close()
+            result['report'] = report_path
+    page_cache.invalidate('students')
+    return result
+
+@app.cli.command('import-students')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--pending', is_flag=True, help='导入的学生需要审核（默认直接通过）')
+@click.option('--report', 'report_path', default=None, help='错误报告路径，默认为 <文件名>.errors.csv')
+def import_students_command(path, pending, report_path):
+    """从 XLSX/CSV 文件批量导入学生，按邮箱去重"""
+    report_path = report_path or os.path.splitext(path)[0] + '.errors.csv'
+    started = time.time()
+    try:
+        with open(path, 'rb') as fileobj:
+            result = import_students(fileobj, path, approve=not pending, report_path=report_path)
+    except StudentImportError as e:
+        raise click.ClickException(str(e))
+    print(f"共 {result['total']} 行：新增 {result['created']}，更新 {result['updated']}，"
+          f"失败 {result['failed']}，用时 {time.time() - started:.1f} 秒")
+    if result['report']:
+        print(f"错误报告：{result['report']}")
+
+@app.route('/admin/students/import', methods=['POST'])
+@login_required
+def admin_students_import():
+    """上传 XLSX/CSV 批量导入学生"""
+    file = request.files.get('file')
+    if not file or not file.filename:
+        return jsonify({'success': False, 'message': '请选择要导入的文件！'})
+    
+    report_id = uuid.uuid4().hex
+    os.makedirs(app.config['EXPORT_FOLDER'], exist_ok=True)
+    report_path = os.path.join(app.config['EXPORT_FOLDER'], f'import-errors-{report_id}.csv')
+    try:
+        result = import_students(file.stream, file.filename, approve=bool(request.form.get('approve')),
+                                 admin_id=session['admin_id'], report_path=report_path)
+    except StudentImportError as e:
+        return jsonify({'success': False, 'message': str(e)})
+    
+    return jsonify({
+        'success': True,
+        'message': f"共 {result['total']} 行：新增 {result['created']}，更新 {result['updated']}，失败 {result['failed']}",
+        'result': {key: value for key, value in result.items() if key != 'report'},
+        'report_url': url_for('admin_students_import_report', report_id=report_id) if result['report'] else None,
+    })
+
+@app.route('/admin/students/import/reports/<report_id>')
+@login_required
+def admin_students_import_report(report_id):
+    if not re.fullmatch(r'[0-9a-f]{32}', report_id):
+        abort(404)
+    path = os.path.join(app.config['EXPORT_FOLDER'], f'import-errors-{report_id}.csv')
+    if not os.path.exists(path):
+        abort(404)
+    return send_file(path, mimetype='text/csv', as_attachment=True, download_name='导入错误报告.csv')
+
+# 数据统计和分析
+def recent_months(count, today=None):
+    """最近 count 个自然月（含当月），按时间正序返回 (year, month)"""
+    today = today or datetime.utcnow()
+    year, month = today.year, today.month
+    months = []
+    for _ in range(count):
+        months.append((year, month))
+        month -= 1
+        if month == 0:
+            year, month = year - 1, 12
+    months.reverse()
+    return months
+
+def build_monthly_data(months, events, news, students):
+    """把按 'YYYY-MM' 分组的计数补齐为连续的月份序列"""
     monthly_data = []
-    current_date = datetime.now()
-    
-    for i in range(12):
-        # 计算月份
-        month_date = current_date - timedelta(days=30*i)
-        month_start = month_date.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        if month_date.month == 12:
-            month_end = month_date.replace(year=month_date.year+1, month=1, day=1) - timedelta(seconds=1)
-        else:
-            month_end = month_date.replace(month=month_date.month+1, day=1) - timedelta(seconds=1)
-        
-        # 统计该月数据
-        month_events = Event.query.filter(
-            Event.created_at >= month_start,
-            Event.created_at <= month_end
-        ).count()
-        
-        month_news = News.query.filter(
-            News.created_at >= month_start,
-            News.created_at <= month_end
-        ).count()
-        
-        month_students = Student.query.filter(
-            Student.created_at >= month_start,
-            Student.created_at <= month_end
-        ).count()
-        
+    for year, month in months:
+        key = f'{year:04d}-{month:02d}'
         monthly_data.append({
-            'month': month_date.strftime('%Y-%m'),
-            'month_name': f"{month_date.year}年{month_date.month}月",
-            'events': month_events,
-            'news': month_news,
-            'students': month_students
+            'month': key,
+            'month_name': f"{year}年{month}月",
+            'events': events.get(key, 0),
+            'news': news.get(key, 0),
+            'students': students.get(key, 0)
         })
+    return monthly_data
+
+def count_by_month_query(model, since):
+    month = db.func.strftime('%Y-%m', model.created_at)
+    return db.session.query(month, db.func.count(model.id)).filter(model.created_at >= since).group_by(month)
+
+def count_by_month(model, since):
+    return dict(count_by_month_query(model, since).all())
+
+def count_by_query(column):
+    """按某一列分组计数"""
+    return db.session.query(column, db.func.count()).group_by(column)
+
+def aggregate_statistics():
+    """直接在源表上用分组聚合计算统计数据，每张表只查询常数次"""
+    months = recent_months(12)
+    since = datetime(months[0][0], months[0][1], 1)
+    
+    total_events, published_events = db.session.query(
+        db.func.count(Event.id),
+        db.func.count(Event.id).filter(Event.is_published == True)
+    ).one()
+    total_news, published_news = db.session.query(
+        db.func.count(News.id),
+        db.func.count(News.id).filter(News.is_published == True)
+    ).one()
+    total_students, approved_students, pending_students = db.session.query(
+        db.func.count(Student.id),
+        db.func.count(Student.id).filter(Student.is_approved == 1),
+        db.func.count(Student.id).filter(Student.is_approved == False)
+    ).one()
+    
+    monthly_data = build_monthly_data(
+        months, count_by_month(Event, since), count_by_month(News, since), count_by_month(Student, since)
+    )
+    
+    event_categories = count_by_query(Event.category).all()
+    news_categories = count_by_query(News.category).all()
+    student_grades = count_by_query(Student.grade).all()
+    
+    return {
+        'total_events': total_events,
+        'published_events': published_events,
+        'total_news': total_news,
+        'published_news': published_news,
+        'total_students': total_students,
+        'approved_students': approved_students,
+        'pending_students': pending_students,
+        'monthly_data': monthly_data,
+        'event_categories': [{'category': category, 'count': count} for category, count in event_categories],
+        'news_categories': [{'category': category, 'count': count} for category, count in news_categories],
+        'student_grades': [{'grade': grade, 'count': count} for grade, count in student_grades]
+    }
+
+# 汇总表的指标定义：表名 -> [(指标, 分桶表达式, 计数表达式)]，{row} 在触发器中替换为 new/old
+STATS_ROLLUP_METRICS = {
+    'event': [
+        ('events', "'all'", '1'),
+        ('events_published', "'all'", '{row}.is_published = 1'),
+        ('events_monthly', "COALESCE(strftime('%Y-%m', {row}.created_at), '')", '1'),
+        ('event_categories', '{row}.category', '1'),
+    ],
+    'news': [
+        ('news', "'all'", '1'),
+        ('news_published', "'all'", '{row}.is_published = 1'),
+        ('news_monthly', "COALESCE(strftime('%Y-%m', {row}.created_at), '')", '1'),
+        ('news_categories', '{row}.category', '1'),
+    ],
+    'student': [
+        ('students', "'all'", '1'),
+        ('students_approved', "'all'", '{row}.is_approved = 1'),
+        ('students_pending', "'all'", '{row}.is_approved = 0'),
+        ('students_monthly', "COALESCE(strftime('%Y-%m', {row}.created_at), '')", '1'),
+        ('student_grades', "COALESCE({row}.grade, '')", '1'),
+    ],
+}
+
+STATS_ROLLUP_WATCHED_COLUMNS = {
+    'event': 'is_published, created_at, category',
+    'news': 'is_published, created_at, category',
+    'student': 'is_approved, created_at, grade',
+}
+
+def stats_rollup_upserts(table, row, sign):
+    statements = []
+    for metric, bucket, weight in STATS_ROLLUP_METRICS[table]:
+        statements.append(
+            f"INSERT INTO stat_rollup(metric, bucket, value) "
+            f"VALUES ('{metric}', {bucket.format(row=row)}, {sign}({weight.format(row=row)})) "
+            f"ON CONFLICT(metric, bucket) DO UPDATE SET value = value + excluded.value;"
+        )
+    return '\n        '.join(statements)
+
+def stats_rollup_ddl():
+    """生成维护汇总表的触发器语句"""
+    ddl = []
+    for table in STATS_ROLLUP_METRICS:
+        ddl.append(f"""CREATE TRIGGER IF NOT EXISTS {table}_rollup_insert AFTER INSERT ON {table} BEGIN
+        {stats_rollup_upserts(table, 'new', '+')}
+    END""")
+        ddl.append(f"""CREATE TRIGGER IF NOT EXISTS {table}_rollup_delete AFTER DELETE ON {table} BEGIN
+        {stats_rollup_upserts(table, 'old', '-')}
+    END""")
+        ddl.append(f"""CREATE TRIGGER IF NOT EXISTS {table}_rollup_update
+    AFTER UPDATE OF {STATS_ROLLUP_WATCHED_COLUMNS[table]} ON {table} BEGIN
+        {stats_rollup_upserts(table, 'old', '-')}
+        {stats_rollup_upserts(table, 'new', '+')}
+    END""")
+    return ddl
+
+def rebuild_stats_rollup():
+    """根据源表重新计算汇总表"""
+    db.session.execute(db.text('DELETE FROM stat_rollup'))
+    for table, metrics in STATS_ROLLUP_METRICS.items():
+        for metric, bucket, weight in metrics:
+            db.session.execute(db.text(
+                f"INSERT INTO stat_rollup(metric, bucket, value) "
+                f"SELECT '{metric}', {bucket.format(row=table)}, SUM({weight.format(row=table)}) "
+                f"FROM {table} GROUP BY 2"
+            ))
+    db.session.commit()
+
+def init_stats_rollup():
+    """安装汇总表触发器；首次安装或指标定义改变后重新安装触发器，并根据现有数据回填"""
+    ddl = stats_rollup_ddl()
+    # sqlite_master 中保存的语句不含 IF NOT EXISTS
+    installed = set(db.session.scalars(db.text(
+        "SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name GLOB '*_rollup_*'"
+    )))
+    if installed == {statement.replace(' IF NOT EXISTS', '', 1) for statement in ddl}:
+        return
+    
+    for table in STATS_ROLLUP_METRICS:
+        for action in ('insert', 'delete', 'update'):
+            db.session.execute(db.text(f'DROP TRIGGER IF EXISTS {table}_rollup_{action}'))
+    for statement in ddl:
+        db.session.execute(db.text(statement))
+    db.session.commit()
+    rebuild_stats_rollup()
+
+@app.cli.command('rebuild-stats-rollup')
+def rebuild_stats_rollup_command():
+    """安装统计汇总触发器并重新计算汇总表"""
+    db.create_all()
+    init_stats_rollup()
+    rebuild_stats_rollup()
+    print('统计汇总表已重建')
+
+def rollup_statistics():
+    """从汇总表读取统计数据，一次主键范围查询即可"""
+    rollup = {}
+    for metric, bucket, value in db.session.query(StatRollup.metric, StatRollup.bucket, StatRollup.value):
+        rollup.setdefault(metric, {})[bucket] = value
+    
+    def total(metric):
+        return rollup.get(metric, {}).get('all', 0)
+    
+    def breakdown(metric, key):
+        items = []
+        for bucket, value in sorted(rollup.get(metric, {}).items()):
+            if value:
+                # 汇总表用空字符串代替 NULL 年级
+                items.append({key: None if key == 'grade' and bucket == '' else bucket, 'count': value})
+        return items
     
-    monthly_data.reverse()  # 按时间正序排列
-    
-    # 活动分类统计
-    event_categories_raw = db.session.query(
-        Event.category, 
-        db.func.count(Event.id).label('count')
-    ).group_by(Event.category).all()
-    event_categories = [{'category': row.category, 'count': row.count} for row in event_categories_raw]
-    
-    # 新闻分类统计
-    news_categories_raw = db.session.query(
-        News.category, 
-        db.func.count(News.id).label('count')
-    ).group_by(News.category).all()
-    news_categories = [{'category': row.category, 'count': row.count} for row in news_categories_raw]
-    
-    # 学生年级分布
-    student_grades_raw = db.session.query(
-        Student.grade, 
-        db.func.count(Student.id).label('count')
-    ).group_by(Student.grade).all()
-    student_grades = [{'grade': row.grade, 'count': row.count} for row in student_grades_raw]
-    
-
-    
-    return render_template('admin/statistics.html',
-                         total_events=total_events,
-                         published_events=published_events,
-                         total_news=total_news,
-                         published_news=published_news,
-                         total_students=total_students,
-                         approved_students=approved_students,
-                         pending_students=pending_students,
-                         monthly_data=monthly_data,
-                         event_categories=event_categories,
-                         news_categories=news_categories,
-                         student_grades=student_grades)
+    return {
+        'total_events': total('events'),
+        'published_events': total('events_published'),
+        'total_news': total('news'),
+        'published_news': total('news_published'),
+        'total_students': total('students'),
+        'approved_students': total('students_approved'),
+        'pending_students': total('students_pending'),
+        'monthly_data': build_monthly_data(
+            recent_months(12), rollup.get('events_monthly', {}),
+            rollup.get('news_monthly', {}), rollup.get('students_monthly', {})
+        ),
+        'event_categories': breakdown('event_categories', 'category'),
+        'news_categories': breakdown('news_categories', 'category'),
+        'student_grades': breakdown('student_grades', 'grade')
+    }
+
+@app.route('/admin/statistics')
+@login_required
+def admin_statistics():
+    if app.config['STATS_ROLLUP_ENABLED']:
+        stats = rollup_statistics()
+    else:
+        stats = aggregate_statistics()
+    return render_template('admin/statistics.html', **stats)
+
+# 公共列表页：只加载卡片用到的字段，长文本只读摘要，按游标分页
+# 页面与“加载更多”片段接口共用同一个查询，片段接口返回渲染好的卡片HTML
+STUDENT_SUMMARY_LENGTH = 80
+
+def public_events_query(category=''):
+    """首页、活动页和活动列表API共用，不加载完整的 description"""
+    query = Event.query.options(
+        load_only(Event.title, Event.excerpt, Event.location, Event.event_date, Event.category,
+                  Event.image_url, Event.image_variants)
+    )
+    if category:
+        query = query.filter_by(category=category)
+    return query
+
+def public_news_query(category=''):
+    """首页、新闻页和新闻列表API共用，不加载完整的 content"""
+    query = News.query.options(
+        load_only(News.title, News.excerpt, News.author, News.publish_date, News.category,
+                  News.image_url, News.image_variants)
+    )
+    if category:
+        query = query.filter_by(category=category)
+    return query
+
+def public_students_query():
+    # 不加载邮箱、电话和密码哈希，公开页面不展示这些字段
+    return Student.query.options(
+        load_only(Student.name, Student.university, Student.major, Student.avatar_url, Student.avatar_variants,
+                  Student.join_date),
+        with_expression(Student.summary, db.func.substr(Student.bio, 1, STUDENT_SUMMARY_LENGTH + 1))
+    )
+
+def home_events_query():
+    return public_events_query().order_by(Event.event_date.desc()).limit(3)
+
+def home_news_query():
+    return public_news_query().order_by(News.publish_date.desc()).limit(4)
+
+def display_order_query(model):
+    """时间线、团队和合作伙伴按排序索引和创建时间排列，关于我们页面和后台列表共用"""
+    return model.query.order_by(model.order_index.asc(), model.created_at.desc())
+
+def public_list_page(query, model, sort_column):
+    """取 cursor 参数指定的一页，返回 (items, next_cursor)，游标无效时返回404"""
+    try:
+        return keyset_paginate(query, model, sort_column, request.args.get('cursor', ''), app.config['LIST_PAGE_SIZE'])
+    except ValueError:
+        abort(404)
+
+def list_fragment_response(template, key, items, next_cursor, endpoint, **params):
+    """“加载更多”片段：卡片HTML，以及下一页的片段地址和页面地址"""
+    more_url = page_url = None
+    if next_cursor:
+        more_url = url_for(endpoint + '_more', cursor=next_cursor, **params)
+        page_url = url_for(endpoint, cursor=next_cursor, **params)
+    return jsonify({
+        'success': True,
+        'html': render_template(template, **{key: items}),
+        'has_more': next_cursor is not None,
+        'more_url': more_url,
+        'page_url': page_url
+    })
 
 @app.route('/events')
+@conditional_get(Event)
+@cached_page('events')
 def events():
     """活动页面"""
     category = request.args.get('category', '')
-    if category:
-        events = Event.query.filter_by(category=category).order_by(Event.event_date.desc()).all()
-    else:
-        events = Event.query.order_by(Event.event_date.desc()).all()
-    return render_template('events.html', events=events, current_category=category)
+    events, next_cursor = public_list_page(public_events_query(category), Event, Event.event_date)
+    return render_template('events.html', events=events, current_category=category, next_cursor=next_cursor)
+
+@app.route('/events/more')
+@conditional_get(Event)
+@cached_page('events')
+def events_more():
+    """活动列表“加载更多”"""
+    category = request.args.get('category', '')
+    events, next_cursor = public_list_page(public_events_query(category), Event, Event.event_date)
+    return list_fragment_response('partials/event_cards.html', 'events', events, next_cursor,
+                                  'events', category=category or None)
 
 @app.route('/event/<int:event_id>')
 def event_detail(event_id):
@@ -1010,14 +3100,23 @@ def event_detail(event_id):
     return render_template('event_detail.html', event=event)
 
 @app.route('/news')
+@conditional_get(News)
+@cached_page('news')
 def news():
     """新闻页面"""
     category = request.args.get('category', '')
-    if category:
-        news_list = News.query.filter_by(category=category).order_by(News.publish_date.desc()).all()
-    else:
-        news_list = News.query.order_by(News.publish_date.desc()).all()
-    return render_template('news.html', news_list=news_list, current_category=category)
+    news_list, next_cursor = public_list_page(public_news_query(category), News, News.publish_date)
+    return render_template('news.html', news_list=news_list, current_category=category, next_cursor=next_cursor)
+
+@app.route('/news/more')
+@conditional_get(News)
+@cached_page('news')
+def news_more():
+    """新闻列表“加载更多”"""
+    category = request.args.get('category', '')
+    news_list, next_cursor = public_list_page(public_news_query(category), News, News.publish_date)
+    return list_fragment_response('partials/news_cards.html', 'news_list', news_list, next_cursor,
+                                  'news', category=category or None)
 
 @app.route('/news/<int:news_id>')
 def news_detail(news_id):
@@ -1026,21 +3125,663 @@ def news_detail(news_id):
     return render_template('news_detail.html', news=news_item)
 
 @app.route('/students')
+@conditional_get(Student)
+@cached_page('students')
 def students():
     """学生展示页面"""
-    students = Student.query.order_by(Student.join_date.desc()).all()
-    return render_template('students.html', students=students)
+    students, next_cursor = public_list_page(public_students_query(), Student, Student.join_date)
+    return render_template('students.html', students=students, next_cursor=next_cursor)
+
+@app.route('/students/more')
+@conditional_get(Student)
+@cached_page('students')
+def students_more():
+    """学生展示“加载更多”"""
+    students, next_cursor = public_list_page(public_students_query(), Student, Student.join_date)
+    return list_fragment_response('partials/student_cards.html', 'students', students, next_cursor, 'students')
 
 @app.route('/join')
 def join():
     """加入我们页面"""
     return render_template('join.html')
 
+# 全文搜索（SQLite FTS5）
+# 使用 trigram 分词器，中文按任意三字子串匹配，不依赖额外的分词库。
+# 索引行的 rowid = 源记录id * 4 + 类型编号，触发器据此按主键增删改，保持与源表同步。
+SEARCH_KINDS = {'news': 1, 'event': 2, 'student': 3}
+
+SEARCH_INDEX_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5(
+        kind UNINDEXED, ref_id UNINDEXED, title, body, tokenize='trigram')""",
+    # 新闻：标题 / 正文
+    """CREATE TRIGGER IF NOT EXISTS news_search_insert AFTER INSERT ON news BEGIN
+        INSERT INTO search_index(rowid, kind, ref_id, title, body)
+        VALUES (new.id * 4 + 1, 'news', new.id, new.title, new.content);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS news_search_update AFTER UPDATE OF title, content ON news BEGIN
+        UPDATE search_index SET title = new.title, body = new.content WHERE rowid = old.id * 4 + 1;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS news_search_delete AFTER DELETE ON news BEGIN
+        DELETE FROM search_index WHERE rowid = old.id * 4 + 1;
+    END""",
+    # 活动：标题 / 描述 + 地点
+    """CREATE TRIGGER IF NOT EXISTS event_search_insert AFTER INSERT ON event BEGIN
+        INSERT INTO search_index(rowid, kind, ref_id, title, body)
+        VALUES (new.id * 4 + 2, 'event', new.id, new.title, new.description || ' ' || new.location);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS event_search_update AFTER UPDATE OF title, description, location ON event BEGIN
+        UPDATE search_index SET title = new.title, body = new.description || ' ' || new.location
+        WHERE rowid = old.id * 4 + 2;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS event_search_delete AFTER DELETE ON event BEGIN
+        DELETE FROM search_index WHERE rowid = old.id * 4 + 2;
+    END""",
+    # 学生：姓名 / 学校 + 专业 + 邮箱
+    """CREATE TRIGGER IF NOT EXISTS student_search_insert AFTER INSERT ON student BEGIN
+        INSERT INTO search_index(rowid, kind, ref_id, title, body)
+        VALUES (new.id * 4 + 3, 'student', new.id, new.name,
+                new.university || ' ' || new.major || ' ' || new.email);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS student_search_update AFTER UPDATE OF name, university, major, email ON student BEGIN
+        UPDATE search_index SET title = new.name, body = new.university || ' ' || new.major || ' ' || new.email
+        WHERE rowid = old.id * 4 + 3;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS student_search_delete AFTER DELETE ON student BEGIN
+        DELETE FROM search_index WHERE rowid = old.id * 4 + 3;
+    END""",
+]
+
+SEARCH_INDEX_REBUILD = [
+    "DELETE FROM search_index",
+    """INSERT INTO search_index(rowid, kind, ref_id, title, body)
+       SELECT id * 4 + 1, 'news', id, title, content FROM news""",
+    """INSERT INTO search_index(rowid, kind, ref_id, title, body)
+       SELECT id * 4 + 2, 'event', id, title, description || ' ' || location FROM event""",
+    """INSERT INTO search_index(rowid, kind, ref_id, title, body)
+       SELECT id * 4 + 3, 'student', id, name, university || ' ' || major || ' ' || email FROM student""",
+]
+
+SEARCH_MIN_TERM_LENGTH = 3  # trigram 分词无法匹配少于3个字符的词，这类词改查下面的短词索引
+
+# 短词索引：另一张 unicode61 分词的 FTS5 表，rowid 与 search_index 相同。
+# 写入的是 search_grams() 处理后的文本，中文拆成单字和相邻两字，其余按词切分并建立1~2字符的前缀索引，
+# 因此“青海”“AI”这类短词也能走索引。触发器调用的 search_grams 在每个数据库连接建立时注册，
+# 源表只能通过本应用（包括 flask 命令和迁移）写入。
+CJK_CHARS = r'\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff'
+CJK_RUN_PATTERN = re.compile(f'[{CJK_CHARS}]+')
+SHORT_TERM_PIECE_PATTERN = re.compile(rf'[{CJK_CHARS}]+|[^\s{CJK_CHARS}]+')  # 中文片段 / 其他非空白片段
+
+def search_grams(text):
+    """把连续的中文拆成单字和相邻两字（以空格分隔），其余文本原样保留"""
+    def grams(match):
+        run = match.group(0)
+        return ' %s %s ' % (' '.join(run), ' '.join(run[i:i + 2] for i in range(len(run) - 1)))
+    return CJK_RUN_PATTERN.sub(grams, text) if text else text
+
+@event.listens_for(Engine, 'connect')
+def register_search_grams(dbapi_connection, connection_record):
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        dbapi_connection.create_function('search_grams', 1, search_grams, deterministic=True)
+
+SEARCH_SHORT_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS search_short USING fts5(
+        title, body, tokenize='unicode61', prefix='1 2')""",
+    """CREATE TRIGGER IF NOT EXISTS news_search_short_insert AFTER INSERT ON news BEGIN
+        INSERT INTO search_short(rowid, title, body)
+        VALUES (new.id * 4 + 1, search_grams(new.title), search_grams(new.content));
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS news_search_short_update AFTER UPDATE OF title, content ON news BEGIN
+        UPDATE search_short SET title = search_grams(new.title), body = search_grams(new.content)
+        WHERE rowid = old.id * 4 + 1;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS news_search_short_delete AFTER DELETE ON news BEGIN
+        DELETE FROM search_short WHERE rowid = old.id * 4 + 1;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS event_search_short_insert AFTER INSERT ON event BEGIN
+        INSERT INTO search_short(rowid, title, body)
+        VALUES (new.id * 4 + 2, search_grams(new.title), search_grams(new.description || ' ' || new.location));
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS event_search_short_update AFTER UPDATE OF title, description, location ON event BEGIN
+        UPDATE search_short SET title = search_grams(new.title),
+                                body = search_grams(new.description || ' ' || new.location)
+        WHERE rowid = old.id * 4 + 2;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS event_search_short_delete AFTER DELETE ON event BEGIN
+        DELETE FROM search_short WHERE rowid = old.id * 4 + 2;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS student_search_short_insert AFTER INSERT ON student BEGIN
+        INSERT INTO search_short(rowid, title, body)
+        VALUES (new.id * 4 + 3, search_grams(new.name),
+                search_grams(new.university || ' ' || new.major || ' ' || new.email));
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS student_search_short_update AFTER UPDATE OF name, university, major, email ON student BEGIN
+        UPDATE search_short SET title = search_grams(new.name),
+                                body = search_grams(new.university || ' ' || new.major || ' ' || new.email)
+        WHERE rowid = old.id * 4 + 3;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS student_search_short_delete AFTER DELETE ON student BEGIN
+        DELETE FROM search_short WHERE rowid = old.id * 4 + 3;
+    END""",
+]
+
+# 在 search_index 重建之后执行，直接从中取标题和正文
+SEARCH_SHORT_REBUILD = [
+    "DELETE FROM search_short",
+    """INSERT INTO search_short(rowid, title, body)
+       SELECT rowid, search_grams(title), search_grams(body) FROM search_index""",
+]
+
+def init_search_index():
+    """创建全文索引表、短词索引表和同步触发器（已存在时跳过）"""
+    for statement in SEARCH_INDEX_DDL + SEARCH_SHORT_DDL:
+        db.session.execute(db.text(statement))
+    db.session.commit()
+
+def rebuild_search_index():
+    """根据源表重建全文索引和短词索引"""
+    for statement in SEARCH_INDEX_REBUILD + SEARCH_SHORT_REBUILD:
+        db.session.execute(db.text(statement))
+    db.session.commit()
+
+@app.cli.command('rebuild-search-index')
+def rebuild_search_index_command():
+    """创建并重建全文索引"""
+    init_search_index()
+    rebuild_search_index()
+    print('全文索引已重建')
+
+def parse_search_terms(q):
+    return [term for term in q.split() if term][:10]
+
+def build_match_expression(terms):
+    """把搜索词转换为 FTS5 MATCH 表达式，每个词作为短语处理以避免语法注入"""
+    return ' '.join('"%s"' % term.replace('"', '""') for term in terms)
+
+def build_short_match_expression(terms):
+    """把短词转换为 search_short 的 MATCH 表达式：中文按单字/两字词精确匹配，其余按词前缀匹配
+    
+    没有可匹配的字符（如只有标点）时返回 None。
+    """
+    parts = []
+    for term in terms:
+        for piece in SHORT_TERM_PIECE_PATTERN.findall(term):
+            if not any(ch.isalnum() for ch in piece):
+                continue
+            phrase = '"%s"' % piece.replace('"', '""')
+            parts.append(phrase if CJK_RUN_PATTERN.fullmatch(piece) else phrase + '*')
+    return ' '.join(parts) or None
+
+HIGHLIGHT_OPEN, HIGHLIGHT_CLOSE = '\x02', '\x03'
+
+def render_highlight(text):
+    """转义文本，并把高亮标记替换为 <mark> 标签"""
+    return str(escape(text or '')).replace(HIGHLIGHT_OPEN, '<mark>').replace(HIGHLIGHT_CLOSE, '</mark>')
+
+def highlight_terms(text, terms, width=None):
+    """短词查询时在 Python 中生成高亮片段"""
+    text = text or ''
+    if width and len(text) > width:
+        lowered = text.lower()
+        positions = [lowered.find(term.lower()) for term in terms]
+        positions = [p for p in positions if p >= 0]
+        start = max(min(positions) - width // 4, 0) if positions else 0
+        text = ('…' if start > 0 else '') + text[start:start + width] + ('…' if start + width < len(text) else '')
+    pattern = re.compile('|'.join(re.escape(term) for term in terms), re.IGNORECASE)
+    return pattern.sub(lambda m: HIGHLIGHT_OPEN + m.group(0) + HIGHLIGHT_CLOSE, text)
+
+def search_index_query(q, kinds, limit=20, offset=0):
+    """在全文索引中搜索，返回按相关度排序的 (kind, ref_id, title_html, snippet_html) 列表
+    
+    所有搜索词都不少于3个字符时在 search_index 中 MATCH；含短词时在 search_short 中 MATCH 短词，
+    长词再用 search_index 过滤。两种情况都按 bm25 排序（标题权重更高）。
+    """
+    terms = parse_search_terms(q)
+    if not terms:
+        return []
+    
+    kind_params = {f'kind_{i}': kind for i, kind in enumerate(kinds)}
+    kind_filter = 'kind IN (%s)' % ', '.join(':' + name for name in kind_params)
+    # 未发布的新闻和活动不出现在搜索结果中
+    published_filter = """
+        AND (kind != 'news' OR EXISTS (SELECT 1 FROM news WHERE news.id = ref_id AND news.is_published))
+        AND (kind != 'event' OR EXISTS (SELECT 1 FROM event WHERE event.id = ref_id AND event.is_published))"""
+    params = dict(kind_params, limit=limit, offset=offset)
+    
+    if all(len(term) >= SEARCH_MIN_TERM_LENGTH for term in terms):
+        params.update(match=build_match_expression(terms), open=HIGHLIGHT_OPEN, close=HIGHLIGHT_CLOSE)
+        rows = db.session.execute(db.text(f"""
+            SELECT kind, ref_id,
+                   highlight(search_index, 2, :open, :close),
+                   snippet(search_index, 3, :open, :close, '…', 24)
+            FROM search_index
+            WHERE search_index MATCH :match AND {kind_filter} {published_filter}
+            ORDER BY bm25(search_index, 0, 0, 5.0, 1.0)
+            LIMIT :limit OFFSET :offset"""), params).all()
+        return [(kind, ref_id, render_highlight(title), render_highlight(snippet))
+                for kind, ref_id, title, snippet in rows]
+    
+    short_match = build_short_match_expression([term for term in terms if len(term) < SEARCH_MIN_TERM_LENGTH])
+    if short_match is None:
+        return []
+    params['short'] = short_match
+    long_terms = [term for term in terms if len(term) >= SEARCH_MIN_TERM_LENGTH]
+    long_filter = ''
+    if long_terms:
+        params['match'] = build_match_expression(long_terms)
+        long_filter = 'AND search_short.rowid IN (SELECT rowid FROM search_index WHERE search_index MATCH :match)'
+    rows = db.session.execute(db.text(f"""
+        SELECT kind, ref_id, s.title, s.body
+        FROM search_short JOIN search_index AS s ON s.rowid = search_short.rowid
+        WHERE search_short MATCH :short {long_filter} AND {kind_filter} {published_filter}
+        ORDER BY bm25(search_short, 5.0, 1.0)
+        LIMIT :limit OFFSET :offset"""), params).all()
+    return [(kind, ref_id, render_highlight(highlight_terms(title, terms)),
+             render_highlight(highlight_terms(body, terms, width=60)))
+            for kind, ref_id, title, body in rows]
+
+def student_search_filter(search):
+    """学生管理中的关键词筛选条件，通过全文索引匹配姓名、学校、专业和邮箱"""
+    terms = parse_search_terms(search)
+    if not terms:
+        return db.true()
+    conditions, params = ["kind = 'student'"], {}
+    long_terms = [term for term in terms if len(term) >= SEARCH_MIN_TERM_LENGTH]
+    if long_terms:
+        conditions.append('search_index MATCH :match')
+        params['match'] = build_match_expression(long_terms)
+    if len(long_terms) < len(terms):
+        params['short'] = build_short_match_expression([term for term in terms if len(term) < SEARCH_MIN_TERM_LENGTH])
+        if params['short'] is None:
+            return db.false()
+        conditions.append('rowid IN (SELECT rowid FROM search_short WHERE search_short MATCH :short)')
+    matched = db.text(f"SELECT ref_id FROM search_index WHERE {' AND '.join(conditions)}").bindparams(**params)
+    return Student.id.in_(matched.columns(db.column('ref_id', db.Integer)))
+
+# 游标分页（keyset pagination）
+MAX_CURSOR_PAGE_SIZE = 100
+
+def encode_cursor(sort_value, row_id):
+    """把最后一行的 (排序字段, id) 编码为不透明的游标字符串，排序字段为空时编码为 null"""
+    payload = json.dumps([sort_value and sort_value.isoformat(), row_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor):
+    """解析游标，格式不正确时返回None"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return None if sort_value is None else datetime.fromisoformat(sort_value), int(row_id)
+    except (ValueError, TypeError, binascii.Error, UnicodeEncodeError):
+        return None
+
+def keyset_page_query(query, model, sort_column, cursor, per_page):
+    """游标之后按 (sort_column, id) 倒序的 per_page + 1 行，cursor 无效时抛出 ValueError
+    
+    排序字段为 NULL 的行在 SQLite 倒序中排在最后，按 id 倒序接着翻页。游标的排序字段不为 NULL 时
+    只用行值比较过滤，这样才能在索引上直接定位到游标处；NULL 行由 keyset_paginate 在最后补上。
+    """
+    if cursor:
+        position = decode_cursor(cursor)
+        if position is None:
+            raise ValueError('invalid cursor')
+        sort_value, row_id = position
+        if sort_value is None:
+            query = query.filter(sort_column.is_(None), model.id < row_id)
+        else:
+            query = query.filter(db.tuple_(sort_column, model.id) < position)
+    return query.order_by(sort_column.desc(), model.id.desc()).limit(per_page + 1)
+
+def keyset_paginate(query, model, sort_column, cursor, per_page):
+    """按 (sort_column, id) 倒序取下一页，返回 (items, next_cursor)
+    
+    只查询 per_page + 1 行来判断是否还有下一页，不做 COUNT 也不用 OFFSET，
+    因此任意深度的翻页耗时都相同。cursor 无效时抛出 ValueError。
+    """
+    items = keyset_page_query(query, model, sort_column, cursor, per_page).all()
+    if len(items) <= per_page and cursor and decode_cursor(cursor)[0] is not None:
+        # 与 NULL 比较的结果为 NULL，排序字段为空的行没有被取到，单独补上
+        items += query.filter(sort_column.is_(None)).order_by(model.id.desc()).limit(per_page + 1 - len(items)).all()
+    next_cursor = None
+    if len(items) > per_page:
+        items = items[:per_page]
+        last = items[-1]
+        next_cursor = encode_cursor(getattr(last, sort_column.key), last.id)
+    return items, next_cursor
+
+def cursor_page_response(key, query, model, sort_column, serialize, default_per_page):
+    """游标模式的列表API响应，include_total=1 时才额外统计总数"""
+    cursor = request.args.get('cursor', '')
+    per_page = request.args.get('per_page', default_per_page, type=int)
+    per_page = min(max(per_page, 1), MAX_CURSOR_PAGE_SIZE)
+    
+    try:
+        items, next_cursor = keyset_paginate(query, model, sort_column, cursor, per_page)
+    except ValueError:
+        return jsonify({'success': False, 'message': '无效的分页游标'})
+    
+    result = {
+        'success': True,
+        key: [serialize(item) for item in items],
+        'next_cursor': next_cursor,
+        'has_more': next_cursor is not None,
+        'per_page': per_page
+    }
+    if request.args.get('include_total', type=int):
+        result['total'] = query.order_by(None).count()
+    return jsonify(result)
+
+def serialize_event(event):
+    return {
+        'id': event.id,
+        'title': event.title,
+        'description': event.excerpt,  # 列表接口只返回摘要
+        'location': event.location,
+        'event_date': event.event_date.isoformat(),
+        'category': event.category,
+        'image_url': event.image_url,
+        'image_variants': event.image_variants
+    }
+
+def serialize_news(item):
+    return {
+        'id': item.id,
+        'title': item.title,
+        'content': item.excerpt,  # 列表接口只返回摘要
+        'author': item.author,
+        'publish_date': item.publish_date.isoformat() if item.publish_date else None,
+        'category': item.category,
+        'image_url': item.image_url,
+        'image_variants': item.image_variants
+    }
+
+def serialize_student(student):
+    return {
+        'id': student.id,
+        'name': student.name,
+        'university': student.university,
+        'major': student.major,
+        'join_date': student.join_date.isoformat() if student.join_date else None,
+        'avatar_url': student.avatar_url,
+        'avatar_variants': student.avatar_variants,
+        'bio': student.bio
+    }
+
+# 公开表单写缓冲：高峰期加入申请和联系表单校验通过后立即返回，提交先追加到溢出文件（每个进程独立的 NDJSON 文件）
+# 并放入内存队列，由后台线程在数量或时间达到阈值时用一个事务批量写入，写入成功后删除对应的溢出文件。
+# 进程异常退出时未写入的溢出文件在下次启动时重新写入（联系消息可能重复，加入申请按邮箱去重）
+class WriteBuffer:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.condition = threading.Condition(self.lock)
+        self.flush_lock = threading.Lock()
+        self.queue = []  # [(类型, 记录)]
+        self.pending_emails = set()  # 已受理、尚未写入的加入申请邮箱
+        self.spill_file = None
+        self.segments = []  # 内容已在队列中、等待写入后删除的溢出文件 [(路径, 文件对象)]
+        self.started = False
+        self.stats = {'enqueued': 0, 'flushed': 0, 'dropped': 0, 'flushes': 0, 'failures': 0,
+                      'last_flush_seconds': 0.0, 'max_flush_seconds': 0.0, 'total_flush_seconds': 0.0}
+    
+    def open_spill_file(self):
+        folder = app.config['WRITE_BUFFER_FOLDER']
+        os.makedirs(folder, exist_ok=True)
+        path = os.path.join(folder, f'{os.getpid()}-{uuid.uuid4().hex[:8]}.log')
+        fileobj = open(path, 'a', encoding='utf-8')
+        if fcntl is not None:
+            # 持有文件锁表示该文件属于运行中的进程，其他进程恢复时跳过
+            fcntl.flock(fileobj, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return path, fileobj
+    
+    def start(self):
+        """恢复遗留的溢出文件并启动后台写入线程（只执行一次）"""
+        with self.lock:
+            if self.started:
+                return
+            self.started = True
+        self.recover()
+        threading.Thread(target=self.run, name='write-buffer', daemon=True).start()
+        atexit.register(self.flush)
+    
+    def recover(self):
+        """把已退出进程留下的溢出文件重新放入队列，返回恢复的条数"""
+        folder = app.config['WRITE_BUFFER_FOLDER']
+        if not os.path.isdir(folder):
+            return 0
+        recovered = 0
+        for name in sorted(os.listdir(folder)):
+            path = os.path.join(folder, name)
+            if not name.endswith('.log') or any(path == segment[0] for segment in self.segments) \
+                    or (self.spill_file and path == self.spill_file[0]):
+                continue
+            fileobj = open(path, 'r', encoding='utf-8')
+            if fcntl is not None:
+                try:
+                    fcntl.flock(fileobj, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    fileobj.close()
+                    continue
+            entries = []
+            for line in fileobj:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # 崩溃时写了一半的最后一行
+                entries.append((entry['kind'], entry['record']))
+            with self.lock:
+                self.queue.extend(entries)
+                self.pending_emails.update(record['email'] for kind, record in entries if kind == 'join')
+                self.segments.append((path, fileobj))
+            recovered += len(entries)
+        return recovered
+    
+    def reserve_email(self, email):
+        """占用邮箱，缓冲区中已有相同邮箱的申请时返回False"""
+        with self.lock:
+            if email in self.pending_emails:
+                return False
+            self.pending_emails.add(email)
+            return True
+    
+    def release_email(self, email):
+        with self.lock:
+            self.pending_emails.discard(email)
+    
+    def submit(self, kind, record):
+        self.start()
+        line = json.dumps({'kind': kind, 'record': record}, ensure_ascii=False) + '\n'
+        with self.lock:
+            if self.spill_file is None:
+                self.spill_file = self.open_spill_file()
+            fileobj = self.spill_file[1]
+            fileobj.write(line)
+            fileobj.flush()
+            if app.config['WRITE_BUFFER_FSYNC']:
+                os.fsync(fileobj.fileno())
+            self.queue.append((kind, record))
+            self.stats['enqueued'] += 1
+            if len(self.queue) >= app.config['WRITE_BUFFER_FLUSH_SIZE']:
+                self.condition.notify()
+    
+    def run(self):
+        while True:
+            with self.lock:
+                self.condition.wait_for(lambda: len(self.queue) >= app.config['WRITE_BUFFER_FLUSH_SIZE'],
+                                        timeout=app.config['WRITE_BUFFER_FLUSH_INTERVAL'])
+            try:
+                self.flush()
+            except Exception:
+                app.logger.exception('写缓冲后台线程出错')
+    
+    def flush(self):
+        """把队列中的全部提交写入数据库，返回写入的条数；失败时放回队列等待下次重试"""
+        with self.flush_lock:
+            with self.lock:
+                if not self.queue:
+                    return 0
+                batch, self.queue = self.queue, []
+                # 当前溢出文件的内容都在这一批中，换一个新文件接收之后的提交
+                if self.spill_file is not None:
+                    self.segments.append(self.spill_file)
+                    self.spill_file = None
+                segments = list(self.segments)
+            
+            started = time.perf_counter()
+            try:
+                with app.app_context():
+                    dropped = write_buffered_records(batch)
+                    db.session.remove()
+            except Exception:
+                app.logger.exception('写缓冲批量写入失败，%d 条提交将在下次重试', len(batch))
+                with self.lock:
+                    self.queue[:0] = batch
+                    self.stats['failures'] += 1
+                return 0
+            elapsed = time.perf_counter() - started
+            
+            for path, fileobj in segments:
+                fileobj.close()
+                os.remove(path)
+            with self.lock:
+                self.segments = [segment for segment in self.segments if segment not in segments]
+                self.pending_emails.difference_update(record['email'] for kind, record in batch if kind == 'join')
+                self.stats['flushed'] += len(batch) - dropped
+                self.stats['dropped'] += dropped
+                self.stats['flushes'] += 1
+                self.stats['last_flush_seconds'] = elapsed
+                self.stats['max_flush_seconds'] = max(self.stats['max_flush_seconds'], elapsed)
+                self.stats['total_flush_seconds'] += elapsed
+            if any(kind == 'join' for kind, _ in batch):
+                page_cache.invalidate('students')
+            return len(batch)
+    
+    def metrics(self):
+        with self.lock:
+            return dict(self.stats, queue_depth=len(self.queue), pending_emails=len(self.pending_emails),
+                        spill_segments=len(self.segments) + (self.spill_file is not None))
+
+write_buffer = WriteBuffer()
+
+@app.before_request
+def start_write_buffer():
+    # gunicorn 等 WSGI 服务器不执行 __main__ 中的初始化，每个进程在处理第一个请求时恢复遗留的溢出文件并启动写入线程
+    if app.config['WRITE_BUFFER_ENABLED'] and not write_buffer.started:
+        write_buffer.start()
+
+@retry_on_lock
+def write_buffered_records(batch):
+    """一个事务写入一批提交，返回因邮箱已存在而未写入的加入申请数"""
+    contacts = [dict(record, created_at=datetime.fromisoformat(record['created_at']))
+                for kind, record in batch if kind == 'contact']
+    joins = [dict(record, created_at=datetime.fromisoformat(record['created_at']),
+                  join_date=datetime.fromisoformat(record['created_at']))
+             for kind, record in batch if kind == 'join']
+    if contacts:
+        db.session.execute(db.insert(ContactMessage), contacts)
+    dropped = []
+    if joins:
+        # 恢复溢出文件时可能重复写入已入库的申请，按邮箱忽略；受理后才被他人用同一邮箱注册的申请也会被忽略，记录到日志
+        inserted = set(db.session.scalars(
+            sqlite_insert(Student).on_conflict_do_nothing(index_elements=['email']).returning(Student.email), joins))
+        dropped = [record['email'] for record in joins if record['email'] not in inserted]
+    db.session.commit()
+    if dropped:
+        app.logger.warning('写缓冲中 %d 条加入申请的邮箱已存在，未写入：%s', len(dropped), ', '.join(dropped))
+    return len(dropped)
+
+def buffered_join(data):
+    """写缓冲模式下的加入申请：先在缓冲区占用邮箱再检查数据库，两处都没有才受理"""
+    if not data.get('password'):
+        return jsonify({'success': False, 'message': '密码不能为空'})
+    
+    email = data['email']
+    if not write_buffer.reserve_email(email):
+        return jsonify({'success': False, 'message': '该邮箱已注册'})
+    try:
+        if Student.query.filter_by(email=email).first() is not None:
+            write_buffer.release_email(email)
+            return jsonify({'success': False, 'message': '该邮箱已注册'})
+        write_buffer.submit('join', {
+            'name': data['name'],
+            'university': data['university'],
+            'major': data['major'],
+            'email': email,
+            'phone': data.get('phone', ''),
+            'bio': data.get('bio', ''),
+            'password_hash': hash_password(data['password']),
+            'created_at': datetime.utcnow().isoformat(),
+        })
+    except Exception:
+        write_buffer.release_email(email)
+        raise
+    return jsonify({'success': True, 'message': '申请提交成功！'})
+
+@app.cli.command('flush-write-buffer')
+def flush_write_buffer_command():
+    """把已退出进程遗留的写缓冲溢出文件写入数据库"""
+    recovered = write_buffer.recover()
+    print(f'恢复 {recovered} 条提交，已写入 {write_buffer.flush()} 条')
+
+@app.route('/admin/write-buffer')
+@login_required
+def admin_write_buffer():
+    """写缓冲的队列长度和批量写入耗时"""
+    metrics = write_buffer.metrics()
+    metrics['enabled'] = app.config['WRITE_BUFFER_ENABLED']
+    metrics['avg_flush_seconds'] = metrics['total_flush_seconds'] / metrics['flushes'] if metrics['flushes'] else 0.0
+    return jsonify({'success': True, 'metrics': metrics})
+
+def metrics_allowed():
+    """/metrics 只对已登录的管理员或 METRICS_ALLOWED_NETWORKS 中的地址开放"""
+    if 'admin_id' in session:
+        return True
+    try:
+        address = ipaddress.ip_address(request.remote_addr or '')
+    except ValueError:
+        return False
+    return any(address in ipaddress.ip_network(network, strict=False)
+               for network in app.config['METRICS_ALLOWED_NETWORKS'])
+
+@app.route('/metrics')
+def metrics():
+    """Prometheus 文本格式的请求指标（按进程统计）"""
+    if not metrics_allowed():
+        abort(403)
+    lines = request_metrics.render()
+    gauges = [
+        ('hsd_page_cache_entries', '页面缓存条目数', len(page_cache)),
+        ('hsd_page_cache_hits_total', '页面缓存命中次数', page_cache.hits),
+        ('hsd_page_cache_misses_total', '页面缓存未命中次数', page_cache.misses),
+        ('hsd_fragment_cache_entries', '模板片段缓存条目数', len(fragment_cache)),
+        ('hsd_fragment_cache_hits_total', '模板片段缓存命中次数', fragment_cache.hits),
+        ('hsd_fragment_cache_misses_total', '模板片段缓存未命中次数', fragment_cache.misses),
+    ]
+    buffer_metrics = write_buffer.metrics()
+    gauges += [
+        ('hsd_write_buffer_queue_depth', '写缓冲中等待写入的提交数', buffer_metrics['queue_depth']),
+        ('hsd_write_buffer_flushed_total', '写缓冲已写入数据库的提交数', buffer_metrics['flushed']),
+        ('hsd_write_buffer_failures_total', '写缓冲批量写入失败次数', buffer_metrics['failures']),
+        ('hsd_write_buffer_dropped_total', '写缓冲中因邮箱已存在而未写入的加入申请数', buffer_metrics['dropped']),
+        ('hsd_write_buffer_flushes_total', '写缓冲批量写入次数', buffer_metrics['flushes']),
+        ('hsd_write_buffer_flush_seconds_total', '写缓冲批量写入累计耗时（秒）', buffer_metrics['total_flush_seconds']),
+        ('hsd_write_buffer_last_flush_seconds', '写缓冲最近一次批量写入耗时（秒）', buffer_metrics['last_flush_seconds']),
+        ('hsd_write_buffer_max_flush_seconds', '写缓冲批量写入最长耗时（秒）', buffer_metrics['max_flush_seconds']),
+    ]
+    for name, help_text, value in gauges:
+        metric_type = 'counter' if name.endswith('_total') else 'gauge'
+        lines += [f'# HELP {name} {help_text}', f'# TYPE {name} {metric_type}', f'{name} {value}']
+    response = make_response('\n'.join(lines) + '\n')
+    response.headers['Content-Type'] = 'text/plain; version=0.0.4; charset=utf-8'
+    response.headers['Cache-Control'] = 'no-store'
+    return response
+
 # API路由
 @app.route('/api/join', methods=['POST'])
 def api_join():
     """处理加入申请"""
     data = request.get_json()
+    data['email'] = normalize_email(data['email'])
+    if app.config['WRITE_BUFFER_ENABLED']:
+        return buffered_join(data)
     
     # 检查邮箱是否已存在
     existing_student = Student.query.filter_by(email=data['email']).first()
@@ -1064,40 +3805,40 @@ def api_join():
     # 设置密码
     new_student.set_password(data['password'])
     
-    try:
+    @retry_on_lock
+    def save():
         db.session.add(new_student)
         db.session.commit()
+    
+    try:
+        save()
+        page_cache.invalidate('students')
         return jsonify({'success': True, 'message': '申请提交成功！'})
     except Exception as e:
         db.session.rollback()
         return jsonify({'success': False, 'message': '提交失败，请重试'})
 
 @app.route('/api/events', methods=['GET'])
+@conditional_get(Event, html=False)
 def api_events():
-    """获取活动列表API"""
-    category = request.args.get('category', '')
-    page = request.args.get('page', 1, type=int)
-    per_page = request.args.get('per_page', 10, type=int)
+    """获取活动列表API
     
-    query = Event.query
-    if category:
-        query = query.filter_by(category=category)
+    传入 cursor 参数（首页可为空字符串）时使用游标分页，否则保持原有的页码分页格式。
+    """
+    query = public_events_query(request.args.get('category', ''))
     
+    if 'cursor' in request.args:
+        return cursor_page_response('events', query, Event, Event.event_date, serialize_event, 10)
+    
+    page = request.args.get('page', 1, type=int)
+    per_page = request.args.get('per_page', 10, type=int)
     events = query.order_by(Event.event_date.desc()).paginate(
         page=page, per_page=per_page, error_out=False
     )
     
     return jsonify({
         'success': True,
-        'events': [{
-            'id': event.id,
-            'title': event.title,
-            'description': event.description,
-            'location': event.location,
-            'event_date': event.event_date.isoformat(),
-            'category': event.category,
-            'image_url': event.image_url
-        } for event in events.items],
+        'events': [serialize_event(event) for event in events.items],
         'pagination': {
             'page': events.page,
             'pages': events.pages,
@@ -1107,31 +3848,23 @@ def api_events():
     })
 
 @app.route('/api/news', methods=['GET'])
+@conditional_get(News, html=False)
 def api_news():
-    """获取新闻列表API"""
-    category = request.args.get('category', '')
-    page = request.args.get('page', 1, type=int)
-    per_page = request.args.get('per_page', 10, type=int)
+    """获取新闻列表API（支持 cursor 游标分页）"""
+    query = public_news_query(request.args.get('category', ''))
     
-    query = News.query
-    if category:
-        query = query.filter_by(category=category)
+    if 'cursor' in request.args:
+        return cursor_page_response('news', query, News, News.publish_date, serialize_news, 10)
     
+    page = request.args.get('page', 1, type=int)
+    per_page = request.args.get('per_page', 10, type=int)
     news = query.order_by(News.publish_date.desc()).paginate(
         page=page, per_page=per_page, error_out=False
     )
     
     return jsonify({
         'success': True,
-        'news': [{
-            'id': item.id,
-            'title': item.title,
-            'content': item.content[:200] + '...' if len(item.content) > 200 else item.content,
-            'author': item.author,
-            'publish_date': item.publish_date.isoformat(),
-            'category': item.category,
-            'image_url': item.image_url
-        } for item in news.items],
+        'news': [serialize_news(item) for item in news.items],
         'pagination': {
             'page': news.page,
             'pages': news.pages,
@@ -1141,26 +3874,21 @@ def api_news():
     })
 
 @app.route('/api/students', methods=['GET'])
+@conditional_get(Student, html=False)
 def api_students():
-    """获取学生列表API"""
+    """获取学生列表API（支持 cursor 游标分页）"""
+    if 'cursor' in request.args:
+        return cursor_page_response('students', Student.query, Student, Student.join_date, serialize_student, 12)
+    
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 12, type=int)
-    
     students = Student.query.order_by(Student.join_date.desc()).paginate(
         page=page, per_page=per_page, error_out=False
     )
     
     return jsonify({
         'success': True,
-        'students': [{
-            'id': student.id,
-            'name': student.name,
-            'university': student.university,
-            'major': student.major,
-            'join_date': student.join_date.isoformat(),
-            'avatar_url': student.avatar_url,
-            'bio': student.bio
-        } for student in students.items],
+        'students': [serialize_student(student) for student in students.items],
         'pagination': {
             'page': students.page,
             'pages': students.pages,
@@ -1170,6 +3898,7 @@ def api_students():
     })
 
 @app.route('/api/stats', methods=['GET'])
+@conditional_get(Student, Event, News, html=False)
 def api_stats():
     """获取统计数据API"""
     total_students = Student.query.count()
@@ -1189,6 +3918,34 @@ def api_stats():
         }
     })
 
+@app.route('/api/search', methods=['GET'])
+def api_search():
+    """全文搜索API（新闻和活动）"""
+    q = request.args.get('q', '').strip()
+    search_type = request.args.get('type', '')
+    limit = min(max(request.args.get('limit', 10, type=int), 1), 50)
+    offset = max(request.args.get('offset', 0, type=int), 0)
+    
+    kinds = [search_type] if search_type in ('news', 'event') else ['news', 'event']
+    results = []
+    for kind, ref_id, title, snippet in search_index_query(q, kinds, limit=limit, offset=offset):
+        if kind == 'news':
+            url = url_for('news_detail', news_id=ref_id)
+        else:
+            url = url_for('event_detail', event_id=ref_id)
+        results.append({
+            'type': kind,
+            'id': ref_id,
+            'url': url,
+            'title': title,
+            'description': snippet
+        })
+    
+    response = jsonify({'success': True, 'query': q, 'results': results})
+    # 静态站点（flask freeze）的页面从其他域名调用搜索，返回的都是公开数据
+    response.headers['Access-Control-Allow-Origin'] = '*'
+    return response
+
 @app.route('/api/subscribe', methods=['POST'])
 def api_subscribe():
     """处理新闻订阅"""
@@ -1212,6 +3969,16 @@ def api_contact():
         if not data.get(field):
             return jsonify({'success': False, 'message': f'请填写{field}字段'})
     
+    if app.config['WRITE_BUFFER_ENABLED']:
+        write_buffer.submit('contact', {
+            'name': data['name'],
+            'email': data['email'],
+            'subject': data['subject'],
+            'message': data['message'],
+            'created_at': datetime.utcnow().isoformat(),
+        })
+        return jsonify({'success': True, 'message': '消息发送成功！我们会尽快回复您。'})
+    
     try:
         # 创建新的联系消息记录
         contact_message = ContactMessage(
@@ -1222,29 +3989,329 @@ def api_contact():
         )
         
         # 保存到数据库
-        db.session.add(contact_message)
-        db.session.commit()
+        @retry_on_lock
+        def save():
+            db.session.add(contact_message)
+            db.session.commit()
         
+        save()
         return jsonify({'success': True, 'message': '消息发送成功！我们会尽快回复您。'})
     except Exception as e:
         db.session.rollback()
         return jsonify({'success': False, 'message': '发送失败，请重试。'})
 
 @app.route('/about')
+@conditional_get(Timeline, Team, Partner)
+@cached_page('timeline', 'team', 'partners')
 def about():
     """关于我们页面"""
-    # 获取已发布的时间线事件，按排序索引和创建时间排序
-    timelines = Timeline.query.filter_by(is_published=True).order_by(
-        Timeline.order_index.asc(), Timeline.created_at.desc()).all()
-    # 获取已发布的团队成员
-    teams = Team.query.filter_by(is_published=True).order_by(Team.order_index.asc(), Team.created_at.desc()).all()
-    # 获取已发布的合作伙伴数据，按order_index和创建时间排序
-    partners = Partner.query.filter_by(is_published=True).order_by(Partner.order_index.asc(), Partner.created_at.desc()).all()
+    # 获取已发布的时间线事件、团队成员和合作伙伴，按排序索引和创建时间排序
+    timelines = display_order_query(Timeline).filter_by(is_published=True).all()
+    teams = display_order_query(Team).filter_by(is_published=True).all()
+    partners = display_order_query(Partner).filter_by(is_published=True).all()
     return render_template('about.html', timelines=timelines, teams=teams, partners=partners)
 
+# 查询计划检查
+def hot_queries():
+    """各高频路由实际执行的查询，用路由中的同一组查询构造函数生成，供 check-query-plans 命令分析"""
+    sample_date = datetime(2024, 1, 1)
+    cursor = encode_cursor(sample_date, 100)
+    page_size = app.config['LIST_PAGE_SIZE']
+    return [
+        ('index: 最新活动', home_events_query()),
+        ('index: 最新新闻', home_news_query()),
+        ('events', keyset_page_query(public_events_query(), Event, Event.event_date, '', page_size)),
+        ('events?category: 游标', keyset_page_query(public_events_query('技术培训'), Event, Event.event_date, cursor, page_size)),
+        ('news', keyset_page_query(public_news_query(), News, News.publish_date, '', page_size)),
+        ('news?category: 游标', keyset_page_query(public_news_query('项目动态'), News, News.publish_date, cursor, page_size)),
+        ('students: 游标', keyset_page_query(public_students_query(), Student, Student.join_date, cursor, page_size)),
+        ('about: 时间线', display_order_query(Timeline).filter_by(is_published=True)),
+        ('about: 团队', display_order_query(Team).filter_by(is_published=True)),
+        ('about: 合作伙伴', display_order_query(Partner).filter_by(is_published=True)),
+        ('api_events', public_events_query().order_by(Event.event_date.desc()).limit(10).offset(10)),
+        ('api_events: 游标', keyset_page_query(public_events_query(), Event, Event.event_date, cursor, 10)),
+        ('api_events?category: 游标', keyset_page_query(public_events_query('技术培训'), Event, Event.event_date, cursor, 10)),
+        ('api_news: 游标', keyset_page_query(public_news_query(), News, News.publish_date, cursor, 10)),
+        ('api_students: 游标', keyset_page_query(Student.query, Student, Student.join_date, cursor, 12)),
+        ('api_stats: 合作高校', db.session.query(Student.university).distinct()),
+        ('admin_dashboard: 待审核', Student.query.filter_by(is_approved=False)),
+        ('admin_events', Event.query.order_by(Event.created_at.desc()).limit(10)),
+        ('admin_news', News.query.order_by(News.created_at.desc()).limit(10)),
+        ('admin_students', filter_students(Student.query.filter(Student.is_approved == True), '', '大一', 'A组')
+            .order_by(Student.created_at.desc()).limit(15)),
+        ('admin_students?search', filter_students(Student.query.filter(Student.is_approved == True), '青海 大学')
+            .order_by(Student.created_at.desc()).limit(15)),
+        ('admin_students: 年级', db.session.query(Student.grade).distinct()),
+        ('admin_students: 分组', db.session.query(Student.group).distinct()),
+        ('admin_applications', Student.query.filter(Student.is_approved == False).order_by(Student.created_at.desc()).limit(10)),
+        ('admin_students_info', filter_students(Student.query, '', '大一').order_by(Student.created_at.desc()).limit(15)),
+        ('admin_timeline', display_order_query(Timeline).limit(10)),
+        ('admin_team', display_order_query(Team).limit(10)),
+        ('admin_partners', display_order_query(Partner).limit(12)),
+        ('admin_messages', ContactMessage.query.order_by(ContactMessage.created_at.desc()).limit(10)),
+        ('admin_statistics: 月度活动', count_by_month_query(Event, sample_date)),
+        ('admin_statistics: 活动分类', count_by_query(Event.category)),
+        ('admin_statistics: 年级分布', count_by_query(Student.grade)),
+    ]
+
+FULL_SCAN_PATTERN = re.compile(r'^SCAN (TABLE )?\S+$')
+
+def explain_query_plan(query):
+    """返回查询的 EXPLAIN QUERY PLAN 明细行"""
+    statement = query.statement if hasattr(query, 'statement') else query
+    compiled = statement.compile(dialect=db.engine.dialect)
+    params = tuple(compiled.params[name] for name in compiled.positiontup)
+    rows = db.session.connection().exec_driver_sql('EXPLAIN QUERY PLAN ' + str(compiled), params)
+    return [row[-1] for row in rows]
+
+@app.cli.command('check-query-plans')
+def check_query_plans():
+    """检查高频查询是否全部走索引，出现全表扫描时以非零状态退出"""
+    failures = 0
+    for label, query in hot_queries():
+        plan = explain_query_plan(query)
+        full_scans = [line for line in plan if FULL_SCAN_PATTERN.match(line)]
+        status = '全表扫描' if full_scans else 'OK'
+        print(f'[{status}] {label}')
+        for line in plan:
+            print(f'    {line}')
+        if full_scans:
+            failures += 1
+    
+    if failures:
+        print(f'\n{failures} 个查询出现全表扫描')
+        sys.exit(1)
+    print('\n所有查询均使用索引')
+
+# 静态站点导出（flask freeze）：把公开页面渲染为静态文件发布到 GitHub Pages，后台和表单提交仍由动态站点处理。
+# 从首页等入口开始，渲染时记录模板中 url_for 生成的公开页面（分类、翻页、“加载更多”片段、详情页）继续渲染，
+# 带查询参数的地址改写为路径形式（/events?category=x&cursor=y -> /events/category/x/page/y/）。
+# 页面版本由依赖表的最近修改时间（详情页为该行的 updated_at）、部署版本和联系信息组成，
+# 与上次导出记录在 .freeze-manifest.json 中的版本相同时跳过；每一轮待渲染的页面分给多个进程并行渲染
+FREEZE_MANIFEST = '.freeze-manifest.json'
+FREEZE_PAGE_MODELS = {
+    'index': (Event, News),
+    'events': (Event,),
+    'events_more': (Event,),
+    'news': (News,),
+    'news_more': (News,),
+    'students': (Student,),
+    'students_more': (Student,),
+    'about': (Timeline, Team, Partner),
+    'api_events': (Event,),
+    'api_news': (News,),
+    'api_stats': (Event, News, Student),
+}
+FREEZE_DETAIL_MODELS = {'event_detail': (Event, 'event_id'), 'news_detail': (News, 'news_id')}
+FREEZE_ENTRY_PAGES = ['index', 'events', 'news', 'students', 'about', 'api_events', 'api_news', 'api_stats']
+FREEZE_URL_PARAMS = {'category', 'cursor', 'event_id', 'news_id'}
+
+_freeze_worker = {'client': None, 'links': []}
+
+def frozen_path(endpoint, values):
+    """页面在导出目录中的相对路径"""
+    if endpoint == 'index':
+        return 'index.html'
+    if endpoint.startswith('api_'):
+        # 不带扩展名，前端脚本照常请求 /api/stats 等地址
+        return 'api/' + endpoint[len('api_'):]
+    if endpoint in FREEZE_DETAIL_MODELS:
+        return f"{endpoint[:-len('_detail')]}/{values[FREEZE_DETAIL_MODELS[endpoint][1]]}/index.html"
+    
+    more = endpoint.endswith('_more')
+    parts = [endpoint[:-len('_more')] if more else endpoint]
+    if values.get('category'):
+        parts += ['category', values['category']]
+    if more:
+        return '/'.join(parts + ['more', values['cursor'] + '.json'])
+    if values.get('cursor'):
+        parts += ['page', values['cursor']]
+    return '/'.join(parts + ['index.html'])
+
+def frozen_url_for(endpoint, **values):
+    """导出时代替 url_for：公开页面返回静态地址并记录下来等待渲染，其余页面指向动态站点"""
+    params = {key: value for key, value in values.items() if value is not None and not key.startswith('_')}
+    freezable = endpoint in FREEZE_PAGE_MODELS or endpoint in FREEZE_DETAIL_MODELS
+    category = params.get('category', '')
+    if freezable and set(params) <= FREEZE_URL_PARAMS and '/' not in category and not category.startswith('.'):
+        _freeze_worker['links'].append((endpoint, params))
+        path = frozen_path(endpoint, params)
+        return '/' + quote(path[:-len('index.html')] if path.endswith('index.html') else path)
+    
+    url = Flask.url_for(app, endpoint, **values)
+    if endpoint != 'static' and app.config['FREEZE_DYNAMIC_URL'] and url.startswith('/'):
+        url = app.config['FREEZE_DYNAMIC_URL'].rstrip('/') + url
+    return url
+
+def init_freeze_worker():
+    """替换 url_for 并关闭片段缓存，返回恢复原设置的函数（在当前进程中渲染时，导出结束后调用）"""
+    # fork 出的子进程不能复用父进程的数据库连接
+    db.engine.dispose(close=False)
+    saved = app.__dict__.get('url_for'), app.jinja_env.globals['url_for'], app.config['FRAGMENT_CACHE_ENABLED']
+    app.url_for = frozen_url_for
+    app.jinja_env.globals['url_for'] = frozen_url_for
+    # 命中片段缓存时不会调用 url_for，也就记录不到片段中的链接
+    app.config['FRAGMENT_CACHE_ENABLED'] = False
+    _freeze_worker['client'] = app.test_client()
+    
+    def restore():
+        url_for_override, global_url_for, fragment_cache_enabled = saved
+        if url_for_override is None:
+            del app.url_for
+        else:
+            app.url_for = url_for_override
+        app.jinja_env.globals['url_for'] = global_url_for
+        app.config['FRAGMENT_CACHE_ENABLED'] = fragment_cache_enabled
+        _freeze_worker.update(client=None, links=[])
+        # 导出时缓存的页面中是静态站点的链接
+        page_cache.clear()
+    return restore
+
+def render_frozen_page(job):
+    """渲染一个页面写入导出目录，返回 (路径, 状态码, 页面中链接到的公开页面)"""
+    endpoint, values, path, output = job
+    with app.test_request_context():
+        url = Flask.url_for(app, endpoint, **values)
+    _freeze_worker['links'] = []
+    response = _freeze_worker['client'].get(url, headers={'Accept-Encoding': 'identity'})
+    if response.status_code == 200:
+        target = os.path.join(output, *path.split('/'))
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        write_file_atomic(target, response.get_data())
+    return path, response.status_code, _freeze_worker['links']
+
+def freeze_page_versions():
+    """返回 page_version(endpoint, values)，页面不存在（如详情页的记录已删除）时返回None"""
+    contact = get_contact_info()
+    common = [deploy_version(), str(contact.updated_at if contact else '')]
+    models = {model for page_models in FREEZE_PAGE_MODELS.values() for model in page_models}
+    tables = {model: str(data_last_modified(model)) for model in models}
+    rows = {endpoint: {row_id: str(updated_at) for row_id, updated_at in db.session.query(model.id, model.updated_at)}
+            for endpoint, (model, _) in FREEZE_DETAIL_MODELS.items()}
+    
+    def page_version(endpoint, values):
+        if endpoint in FREEZE_DETAIL_MODELS:
+            updated_at = rows[endpoint].get(values[FREEZE_DETAIL_MODELS[endpoint][1]])
+            return None if updated_at is None else '|'.join(common + [updated_at])
+        return '|'.join(common + [tables[model] for model in FREEZE_PAGE_MODELS[endpoint]])
+    return page_version
+
+def copy_static_files(output):
+    """复制静态资源（含上传的图片），只复制新增或有变化的文件"""
+    copied = 0
+    for root, _, files in os.walk(app.static_folder):
+        for name in files:
+            source = os.path.join(root, name)
+            target = os.path.join(output, 'static', os.path.relpath(source, app.static_folder))
+            stat = os.stat(source)
+            if os.path.exists(target) and os.path.getsize(target) == stat.st_size \
+                    and os.path.getmtime(target) >= stat.st_mtime:
+                continue
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            shutil.copy2(source, target)
+            copied += 1
+    return copied
+
+def freeze_site(output, workers=1, force=False):
+    """导出静态站点，返回各类页面数；force=True 时忽略上次的导出记录"""
+    manifest_path = os.path.join(output, FREEZE_MANIFEST)
+    previous = {}
+    if not force and os.path.exists(manifest_path):
+        with open(manifest_path, encoding='utf-8') as f:
+            previous = json.load(f)['pages']
+    
+    page_version = freeze_page_versions()
+    db.session.remove()
+    os.makedirs(output, exist_ok=True)
+    
+    if workers > 1 and 'fork' in multiprocessing.get_all_start_methods():
+        pool = multiprocessing.get_context('fork').Pool(workers, initializer=init_freeze_worker)
+        render = lambda jobs: pool.imap_unordered(render_frozen_page, jobs, chunksize=8)
+    else:
+        pool = None
+        restore_worker = init_freeze_worker()
+        render = lambda jobs: map(render_frozen_page, jobs)
+    
+    pages = {}
+    result = {'rendered': 0, 'skipped': 0, 'failed': 0, 'removed': 0}
+    queue = [(endpoint, {}) for endpoint in FREEZE_ENTRY_PAGES]
+    try:
+        while queue:
+            jobs, next_queue = [], []
+            for endpoint, values in queue:
+                path = frozen_path(endpoint, values)
+                if path in pages:
+                    continue
+                version = page_version(endpoint, values)
+                if version is None:
+                    continue
+                old = previous.get(path)
+                if old and old['version'] == version and os.path.exists(os.path.join(output, path)):
+                    pages[path] = old
+                    next_queue += [tuple(link) for link in old['links']]
+                    result['skipped'] += 1
+                    continue
+                pages[path] = {'endpoint': endpoint, 'values': values, 'version': version, 'links': []}
+                jobs.append((endpoint, values, path, output))
+            
+            for path, status, links in render(jobs):
+                if status != 200:
+                    print(f'跳过 {path}：HTTP {status}', file=sys.stderr)
+                    del pages[path]
+                    result['failed'] += 1
+                    continue
+                links = list({frozen_path(*link): link for link in links}.values())
+                pages[path]['links'] = links
+                next_queue += links
+                result['rendered'] += 1
+            queue = next_queue
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+        else:
+            restore_worker()
+    
+    # 上次导出过、这次不再链接到的页面（记录已删除、翻页变化等）
+    for path in set(previous) - set(pages):
+        target = os.path.join(output, *path.split('/'))
+        if os.path.exists(target):
+            os.remove(target)
+            result['removed'] += 1
+    
+    result['static'] = copy_static_files(output)
+    cname = os.path.join(os.path.dirname(basedir), 'CNAME')
+    if os.path.exists(cname):
+        shutil.copy2(cname, os.path.join(output, 'CNAME'))
+    # 不经过 Jekyll 处理，保证所有文件原样发布
+    open(os.path.join(output, '.nojekyll'), 'w').close()
+    write_file_atomic(manifest_path, json.dumps({'pages': pages}, ensure_ascii=False, sort_keys=True).encode('utf-8'))
+    return result
+
+@app.cli.command('freeze')
+@click.option('--output', default=None, help='输出目录，默认为 FREEZE_OUTPUT')
+@click.option('--workers', type=int, default=None, help='并行渲染的进程数，默认为 FREEZE_WORKERS')
+@click.option('--force', is_flag=True, help='忽略上次的导出记录，重新渲染所有页面')
+def freeze_command(output, workers, force):
+    """把公开页面导出为静态站点，只重新渲染数据有变化的页面"""
+    started = time.time()
+    output = output or app.config['FREEZE_OUTPUT']
+    result = freeze_site(output, workers or app.config['FREEZE_WORKERS'], force)
+    print(f"渲染 {result['rendered']} 个页面，未变化 {result['skipped']} 个，失败 {result['failed']} 个，"
+          f"删除 {result['removed']} 个，复制静态文件 {result['static']} 个，用时 {time.time() - started:.1f} 秒")
+    print(f'输出目录：{output}')
+
 if __name__ == '__main__':
     with app.app_context():
         db.create_all()
+        init_search_index()
+        init_upload_refcount()
+        init_table_change()
+        build_assets()
+        if app.config['WRITE_BUFFER_ENABLED']:
+            write_buffer.start()
+        if app.config['STATS_ROLLUP_ENABLED']:
+            init_stats_rollup()
         
         # 创建默认管理员账户（如果不存在）
         admin = Admin.query.filter_by(username='admin').first()
@@ -0,0 +1,84 @@
+"""响应压缩基准：常用页面在各压缩级别下节省的字节数与压缩耗时
+
+用法（在 hsd网站 目录下）：
+    python benchmarks/bench_compression.py
+    python benchmarks/bench_compression.py --repeat 50 --levels 1,6,9 --brotli-levels 1,4,11
+
+页面通过测试客户端渲染（只发 GET 请求，不修改数据库），渲染结果不含压缩，
+再分别用 gzip / brotli 各级别压缩，输出原始大小、压缩后大小、压缩率和单次压缩耗时的中位数。
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app, brotli, make_compressor  # noqa: E402
+
+PUBLIC_PAGES = ['/', '/events', '/news', '/students', '/about',
+                '/api/events', '/api/news', '/api/students']
+ADMIN_PAGES = ['/admin', '/admin/students/info', '/admin/events']
+
+
+def render_pages(client):
+    pages = []
+    for url in PUBLIC_PAGES + ADMIN_PAGES:
+        response = client.get(url, headers={'Accept-Encoding': 'identity'})
+        if response.status_code == 200:
+            pages.append((url, response.get_data()))
+        else:
+            print(f'跳过 {url}（HTTP {response.status_code}）', file=sys.stderr)
+    return pages
+
+
+def time_compression(data, encoding, level, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        compress, finish = make_compressor(encoding, level)
+        output = compress(data) + finish()
+        timings.append(time.perf_counter() - start)
+    return len(output), statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=20, help='每种组合重复压缩的次数')
+    parser.add_argument('--levels', default='1,6,9', help='gzip 压缩级别，逗号分隔')
+    parser.add_argument('--brotli-levels', default='1,4,6,11', help='brotli 压缩级别，逗号分隔')
+    args = parser.parse_args()
+
+    settings = [('gzip', int(level)) for level in args.levels.split(',')]
+    if brotli is not None:
+        settings += [('br', int(level)) for level in args.brotli_levels.split(',')]
+    else:
+        print('未安装 brotli，只测试 gzip', file=sys.stderr)
+
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['admin_id'] = 1
+        session['user_type'] = 'admin'
+    pages = render_pages(client)
+
+    print(f'{"页面":<24}{"编码":>8}{"原始字节":>10}{"压缩后":>10}{"压缩率":>8}{"耗时ms":>9}{"MB/s":>8}')
+    totals = {}
+    for url, data in pages:
+        for encoding, level in settings:
+            size, seconds = time_compression(data, encoding, level, args.repeat)
+            print(f'{url:<24}{f"{encoding}-{level}":>8}{len(data):>10}{size:>10}'
+                  f'{size / len(data):>8.1%}{seconds * 1000:>9.3f}{len(data) / seconds / 1e6:>8.1f}')
+            total = totals.setdefault((encoding, level), [0, 0, 0.0])
+            total[0] += len(data)
+            total[1] += size
+            total[2] += seconds
+
+    print('\n合计（每个页面各请求一次）')
+    for (encoding, level), (raw, size, seconds) in totals.items():
+        print(f'{f"{encoding}-{level}":>8}  节省 {raw - size:>8} 字节 ({1 - size / raw:.1%})'
+              f'  CPU {seconds * 1000:.2f} ms  每毫秒CPU节省 {(raw - size) / (seconds * 1000):.0f} 字节')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""请求指标开销基准：记录一次请求指标的耗时，以及开启/关闭 METRICS_ENABLED 时的请求延迟对比
+
+用法（在 hsd网站 目录下）：
+    python benchmarks/bench_metrics.py
+    python benchmarks/bench_metrics.py --observations 200000 --requests 2000
+
+第一部分直接调用 request_metrics.observe（不经过 Flask），得到单次记录的开销；
+第二部分通过测试客户端交替请求若干页面，比较开启和关闭指标时每个请求的耗时中位数和 p95。
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app, RequestMetrics  # noqa: E402
+
+PAGES = ['/api/events', '/api/news', '/api/stats', '/events']
+
+
+def time_observe(count):
+    metrics = RequestMetrics()
+    endpoints = ['index', 'events', 'api_events', 'api_news', 'students']
+    start = time.perf_counter()
+    for i in range(count):
+        metrics.observe(endpoints[i % len(endpoints)], 'GET', 200, 0.012, 3, 0.0008, 4096)
+    return (time.perf_counter() - start) / count
+
+
+def time_requests(client, requests, enabled):
+    app.config['METRICS_ENABLED'] = enabled
+    timings = []
+    for i in range(requests):
+        url = PAGES[i % len(PAGES)]
+        start = time.perf_counter()
+        client.get(url)
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.95)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--observations', type=int, default=100000, help='直接记录指标的次数')
+    parser.add_argument('--requests', type=int, default=1000, help='每轮发送的请求数')
+    parser.add_argument('--rounds', type=int, default=3, help='开启/关闭交替测试的轮数')
+    args = parser.parse_args()
+
+    per_observation = time_observe(args.observations)
+    print(f'单次 observe：{per_observation * 1e6:.2f} µs')
+
+    client = app.test_client()
+    time_requests(client, len(PAGES) * 10, True)  # 预热页面缓存和数据库连接
+    results = {True: [], False: []}
+    for _ in range(args.rounds):
+        for enabled in (False, True):
+            results[enabled].append(time_requests(client, args.requests, enabled))
+
+    print(f'{"指标":<8}{"p50ms":>9}{"p95ms":>9}')
+    for enabled in (False, True):
+        p50 = statistics.median(result[0] for result in results[enabled])
+        p95 = statistics.median(result[1] for result in results[enabled])
+        print(f'{"开启" if enabled else "关闭":<8}{p50 * 1000:>9.3f}{p95 * 1000:>9.3f}')
+    baseline = statistics.median(result[0] for result in results[False])
+    overhead = statistics.median(result[0] for result in results[True]) - baseline
+    print(f'每个请求增加 {overhead * 1e6:.1f} µs（{overhead / baseline:.1%}）')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,216 @@
+"""路由压测：在指定数据规模下以固定并发请求各个公开页面、API 和后台页面，输出吞吐量和延迟分位数（JSON）
+
+用法（在 hsd网站 目录下）：
+    python benchmarks/bench_routes.py --scale 1k
+    python benchmarks/bench_routes.py --scale 100k --concurrency 8 --requests 500 --output results.json
+    python benchmarks/bench_routes.py --scale 1m --database /tmp/bench-1m.db   # 数据库已存在时直接复用，省去灌数据
+    python benchmarks/bench_routes.py --routes api --no-page-cache
+
+活动、新闻、学生和留言各批量插入 scale 行（先插数据、后建全文索引触发器），然后通过测试客户端发请求，
+不经过网络。每个路由先预热，再由 --concurrency 个线程（各自一个客户端）共同完成 --requests 次请求。
+结果包含当前提交号，不同提交的结果文件可以直接对比。
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCALES = {'1k': 1000, '10k': 10000, '100k': 100000, '1m': 1000000}
+INSERT_BATCH = 10000
+
+ROUTES = {
+    'public': ['/', '/events', '/events/more', '/news', '/news/more', '/students', '/students/more', '/about'],
+    'api': ['/api/events', '/api/news', '/api/students', '/api/stats', '/api/search?q=活动'],
+    'admin': ['/admin', '/admin/applications', '/admin/students', '/admin/students/info', '/admin/statistics',
+              '/admin/events', '/admin/news', '/admin/messages'],
+}
+
+
+def parse_scale(value):
+    return SCALES[value.lower()] if value.lower() in SCALES else int(value)
+
+
+def load_app(database_path):
+    """需在导入 app 之前设置 DATABASE_URL"""
+    os.environ['DATABASE_URL'] = 'sqlite:///' + database_path
+    sys.path.insert(0, APP_DIR)
+    import app as app_module
+    return app_module
+
+
+def batches(make_row, count):
+    for start in range(0, count, INSERT_BATCH):
+        yield [make_row(i) for i in range(start, min(start + INSERT_BATCH, count))]
+
+
+def seed_database(app_module, scale):
+    db = app_module.db
+    now = datetime.utcnow()
+    categories = ['讲座', '比赛', '交流', '志愿服务']
+    grades = ['大一', '大二', '大三', '大四', '研究生']
+    rows = {
+        app_module.Event: lambda i: dict(
+            title=f'活动{i}', description='活动介绍' * 30, excerpt='活动介绍' * 10, location='西宁',
+            event_date=now - timedelta(hours=i), category=categories[i % 4], is_published=i % 10 != 0),
+        app_module.News: lambda i: dict(
+            title=f'新闻{i}', content='新闻内容' * 50, excerpt='新闻内容' * 10, author='编辑部',
+            publish_date=now - timedelta(hours=i), category=categories[i % 4], is_published=i % 10 != 0),
+        app_module.Student: lambda i: dict(
+            name=f'学生{i}', university=f'大学{i % 200}', major='计算机', email=f'student{i}@example.com',
+            grade=grades[i % 5], group=f'{i % 20}组', bio='个人简介' * 20, is_approved=i % 5 != 0,
+            join_date=now - timedelta(minutes=i), created_at=now - timedelta(minutes=i)),
+        app_module.ContactMessage: lambda i: dict(
+            name=f'访客{i}', email=f'visitor{i}@example.com', subject='咨询', message='留言内容' * 10,
+            is_read=i % 3 != 0, created_at=now - timedelta(minutes=i)),
+    }
+
+    with app_module.app.app_context():
+        db.create_all()
+        db.session.add(app_module.Admin(username='admin', email='admin@example.com', password_hash=''))
+        db.session.add(app_module.ContactInfo(email='contact@example.com', phone='0971-0000000', address='西宁'))
+        for model, make_row in rows.items():
+            start = time.perf_counter()
+            for batch in batches(make_row, scale):
+                db.session.execute(model.__table__.insert(), batch)
+            db.session.commit()
+            print(f'插入 {model.__tablename__} {scale} 行，用时 {time.perf_counter() - start:.1f}s', file=sys.stderr)
+        app_module.init_search_index()
+        app_module.rebuild_search_index()
+        app_module.init_upload_refcount()
+        app_module.init_table_change()
+        if app_module.app.config['STATS_ROLLUP_ENABLED']:
+            app_module.init_stats_rollup()
+        db.session.execute(db.text('ANALYZE'))
+        db.session.commit()
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def make_client(app_module, admin):
+    client = app_module.app.test_client()
+    if admin:
+        with client.session_transaction() as session:
+            session['admin_id'] = 1
+            session['user_type'] = 'admin'
+    return client
+
+
+def bench_route(app_module, url, admin, concurrency, requests, warmup):
+    clients = [make_client(app_module, admin) for _ in range(concurrency)]
+    for i in range(warmup):
+        clients[i % concurrency].get(url).get_data()
+
+    remaining = [requests]
+    lock = threading.Lock()
+    latencies = []
+    errors = [0]
+
+    def worker(client):
+        while True:
+            with lock:
+                if remaining[0] <= 0:
+                    return
+                remaining[0] -= 1
+            start = time.perf_counter()
+            response = client.get(url)
+            response.get_data()
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+                if response.status_code != 200:
+                    errors[0] += 1
+
+    threads = [threading.Thread(target=worker, args=(client,)) for client in clients]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        'route': url,
+        'requests': len(latencies),
+        'errors': errors[0],
+        'throughput_rps': round(len(latencies) / wall, 2),
+        'mean_ms': round(sum(latencies) / len(latencies) * 1000, 3),
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 3),
+        'p95_ms': round(percentile(latencies, 0.95) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 3),
+        'max_ms': round(latencies[-1] * 1000, 3),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=APP_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scale', type=parse_scale, default='1k', help='每种数据的行数：1k/10k/100k/1m 或整数')
+    parser.add_argument('--database', help='数据库文件路径；文件已存在时直接复用（不检查行数）')
+    parser.add_argument('--concurrency', type=int, default=4, help='并发线程数')
+    parser.add_argument('--requests', type=int, default=200, help='每个路由的请求数')
+    parser.add_argument('--warmup', type=int, default=10, help='每个路由的预热请求数')
+    parser.add_argument('--routes', default='public,api,admin', help='要测试的路由组，逗号分隔：public/api/admin')
+    parser.add_argument('--no-page-cache', action='store_true', help='关闭页面缓存，测量每次实际渲染的开销')
+    parser.add_argument('--output', help='结果写入的 JSON 文件，默认输出到标准输出')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        database_path = args.database or os.path.join(directory, 'bench.db')
+        seeded = os.path.exists(database_path)
+        app_module = load_app(database_path)
+        app_module.app.config['EXPORT_FOLDER'] = os.path.join(directory, 'exports')
+        if not seeded:
+            seed_database(app_module, args.scale)
+        if args.no_page_cache:
+            app_module.page_cache.max_size = 0
+
+        results = []
+        for group in args.routes.split(','):
+            for url in ROUTES[group]:
+                result = bench_route(app_module, url, group == 'admin', args.concurrency, args.requests, args.warmup)
+                result['group'] = group
+                results.append(result)
+                print(f'{url:<28}{result["throughput_rps"]:>10.1f} req/s  p50 {result["p50_ms"]:.1f}ms  '
+                      f'p95 {result["p95_ms"]:.1f}ms  p99 {result["p99_ms"]:.1f}ms', file=sys.stderr)
+
+    report = {
+        'commit': git_commit(),
+        'started_at': datetime.now().isoformat(timespec='seconds'),
+        'scale': args.scale if not seeded else None,
+        'database_reused': seeded,
+        'concurrency': args.concurrency,
+        'requests_per_route': args.requests,
+        'page_cache': not args.no_page_cache,
+        'python': platform.python_version(),
+        'results': results,
+    }
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
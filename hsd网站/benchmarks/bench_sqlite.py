@@ -0,0 +1,128 @@
+"""SQLite 并发写入基准：默认连接参数与 WAL/PRAGMA/锁重试配置的写入吞吐对比
+
+用法（在 hsd网站 目录下）：
+    python benchmarks/bench_sqlite.py
+    python benchmarks/bench_sqlite.py --workers 8 --duration 10 --write-ratio 0.5
+
+每种配置使用一个新建的临时数据库，启动多个进程（模拟多个 worker），
+每个进程通过测试客户端混合发送：提交联系表单（插入）、把留言标记为已读（先读后写）和读取活动列表。
+“baseline” 不设置任何 PRAGMA、不重试，相当于改动之前的默认配置；“tuned” 使用 app.py 中的配置。
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_app(database_path, mode):
+    """在子进程中导入 app，需在导入前设置 DATABASE_URL"""
+    os.environ['DATABASE_URL'] = 'sqlite:///' + database_path
+    sys.path.insert(0, APP_DIR)
+    import app as app_module
+    if mode == 'baseline':
+        app_module.app.config['SQLITE_PRAGMAS'] = {}
+        app_module.app.config['DB_LOCK_RETRIES'] = 0
+    return app_module
+
+
+def setup_database(database_path, mode, messages):
+    app_module = load_app(database_path, mode)
+    with app_module.app.app_context():
+        app_module.db.create_all()
+        app_module.init_search_index()
+        app_module.init_upload_refcount()
+        app_module.init_table_change()
+        app_module.db.session.add(app_module.Admin(username='admin', email='admin@example.com', password_hash=''))
+        app_module.db.session.execute(app_module.ContactMessage.__table__.insert(), [
+            dict(name=f'访客{i}', email=f'{i}@example.com', subject='咨询', message='留言内容' * 10)
+            for i in range(messages)
+        ])
+        app_module.db.session.commit()
+
+
+def run_worker(database_path, mode, duration, write_ratio, messages, seed, results):
+    app_module = load_app(database_path, mode)
+    client = app_module.app.test_client()
+    with client.session_transaction() as session:
+        session['admin_id'] = 1
+        session['user_type'] = 'admin'
+
+    rng = random.Random(seed)
+    stats = {'writes': 0, 'failed': 0, 'reads': 0, 'latencies': []}
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        if rng.random() >= write_ratio:
+            client.get('/api/events')
+            stats['reads'] += 1
+            continue
+        if rng.random() < 0.5:
+            response = client.post('/api/contact', json={
+                'name': '压测', 'email': f'{seed}@example.com', 'subject': '压测', 'message': '并发写入测试'})
+            ok = response.status_code == 200 and response.get_json()['success']
+        else:
+            response = client.post(f'/admin/messages/{rng.randint(1, messages)}/read')
+            ok = response.status_code in (200, 302)
+        stats['latencies'].append(time.perf_counter() - start)
+        stats['writes'] += 1
+        if not ok:
+            stats['failed'] += 1
+    results.put(stats)
+
+
+def run_mode(mode, args):
+    context = multiprocessing.get_context('spawn')
+    with tempfile.TemporaryDirectory() as directory:
+        database_path = os.path.join(directory, 'bench.db')
+        setup = context.Process(target=setup_database, args=(database_path, mode, args.messages))
+        setup.start()
+        setup.join()
+
+        results = context.Queue()
+        workers = [context.Process(target=run_worker, args=(database_path, mode, args.duration,
+                                                             args.write_ratio, args.messages, seed, results))
+                   for seed in range(args.workers)]
+        for worker in workers:
+            worker.start()
+        stats = [results.get() for _ in workers]
+        for worker in workers:
+            worker.join()
+
+    latencies = sorted(latency for item in stats for latency in item['latencies'])
+    writes = sum(item['writes'] for item in stats)
+    failed = sum(item['failed'] for item in stats)
+    return {
+        'mode': mode,
+        'writes_per_second': (writes - failed) / args.duration,
+        'writes': writes,
+        'failed': failed,
+        'reads': sum(item['reads'] for item in stats),
+        'p50_ms': statistics.median(latencies) * 1000 if latencies else 0,
+        'p95_ms': latencies[int(len(latencies) * 0.95)] * 1000 if latencies else 0,
+        'max_ms': latencies[-1] * 1000 if latencies else 0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workers', type=int, default=8, help='并发进程数')
+    parser.add_argument('--duration', type=float, default=5, help='每种配置运行的秒数')
+    parser.add_argument('--write-ratio', type=float, default=0.5, help='写请求所占比例')
+    parser.add_argument('--messages', type=int, default=1000, help='预先插入的留言数')
+    args = parser.parse_args()
+
+    print(f'{"配置":<10}{"成功写入/秒":>12}{"写请求":>8}{"失败":>6}{"读请求":>8}{"p50ms":>9}{"p95ms":>9}{"最大ms":>9}')
+    for mode in ('baseline', 'tuned'):
+        result = run_mode(mode, args)
+        print(f'{result["mode"]:<10}{result["writes_per_second"]:>12.1f}{result["writes"]:>8}{result["failed"]:>6}'
+              f'{result["reads"]:>8}{result["p50_ms"]:>9.1f}{result["p95_ms"]:>9.1f}{result["max_ms"]:>9.1f}')
+
+
+if __name__ == '__main__':
+    main()
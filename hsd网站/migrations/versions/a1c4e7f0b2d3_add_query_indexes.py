@@ -0,0 +1,51 @@
+"""为常用筛选和排序字段添加索引
+
+Revision ID: a1c4e7f0b2d3
+Revises: 
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a1c4e7f0b2d3'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+# (索引名, 表名, 字段) —— 与 app.py 中各模型的 __table_args__ 保持一致
+INDEXES = [
+    ('ix_event_event_date', 'event', ['event_date']),
+    ('ix_event_category_event_date', 'event', ['category', 'event_date']),
+    ('ix_event_created_at', 'event', ['created_at']),
+    ('ix_news_publish_date', 'news', ['publish_date']),
+    ('ix_news_category_publish_date', 'news', ['category', 'publish_date']),
+    ('ix_news_created_at', 'news', ['created_at']),
+    ('ix_student_is_approved_created_at', 'student', ['is_approved', 'created_at']),
+    ('ix_student_created_at', 'student', ['created_at']),
+    ('ix_student_join_date', 'student', ['join_date']),
+    ('ix_student_grade', 'student', ['grade']),
+    ('ix_student_group', 'student', ['group']),
+    ('ix_student_university', 'student', ['university']),
+    ('ix_timeline_published_order', 'timeline', ['is_published', 'order_index', sa.text('created_at DESC')]),
+    ('ix_timeline_order', 'timeline', ['order_index', sa.text('created_at DESC')]),
+    ('ix_team_published_order', 'team', ['is_published', 'order_index', sa.text('created_at DESC')]),
+    ('ix_team_order', 'team', ['order_index', sa.text('created_at DESC')]),
+    ('ix_partner_published_order', 'partner', ['is_published', 'order_index', sa.text('created_at DESC')]),
+    ('ix_partner_order', 'partner', ['order_index', sa.text('created_at DESC')]),
+    ('ix_contact_message_created_at', 'contact_message', ['created_at']),
+]
+
+
+def upgrade():
+    # 用 db.create_all() 新建的数据库已经带有这些索引，因此使用 IF NOT EXISTS
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade():
+    for name, table, columns in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
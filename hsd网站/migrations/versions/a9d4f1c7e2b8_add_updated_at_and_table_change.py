@@ -0,0 +1,55 @@
+"""活动/新闻/学生增加 updated_at，table_change 记录删除时间，用于条件请求
+
+Revision ID: a9d4f1c7e2b8
+Revises: f2b5d8e1a9c3
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a9d4f1c7e2b8'
+down_revision = 'f2b5d8e1a9c3'
+branch_labels = None
+depends_on = None
+
+
+# 与 app.py 中的 CHANGE_TRACKED_TABLES / table_change_ddl() 保持一致
+CHANGE_TRACKED_TABLES = ('event', 'news', 'student', 'timeline', 'team', 'partner')
+
+
+def upgrade():
+    op.add_column('event', sa.Column('updated_at', sa.DateTime(), nullable=True))
+    op.add_column('news', sa.Column('updated_at', sa.DateTime(), nullable=True))
+    op.add_column('student', sa.Column('updated_at', sa.DateTime(), nullable=True))
+    op.execute('UPDATE event SET updated_at = created_at')
+    op.execute('UPDATE news SET updated_at = created_at')
+    op.execute('UPDATE student SET updated_at = COALESCE(created_at, join_date)')
+    op.create_index('ix_event_updated_at', 'event', ['updated_at'], unique=False)
+    op.create_index('ix_news_updated_at', 'news', ['updated_at'], unique=False)
+    op.create_index('ix_student_updated_at', 'student', ['updated_at'], unique=False)
+
+    op.create_table('table_change',
+    sa.Column('table_name', sa.String(length=50), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('table_name')
+    )
+    for table in CHANGE_TRACKED_TABLES:
+        op.execute(f"""CREATE TRIGGER IF NOT EXISTS {table}_change_delete AFTER DELETE ON {table} BEGIN
+            INSERT INTO table_change (table_name, deleted_at) VALUES ('{table}', strftime('%Y-%m-%d %H:%M:%f', 'now'))
+            ON CONFLICT(table_name) DO UPDATE SET deleted_at = excluded.deleted_at;
+        END""")
+
+
+def downgrade():
+    for table in CHANGE_TRACKED_TABLES:
+        op.execute(f'DROP TRIGGER IF EXISTS {table}_change_delete')
+    op.drop_table('table_change')
+    op.drop_index('ix_student_updated_at', table_name='student')
+    op.drop_index('ix_news_updated_at', table_name='news')
+    op.drop_index('ix_event_updated_at', table_name='event')
+    op.drop_column('student', 'updated_at')
+    op.drop_column('news', 'updated_at')
+    op.drop_column('event', 'updated_at')
@@ -0,0 +1,42 @@
+"""排序索引改为普通字段
+
+Revision ID: b2e5f8a1c7d4
+Revises: a1c4e7f0b2d3
+Create Date: 2026-10-18 10:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b2e5f8a1c7d4'
+down_revision = 'a1c4e7f0b2d3'
+branch_labels = None
+depends_on = None
+
+
+# Alembic autogenerate 无法正确比较 'created_at DESC' 表达式索引，每次都会报告变更，
+# 因此改为普通字段（SQLite 可以反向扫描索引，排序方向不影响使用）
+INDEXES = [
+    ('ix_timeline_published_order', 'timeline', ['is_published', 'order_index']),
+    ('ix_timeline_order', 'timeline', ['order_index']),
+    ('ix_team_published_order', 'team', ['is_published', 'order_index']),
+    ('ix_team_order', 'team', ['order_index']),
+    ('ix_partner_published_order', 'partner', ['is_published', 'order_index']),
+    ('ix_partner_order', 'partner', ['order_index']),
+]
+
+
+def recreate_indexes(last_column):
+    for name, table, columns in INDEXES:
+        op.drop_index(name, table_name=table, if_exists=True)
+        op.create_index(name, table, columns + [last_column])
+
+
+def upgrade():
+    recreate_indexes('created_at')
+
+
+def downgrade():
+    recreate_indexes(sa.text('created_at DESC'))
@@ -0,0 +1,83 @@
+"""添加 FTS5 全文索引及同步触发器
+
+Revision ID: b7d2e9a4c1f5
+Revises: b2e5f8a1c7d4
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7d2e9a4c1f5'
+down_revision = 'b2e5f8a1c7d4'
+branch_labels = None
+depends_on = None
+
+
+# 与 app.py 中的 SEARCH_INDEX_DDL 保持一致
+DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5(
+        kind UNINDEXED, ref_id UNINDEXED, title, body, tokenize='trigram')""",
+    """CREATE TRIGGER IF NOT EXISTS news_search_insert AFTER INSERT ON news BEGIN
+        INSERT INTO search_index(rowid, kind, ref_id, title, body)
+        VALUES (new.id * 4 + 1, 'news', new.id, new.title, new.content);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS news_search_update AFTER UPDATE OF title, content ON news BEGIN
+        UPDATE search_index SET title = new.title, body = new.content WHERE rowid = old.id * 4 + 1;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS news_search_delete AFTER DELETE ON news BEGIN
+        DELETE FROM search_index WHERE rowid = old.id * 4 + 1;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS event_search_insert AFTER INSERT ON event BEGIN
+        INSERT INTO search_index(rowid, kind, ref_id, title, body)
+        VALUES (new.id * 4 + 2, 'event', new.id, new.title, new.description || ' ' || new.location);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS event_search_update AFTER UPDATE OF title, description, location ON event BEGIN
+        UPDATE search_index SET title = new.title, body = new.description || ' ' || new.location
+        WHERE rowid = old.id * 4 + 2;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS event_search_delete AFTER DELETE ON event BEGIN
+        DELETE FROM search_index WHERE rowid = old.id * 4 + 2;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS student_search_insert AFTER INSERT ON student BEGIN
+        INSERT INTO search_index(rowid, kind, ref_id, title, body)
+        VALUES (new.id * 4 + 3, 'student', new.id, new.name,
+                new.university || ' ' || new.major || ' ' || new.email);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS student_search_update AFTER UPDATE OF name, university, major, email ON student BEGIN
+        UPDATE search_index SET title = new.name, body = new.university || ' ' || new.major || ' ' || new.email
+        WHERE rowid = old.id * 4 + 3;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS student_search_delete AFTER DELETE ON student BEGIN
+        DELETE FROM search_index WHERE rowid = old.id * 4 + 3;
+    END""",
+]
+
+BACKFILL = [
+    "DELETE FROM search_index",
+    """INSERT INTO search_index(rowid, kind, ref_id, title, body)
+       SELECT id * 4 + 1, 'news', id, title, content FROM news""",
+    """INSERT INTO search_index(rowid, kind, ref_id, title, body)
+       SELECT id * 4 + 2, 'event', id, title, description || ' ' || location FROM event""",
+    """INSERT INTO search_index(rowid, kind, ref_id, title, body)
+       SELECT id * 4 + 3, 'student', id, name, university || ' ' || major || ' ' || email FROM student""",
+]
+
+TRIGGERS = [
+    'news_search_insert', 'news_search_update', 'news_search_delete',
+    'event_search_insert', 'event_search_update', 'event_search_delete',
+    'student_search_insert', 'student_search_update', 'student_search_delete',
+]
+
+
+def upgrade():
+    for statement in DDL + BACKFILL:
+        op.execute(statement)
+
+
+def downgrade():
+    for name in TRIGGERS:
+        op.execute(f'DROP TRIGGER IF EXISTS {name}')
+    op.execute('DROP TABLE IF EXISTS search_index')
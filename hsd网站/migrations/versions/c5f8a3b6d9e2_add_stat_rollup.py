@@ -0,0 +1,33 @@
+"""添加统计汇总表 stat_rollup
+
+Revision ID: c5f8a3b6d9e2
+Revises: b7d2e9a4c1f5
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5f8a3b6d9e2'
+down_revision = 'b7d2e9a4c1f5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # 维护汇总表的触发器是可选的，启用 STATS_ROLLUP_ENABLED 后通过 flask rebuild-stats-rollup 安装
+    op.create_table('stat_rollup',
+    sa.Column('metric', sa.String(length=50), nullable=False),
+    sa.Column('bucket', sa.String(length=100), nullable=False),
+    sa.Column('value', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('metric', 'bucket')
+    )
+
+
+def downgrade():
+    for table in ('event', 'news', 'student'):
+        for action in ('insert', 'delete', 'update'):
+            op.execute(f'DROP TRIGGER IF EXISTS {table}_rollup_{action}')
+    op.drop_table('stat_rollup')
@@ -0,0 +1,33 @@
+"""学生邮箱统一转为小写
+
+Revision ID: c8f1d4a7e3b9
+Revises: a9d4f1c7e2b8
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c8f1d4a7e3b9'
+down_revision = 'a9d4f1c7e2b8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # 与 app.py 中的 normalize_email() 一致。只差大小写的多个邮箱只转换 id 最小的一个，
+    # 已有小写版本的也保持原样，避免违反唯一约束
+    op.execute("""
+        UPDATE student SET email = lower(trim(email))
+        WHERE email != lower(trim(email))
+          AND NOT EXISTS (SELECT 1 FROM student AS other WHERE other.email = lower(trim(student.email)))
+          AND id = (SELECT min(id) FROM student AS other
+                    WHERE lower(trim(other.email)) = lower(trim(student.email)))
+    """)
+
+
+def downgrade():
+    # 原来的大小写无法恢复
+    pass
@@ -0,0 +1,28 @@
+"""为活动和新闻添加列表摘要字段 excerpt
+
+Revision ID: d3e6b9f2a7c4
+Revises: c5f8a3b6d9e2
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd3e6b9f2a7c4'
+down_revision = 'c5f8a3b6d9e2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # 已有数据的摘要通过 flask backfill-excerpts 生成
+    op.add_column('event', sa.Column('excerpt', sa.String(length=300), nullable=True))
+    op.add_column('news', sa.Column('excerpt', sa.String(length=300), nullable=True))
+
+
+def downgrade():
+    # 不用 batch_alter_table：重建表会丢掉全文索引等触发器，SQLite 3.35+ 可直接 DROP COLUMN
+    op.drop_column('news', 'excerpt')
+    op.drop_column('event', 'excerpt')
@@ -0,0 +1,83 @@
+"""添加短词索引 search_short（中文单字/两字词、英文前缀）及同步触发器
+
+Revision ID: e4a7c2f9b1d6
+Revises: c8f1d4a7e3b9
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4a7c2f9b1d6'
+down_revision = 'c8f1d4a7e3b9'
+branch_labels = None
+depends_on = None
+
+
+# 与 app.py 中的 SEARCH_SHORT_DDL / SEARCH_SHORT_REBUILD 保持一致。
+# search_grams() 由 app.py 在数据库连接建立时注册，迁移通过 flask db upgrade 运行时可用
+DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS search_short USING fts5(
+        title, body, tokenize='unicode61', prefix='1 2')""",
+    """CREATE TRIGGER IF NOT EXISTS news_search_short_insert AFTER INSERT ON news BEGIN
+        INSERT INTO search_short(rowid, title, body)
+        VALUES (new.id * 4 + 1, search_grams(new.title), search_grams(new.content));
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS news_search_short_update AFTER UPDATE OF title, content ON news BEGIN
+        UPDATE search_short SET title = search_grams(new.title), body = search_grams(new.content)
+        WHERE rowid = old.id * 4 + 1;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS news_search_short_delete AFTER DELETE ON news BEGIN
+        DELETE FROM search_short WHERE rowid = old.id * 4 + 1;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS event_search_short_insert AFTER INSERT ON event BEGIN
+        INSERT INTO search_short(rowid, title, body)
+        VALUES (new.id * 4 + 2, search_grams(new.title), search_grams(new.description || ' ' || new.location));
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS event_search_short_update AFTER UPDATE OF title, description, location ON event BEGIN
+        UPDATE search_short SET title = search_grams(new.title),
+                                body = search_grams(new.description || ' ' || new.location)
+        WHERE rowid = old.id * 4 + 2;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS event_search_short_delete AFTER DELETE ON event BEGIN
+        DELETE FROM search_short WHERE rowid = old.id * 4 + 2;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS student_search_short_insert AFTER INSERT ON student BEGIN
+        INSERT INTO search_short(rowid, title, body)
+        VALUES (new.id * 4 + 3, search_grams(new.name),
+                search_grams(new.university || ' ' || new.major || ' ' || new.email));
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS student_search_short_update AFTER UPDATE OF name, university, major, email ON student BEGIN
+        UPDATE search_short SET title = search_grams(new.name),
+                                body = search_grams(new.university || ' ' || new.major || ' ' || new.email)
+        WHERE rowid = old.id * 4 + 3;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS student_search_short_delete AFTER DELETE ON student BEGIN
+        DELETE FROM search_short WHERE rowid = old.id * 4 + 3;
+    END""",
+]
+
+BACKFILL = [
+    "DELETE FROM search_short",
+    """INSERT INTO search_short(rowid, title, body)
+       SELECT rowid, search_grams(title), search_grams(body) FROM search_index""",
+]
+
+TRIGGERS = [
+    'news_search_short_insert', 'news_search_short_update', 'news_search_short_delete',
+    'event_search_short_insert', 'event_search_short_update', 'event_search_short_delete',
+    'student_search_short_insert', 'student_search_short_update', 'student_search_short_delete',
+]
+
+
+def upgrade():
+    for statement in DDL + BACKFILL:
+        op.execute(statement)
+
+
+def downgrade():
+    for name in TRIGGERS:
+        op.execute(f'DROP TRIGGER IF EXISTS {name}')
+    op.execute('DROP TABLE IF EXISTS search_short')
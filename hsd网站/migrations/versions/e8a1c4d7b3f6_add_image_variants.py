@@ -0,0 +1,28 @@
+"""记录上传图片生成的各尺寸版本
+
+Revision ID: e8a1c4d7b3f6
+Revises: d3e6b9f2a7c4
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e8a1c4d7b3f6'
+down_revision = 'd3e6b9f2a7c4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('event', sa.Column('image_variants', sa.JSON(), nullable=True))
+    op.add_column('news', sa.Column('image_variants', sa.JSON(), nullable=True))
+    op.add_column('student', sa.Column('avatar_variants', sa.JSON(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('student', 'avatar_variants')
+    op.drop_column('news', 'image_variants')
+    op.drop_column('event', 'image_variants')
@@ -0,0 +1,54 @@
+"""按内容哈希登记上传文件，触发器维护引用计数
+
+Revision ID: f2b5d8e1a9c3
+Revises: e8a1c4d7b3f6
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2b5d8e1a9c3'
+down_revision = 'e8a1c4d7b3f6'
+branch_labels = None
+depends_on = None
+
+
+# 与 app.py 中的 UPLOAD_REFERENCE_COLUMNS / upload_refcount_ddl() 保持一致
+REFERENCE_COLUMNS = {'news': 'image_url', 'event': 'image_url', 'student': 'avatar_url'}
+
+
+def upgrade():
+    # 已有的上传文件不登记，未被引用的由 flask sweep-uploads 按遗留文件清理
+    op.create_table('uploaded_file',
+    sa.Column('sha256', sa.String(length=64), nullable=False),
+    sa.Column('url', sa.String(length=200), nullable=False),
+    sa.Column('size', sa.Integer(), nullable=False),
+    sa.Column('ref_count', sa.Integer(), nullable=False),
+    sa.Column('uploaded_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('sha256'),
+    sa.UniqueConstraint('url')
+    )
+    for table, column in REFERENCE_COLUMNS.items():
+        op.execute(f"""CREATE TRIGGER IF NOT EXISTS {table}_upload_ref_insert AFTER INSERT ON {table}
+            WHEN new.{column} IS NOT NULL BEGIN
+            UPDATE uploaded_file SET ref_count = ref_count + 1 WHERE url = new.{column};
+        END""")
+        op.execute(f"""CREATE TRIGGER IF NOT EXISTS {table}_upload_ref_delete AFTER DELETE ON {table}
+            WHEN old.{column} IS NOT NULL BEGIN
+            UPDATE uploaded_file SET ref_count = ref_count - 1 WHERE url = old.{column};
+        END""")
+        op.execute(f"""CREATE TRIGGER IF NOT EXISTS {table}_upload_ref_update AFTER UPDATE OF {column} ON {table}
+            WHEN old.{column} IS NOT new.{column} BEGIN
+            UPDATE uploaded_file SET ref_count = ref_count - 1 WHERE url = old.{column};
+            UPDATE uploaded_file SET ref_count = ref_count + 1 WHERE url = new.{column};
+        END""")
+
+
+def downgrade():
+    for table in REFERENCE_COLUMNS:
+        for action in ('insert', 'delete', 'update'):
+            op.execute(f'DROP TRIGGER IF EXISTS {table}_upload_ref_{action}')
+    op.drop_table('uploaded_file')
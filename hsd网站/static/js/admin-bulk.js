@@ -0,0 +1,87 @@
+// 后台批量操作
+// 批量选择：容器带 data-bulk-url，内部的 .bulk-check 复选框的值为记录ID，
+// .bulk-select-all 为全选框，[data-bulk-action] 按钮提交选中的记录，
+// 按钮可带 data-confirm（确认提示）和 data-prompt（需要输入的值，作为 data-prompt-field 字段提交）
+// 排序调整：容器带 data-reorder-url，内部的 .order-input（data-id 为记录ID）修改后点击 [data-reorder-save] 一次保存
+
+function postBulk(url, payload) {
+    return fetch(url, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify(payload)
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (!data.success) {
+            alert(data.message || '操作失败，请重试');
+            return;
+        }
+        const missing = Object.values(data.results || {}).filter(result => result !== 'ok').length;
+        alert(missing ? `${data.message}（${missing} 条记录不存在或已被删除）` : data.message);
+        location.reload();
+    })
+    .catch(() => alert('操作失败，请重试'));
+}
+
+function initBulkSelect(container) {
+    const checks = () => Array.from(container.querySelectorAll('.bulk-check'));
+    const selectAll = container.querySelector('.bulk-select-all');
+    const counter = container.querySelector('.bulk-count');
+    const buttons = container.querySelectorAll('[data-bulk-action]');
+
+    function refresh() {
+        const selected = checks().filter(check => check.checked).length;
+        if (counter) counter.textContent = selected;
+        buttons.forEach(button => { button.disabled = selected === 0; });
+        if (selectAll) {
+            selectAll.checked = selected > 0 && selected === checks().length;
+            selectAll.indeterminate = selected > 0 && selected < checks().length;
+        }
+    }
+
+    if (selectAll) {
+        selectAll.addEventListener('change', () => {
+            checks().forEach(check => { check.checked = selectAll.checked; });
+            refresh();
+        });
+    }
+    container.addEventListener('change', event => {
+        if (event.target.classList.contains('bulk-check')) refresh();
+    });
+
+    buttons.forEach(button => {
+        button.addEventListener('click', () => {
+            const ids = checks().filter(check => check.checked).map(check => parseInt(check.value, 10));
+            if (!ids.length) return;
+            const payload = { action: button.dataset.bulkAction, ids: ids };
+            if (button.dataset.prompt) {
+                const value = prompt(button.dataset.prompt);
+                if (value === null) return;
+                payload[button.dataset.promptField] = value;
+            }
+            if (button.dataset.confirm && !confirm(button.dataset.confirm.replace('{count}', ids.length))) return;
+            postBulk(container.dataset.bulkUrl, payload);
+        });
+    });
+    refresh();
+}
+
+function initReorder(container) {
+    const save = container.querySelector('[data-reorder-save]');
+    if (!save) return;
+    save.addEventListener('click', () => {
+        const items = Array.from(container.querySelectorAll('.order-input'))
+            .filter(input => input.value !== input.defaultValue)
+            .map(input => ({ id: parseInt(input.dataset.id, 10), order_index: parseInt(input.value, 10) || 0 }));
+        if (!items.length) {
+            alert('排序没有变化');
+            return;
+        }
+        postBulk(container.dataset.reorderUrl, { items: items });
+    });
+}
+
+document.addEventListener('DOMContentLoaded', function() {
+    document.querySelectorAll('[data-bulk-url]').forEach(initBulkSelect);
+    document.querySelectorAll('[data-reorder-url]').forEach(initReorder);
+});
@@ -9,6 +9,7 @@ document.addEventListener('DOMContentLoaded', function() {
     initTooltips();
     initAnimations();
     initAdminPageTransition();
+    initLoadMore();
 });
 
 // 导航栏功能
@@ -241,11 +242,44 @@ const api = {
     }
 };
 
-// 加载更多学生数据
-function loadMoreStudents(page = 1) {
+// 列表页“加载更多”：请求片段接口，把返回的卡片HTML追加到列表末尾
+// 按钮本身是指向下一页的链接，脚本不可用时直接跳转
+function initLoadMore() {
+    document.querySelectorAll('[data-load-more]').forEach(button => {
+        button.addEventListener('click', function(e) {
+            e.preventDefault();
+            if (button.classList.contains('disabled')) return;
+            
+            const container = document.querySelector(button.dataset.target);
+            button.classList.add('disabled');
+            utils.showLoading(button);
+            
+            api.get(button.dataset.loadMore)
+                .then(data => {
+                    container.insertAdjacentHTML('beforeend', data.html);
+                    if (data.has_more) {
+                        button.dataset.loadMore = data.more_url;
+                        button.href = data.page_url;
+                    } else {
+                        button.parentElement.style.display = 'none';
+                    }
+                })
+                .catch(error => {
+                    utils.showMessage('加载失败，请重试', 'danger');
+                })
+                .finally(() => {
+                    button.classList.remove('disabled');
+                    utils.hideLoading(button);
+                });
+        });
+    });
+}
+
+// 加载更多学生数据（游标分页，cursor 为空时从第一页开始）
+function loadMoreStudents(cursor = '') {
     utils.showLoading(document.querySelector('#loadMoreBtn'));
     
-    api.get(`/api/students?page=${page}&per_page=12`)
+    api.get(`/api/students?cursor=${encodeURIComponent(cursor)}&per_page=12`)
         .then(data => {
             if (data.success) {
                 const studentsContainer = document.getElementById('studentsContainer');
@@ -257,9 +291,9 @@ function loadMoreStudents(page = 1) {
                 });
                 
                 // 如果还有更多数据，显示加载更多按钮
-                if (data.pagination.page < data.pagination.pages) {
+                if (data.has_more) {
                     loadMoreBtn.style.display = 'block';
-                    loadMoreBtn.onclick = () => loadMoreStudents(data.pagination.page + 1);
+                    loadMoreBtn.onclick = () => loadMoreStudents(data.next_cursor);
                 } else {
                     loadMoreBtn.style.display = 'none';
                 }
@@ -484,8 +518,10 @@ const search = {
     // 执行搜索
     performSearch: async function(query) {
         try {
-            const results = await api.get(`/api/search?q=${encodeURIComponent(query)}`);
-            search.displayResults(results);
+            // 静态站点（flask freeze）中搜索地址指向动态站点
+            const searchUrl = document.body.dataset.searchUrl || '/api/search';
+            const data = await api.get(`${searchUrl}?q=${encodeURIComponent(query)}`);
+            search.displayResults(data.results || []);
         } catch (error) {
             console.error('搜索失败:', error);
         }
@@ -0,0 +1,105 @@
+"""测试公共夹具：使用临时 SQLite 数据库导入 app，并提供 SQL 查询预算断言
+
+运行（在 hsd网站 目录下）：
+    python -m pytest
+"""
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEST_DIR = tempfile.mkdtemp(prefix='hsd-test-')
+
+# app 在导入时读取 DATABASE_URL，必须在导入前设置，避免改动仓库中的 qhsf_hsd.db
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(TEST_DIR, 'test.db')
+sys.path.insert(0, APP_DIR)
+
+import app as app_module  # noqa: E402
+
+SEED_ROWS = 24  # 超过一页（LIST_PAGE_SIZE），逐行查询时查询数会明显超出预算
+
+
+def seed_database():
+    db = app_module.db
+    now = datetime.utcnow()
+    db.session.add(app_module.Admin(username='admin', email='admin@example.com', password_hash=''))
+    for i in range(SEED_ROWS):
+        db.session.add(app_module.Event(
+            title=f'活动{i}', description='活动介绍' * 20, location='西宁',
+            event_date=now - timedelta(days=i * 10), category=['讲座', '比赛', '交流'][i % 3]))
+        db.session.add(app_module.News(
+            title=f'新闻{i}', content='新闻内容' * 30, author='编辑部',
+            publish_date=now - timedelta(days=i * 7), category=['通知', '动态'][i % 2]))
+        db.session.add(app_module.Student(
+            name=f'学生{i}', university=f'大学{i % 4}', major='计算机', email=f'student{i}@example.com',
+            grade=['大一', '大二', '大三'][i % 3], group=['A组', 'B组', None][i % 3], bio='个人简介' * 5,
+            is_approved=i % 4 != 0))
+        db.session.add(app_module.ContactMessage(
+            name=f'访客{i}', email=f'visitor{i}@example.com', subject='咨询', message='留言内容', is_read=i % 2 == 0))
+    for i in range(5):
+        db.session.add(app_module.Timeline(date=f'{2020 + i}年', title=f'大事记{i}', description='描述', order_index=i))
+        db.session.add(app_module.Team(name=f'成员{i}', position='干事', description='描述', order_index=i))
+        db.session.add(app_module.Partner(name=f'合作伙伴{i}', icon_class='fas fa-handshake', order_index=i))
+    db.session.add(app_module.ContactInfo(email='contact@example.com', phone='0971-0000000', address='西宁'))
+    db.session.commit()
+
+
+@pytest.fixture(scope='session')
+def app():
+    flask_app = app_module.app
+    flask_app.config.update(TESTING=True, EXPORT_FOLDER=os.path.join(TEST_DIR, 'exports'))
+    with flask_app.app_context():
+        app_module.db.create_all()
+        app_module.init_search_index()
+        app_module.init_upload_refcount()
+        app_module.init_table_change()
+        seed_database()
+        app_module.rebuild_search_index()
+        app_module.refresh_contact_info()
+    yield flask_app
+
+
+@pytest.fixture
+def client(app):
+    # 页面缓存命中时不执行查询，每个测试从空缓存开始
+    app_module.page_cache.clear()
+    return app.test_client()
+
+
+@pytest.fixture
+def admin_client(client):
+    with client.session_transaction() as session:
+        session['admin_id'] = 1
+        session['user_type'] = 'admin'
+    return client
+
+
+@pytest.fixture
+def query_budget(app):
+    """with query_budget(5, '/about'): ... 代码块内执行的SQL超过5条或出现重复形态（N+1）时测试失败"""
+    @contextmanager
+    def budget(max_queries, label=''):
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(Engine, 'before_cursor_execute', record)
+        try:
+            yield statements
+        finally:
+            event.remove(Engine, 'before_cursor_execute', record)
+
+        listing = '\n'.join(f'  {app_module.query_fingerprint(statement)}' for statement in statements)
+        assert len(statements) <= max_queries, \
+            f'{label} 执行了 {len(statements)} 条SQL，超过预算 {max_queries}：\n{listing}'
+        repeated = app_module.find_repeated_queries(statements)
+        assert not repeated, f'{label} 疑似N+1查询：\n' + '\n'.join(
+            f'  {count} 次: {fingerprint}' for fingerprint, count in repeated)
+    return budget
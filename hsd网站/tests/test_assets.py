@@ -0,0 +1,59 @@
+"""静态资源指纹：构建带哈希的文件和压缩版本，模板地址自动替换，指纹文件永久缓存"""
+import gzip
+import os
+import shutil
+
+import pytest
+from flask import url_for
+
+import app as app_module
+
+
+@pytest.fixture
+def built_assets(app, tmp_path, monkeypatch):
+    for directory in app_module.ASSET_DIRS:
+        shutil.copytree(os.path.join(app.static_folder, directory), tmp_path / directory)
+    saved = dict(app_module.asset_manifest)
+    monkeypatch.setattr(app, 'static_folder', str(tmp_path))
+    monkeypatch.setattr(app_module, 'ASSET_MANIFEST', str(tmp_path / app_module.ASSET_DIST / 'manifest.json'))
+    yield app_module.build_assets()
+    app_module.asset_manifest.clear()
+    app_module.asset_manifest.update(saved)
+
+
+def test_build_writes_hashed_and_compressed_files(app, built_assets):
+    hashed = built_assets['css/style.css']
+    assert hashed.startswith('css/style.') and hashed.endswith('.css') and hashed != 'css/style.css'
+    target = os.path.join(app.static_folder, app_module.ASSET_DIST, hashed)
+    with open(os.path.join(app.static_folder, 'css', 'style.css'), 'rb') as source, open(target + '.gz', 'rb') as gz:
+        assert gzip.decompress(gz.read()) == source.read()
+    assert set(built_assets) >= {'js/main.js', 'images/logo.svg'}
+    app_module.load_asset_manifest()
+    assert app_module.asset_manifest == built_assets
+
+
+def test_url_for_uses_fingerprint_outside_debug(app, built_assets, monkeypatch):
+    with app.test_request_context():
+        assert url_for('static', filename='css/style.css') == f'/static/dist/{built_assets["css/style.css"]}'
+        assert url_for('static', filename='css/missing.css') == '/static/css/missing.css'
+        monkeypatch.setattr(app, 'debug', True)
+        assert url_for('static', filename='css/style.css') == '/static/css/style.css'
+
+
+def test_hashed_files_are_immutable_and_precompressed(client, built_assets):
+    url = f'/static/dist/{built_assets["js/main.js"]}'
+    response = client.get(url, headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert response.cache_control.immutable and response.cache_control.max_age == app_module.IMMUTABLE_MAX_AGE
+    plain = client.get(url, headers={'Accept-Encoding': 'identity'})
+    assert 'Content-Encoding' not in plain.headers and gzip.decompress(response.data) == plain.data
+    response.close()
+    plain.close()
+
+
+def test_source_files_keep_default_caching(client):
+    response = client.get('/static/css/style.css')
+    assert response.status_code == 200 and not response.cache_control.immutable
+    response.close()
+    assert client.get('/static/dist/css/missing.0123456789ab.css').status_code == 404
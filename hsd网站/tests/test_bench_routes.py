@@ -0,0 +1,31 @@
+"""路由压测脚本：规模参数、分位数和各路由在测试数据上都能正常请求"""
+import os
+import sys
+
+import pytest
+
+import app as app_module
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+
+import bench_routes  # noqa: E402
+
+
+@pytest.mark.parametrize('value, expected', [('1k', 1000), ('1M', 1000000), ('2500', 2500)])
+def test_parse_scale(value, expected):
+    assert bench_routes.parse_scale(value) == expected
+
+
+def test_percentile():
+    values = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
+    assert bench_routes.percentile(values, 0.5) == 6
+    assert bench_routes.percentile(values, 0.99) == 10
+    assert bench_routes.percentile([], 0.5) == 0.0
+
+
+@pytest.mark.parametrize('group', sorted(bench_routes.ROUTES))
+def test_every_route_answers(app, group):
+    for url in bench_routes.ROUTES[group]:
+        result = bench_routes.bench_route(app_module, url, group == 'admin', concurrency=2, requests=4, warmup=1)
+        assert (result['route'], result['requests'], result['errors']) == (url, 4, 0)
+        assert result['p50_ms'] <= result['p99_ms'] <= result['max_ms']
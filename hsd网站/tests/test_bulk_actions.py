@@ -0,0 +1,106 @@
+"""后台批量操作：逐个返回结果，每个请求只执行一条语句"""
+import pytest
+
+import app as app_module
+
+MISSING_ID = 10 ** 6
+
+
+@pytest.fixture
+def new_students(app):
+    with app.app_context():
+        students = [app_module.Student(name=f'批量{i}', university='青海大学', major='数学',
+                                       email=f'bulk{i}@example.com', is_approved=False)
+                    for i in range(3)]
+        app_module.db.session.add_all(students)
+        app_module.db.session.commit()
+        ids = [student.id for student in students]
+    yield ids
+    with app.app_context():
+        app_module.Student.query.filter(app_module.Student.id.in_(ids)).delete()
+        app_module.db.session.commit()
+
+
+def students_by_id(ids):
+    return {student.id: student for student in app_module.Student.query.filter(app_module.Student.id.in_(ids))}
+
+
+def test_approve_reports_each_id(app, admin_client, new_students, query_budget):
+    with query_budget(1, 'bulk approve'):
+        data = admin_client.post('/admin/students/bulk', json={
+            'action': 'approve', 'ids': new_students + [MISSING_ID, new_students[0]]}).get_json()
+    assert data['success'] and data['count'] == 3
+    assert data['results'] == dict({str(i): 'ok' for i in new_students}, **{str(MISSING_ID): 'not_found'})
+    with app.app_context():
+        assert all(student.is_approved and student.approved_by == 1
+                   for student in students_by_id(new_students).values())
+
+
+def test_group_reject_and_delete(app, admin_client, new_students):
+    first, second, third = new_students
+    admin_client.post('/admin/students/bulk', json={'action': 'group', 'ids': [first, second], 'group': ' C组 '})
+    admin_client.post('/admin/students/bulk', json={'action': 'reject', 'ids': [first]})
+    data = admin_client.post('/admin/students/bulk', json={'action': 'delete', 'ids': [third]}).get_json()
+    assert data['results'] == {str(third): 'ok'}
+    with app.app_context():
+        students = students_by_id(new_students)
+        assert students[first].group == students[second].group == 'C组'
+        assert students[first].approved_by is None and third not in students
+    again = admin_client.post('/admin/students/bulk', json={'action': 'delete', 'ids': [third]}).get_json()
+    assert again['count'] == 0 and again['results'] == {str(third): 'not_found'}
+
+
+def test_group_cleared_to_null_and_length_checked(app, admin_client, new_students):
+    first = new_students[0]
+    admin_client.post('/admin/students/bulk', json={'action': 'group', 'ids': [first], 'group': 'D组'})
+    data = admin_client.post('/admin/students/bulk', json={'action': 'group', 'ids': [first], 'group': '  '}).get_json()
+    assert data['success'] and data['count'] == 1
+    with app.app_context():
+        assert students_by_id([first])[first].group is None
+        assert app_module.Student.query.filter(app_module.Student.group == '').count() == 0
+    for group in ('组' * 51, ['A组']):
+        data = admin_client.post('/admin/students/bulk', json={'action': 'group', 'ids': [first], 'group': group}).get_json()
+        assert not data['success']
+
+
+@pytest.mark.parametrize('payload', [
+    {'action': 'approve'},
+    {'action': 'approve', 'ids': []},
+    {'action': 'approve', 'ids': ['1']},
+    {'action': 'approve', 'ids': [True]},
+    {'action': 'approve', 'ids': list(range(1, app_module.BULK_MAX_IDS + 2))},
+    {'action': 'explode', 'ids': [1]},
+])
+def test_invalid_requests_rejected(admin_client, payload):
+    assert not admin_client.post('/admin/students/bulk', json=payload).get_json()['success']
+
+
+def test_bulk_requires_login(client):
+    assert client.post('/admin/students/bulk', json={'action': 'delete', 'ids': [1]}).status_code == 302
+
+
+def test_messages_mark_read(app, admin_client):
+    with app.app_context():
+        messages = [app_module.ContactMessage(name='访客', email='v@example.com', subject='批量', message='你好')
+                    for _ in range(2)]
+        app_module.db.session.add_all(messages)
+        app_module.db.session.commit()
+        ids = [message.id for message in messages]
+    data = admin_client.post('/admin/messages/bulk', json={'action': 'read', 'ids': ids}).get_json()
+    assert data['count'] == 2
+    data = admin_client.post('/admin/messages/bulk', json={'action': 'delete', 'ids': ids + [MISSING_ID]}).get_json()
+    assert data['count'] == 2 and data['results'][str(MISSING_ID)] == 'not_found'
+
+
+def test_reorder_in_one_statement(app, admin_client, query_budget):
+    with app.app_context():
+        ids = [row.id for row in app_module.Timeline.query.order_by(app_module.Timeline.id)]
+    order = [{'id': row_id, 'order_index': len(ids) - i} for i, row_id in enumerate(ids)]
+    with query_budget(1, 'reorder'):
+        data = admin_client.post('/admin/timeline/reorder', json={'items': order}).get_json()
+    assert data['count'] == len(ids)
+    with app.app_context():
+        assert [row.id for row in app_module.Timeline.query.order_by(app_module.Timeline.order_index)] == ids[::-1]
+    # 恢复原来的顺序
+    admin_client.post('/admin/timeline/reorder', json={'items': [{'id': i, 'order_index': n} for n, i in enumerate(ids)]})
+    assert not admin_client.post('/admin/timeline/reorder', json={'items': [{'id': 'x'}]}).get_json()['success']
@@ -0,0 +1,52 @@
+"""响应压缩协商（gzip / brotli）"""
+import gzip
+
+import pytest
+
+import app as app_module
+
+
+def test_gzip_negotiation(client):
+    plain = client.get('/events').get_data()
+    response = client.get('/events', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert gzip.decompress(response.get_data()) == plain
+
+
+def test_identity_when_not_accepted(client):
+    for accept in (None, 'identity', 'gzip;q=0'):
+        headers = {'Accept-Encoding': accept} if accept else {}
+        response = client.get('/api/events', headers=headers)
+        assert 'Content-Encoding' not in response.headers
+        assert response.get_json()['success']
+
+
+def test_brotli_preferred_unless_lower_quality(client):
+    brotli = pytest.importorskip('brotli')
+    plain = client.get('/news').get_data()
+    response = client.get('/news', headers={'Accept-Encoding': 'gzip, br'})
+    assert response.headers['Content-Encoding'] == 'br'
+    assert brotli.decompress(response.get_data()) == plain
+    response = client.get('/news', headers={'Accept-Encoding': 'gzip, br;q=0.5'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+
+
+def test_small_responses_not_compressed(client, app, monkeypatch):
+    monkeypatch.setitem(app.config, 'COMPRESS_MIN_SIZE', 10 ** 9)
+    response = client.get('/api/events', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in response.headers
+
+
+def test_cached_page_compressed_once(client, monkeypatch):
+    calls = []
+    make_compressor = app_module.make_compressor
+
+    def counting(encoding, level=None):
+        calls.append(encoding)
+        return make_compressor(encoding, level)
+
+    monkeypatch.setattr(app_module, 'make_compressor', counting)
+    bodies = {client.get('/students', headers={'Accept-Encoding': 'gzip'}).get_data() for _ in range(3)}
+    assert calls == ['gzip'] and len(bodies) == 1
+    assert app_module.page_cache.hits >= 2
@@ -0,0 +1,35 @@
+"""条件请求（ETag / Last-Modified）与页面缓存"""
+import app as app_module
+
+
+def test_if_none_match_returns_304(client):
+    response = client.get('/events')
+    etag = response.headers['ETag']
+    assert response.status_code == 200 and etag.startswith('W/')
+
+    response = client.get('/events', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.headers['ETag'] == etag
+    assert response.get_data() == b''
+
+
+def test_if_modified_since_returns_304(client):
+    last_modified = client.get('/api/events').headers['Last-Modified']
+    assert client.get('/api/events', headers={'If-Modified-Since': last_modified}).status_code == 304
+    assert client.get('/api/events', headers={'If-Modified-Since': 'Mon, 01 Jan 2001 00:00:00 GMT'}).status_code == 200
+
+
+def test_write_from_other_process_bypasses_page_cache(app, client):
+    """不经过后台路由（不会按标签失效）修改数据，相当于其他 worker 写入：不能再返回缓存的旧正文"""
+    first = client.get('/events')
+    assert client.get('/events').headers['ETag'] == first.headers['ETag']
+
+    with app.app_context():
+        event = app_module.db.session.get(app_module.Event, 1)
+        event.title = '其他进程修改的活动'
+        app_module.db.session.commit()
+
+    response = client.get('/events', headers={'If-None-Match': first.headers['ETag']})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != first.headers['ETag']
+    assert '其他进程修改的活动' in response.get_data(as_text=True)
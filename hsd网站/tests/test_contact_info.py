@@ -0,0 +1,37 @@
+"""联系信息进程内缓存和每个请求的SQL计数响应头"""
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+import app as app_module
+
+
+def test_footer_does_not_query_contact_info(client):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(Engine, 'before_cursor_execute', record)
+    try:
+        response = client.get('/join')
+    finally:
+        event.remove(Engine, 'before_cursor_execute', record)
+    assert '0971-0000000' in response.get_data(as_text=True)
+    assert not [statement for statement in statements if 'contact_info' in statement]
+
+
+def test_query_count_header(app, client, monkeypatch):
+    assert 'X-Query-Count' not in client.get('/join').headers
+    monkeypatch.setitem(app.config, 'QUERY_COUNT_HEADER', True)
+    counts = [int(client.get(path).headers['X-Query-Count']) for path in ('/join', '/about')]
+    assert counts[0] < counts[1]
+
+
+def test_contact_edit_refreshes_cached_info(app, admin_client):
+    form = {'email': 'contact@example.com', 'address': '西宁'}
+    admin_client.post('/admin/contact/edit', data=dict(form, phone='0971-1111111'))
+    try:
+        assert app_module.get_contact_info().phone == '0971-1111111'
+        assert '0971-1111111' in app.test_client().get('/join').get_data(as_text=True)
+    finally:
+        admin_client.post('/admin/contact/edit', data=dict(form, phone='0971-0000000'))
@@ -0,0 +1,86 @@
+"""列表API的游标分页"""
+from datetime import datetime
+
+import pytest
+
+import app as app_module
+
+LISTS = [
+    ('/api/events', 'events', lambda: app_module.public_events_query(''), app_module.Event, 'event_date'),
+    ('/api/news', 'news', lambda: app_module.public_news_query(''), app_module.News, 'publish_date'),
+    ('/api/students', 'students', lambda: app_module.Student.query, app_module.Student, 'join_date'),
+]
+
+
+def walk(client, url, key, per_page):
+    ids, cursor, pages = [], '', 0
+    while True:
+        data = client.get(url, query_string={'cursor': cursor, 'per_page': per_page}).get_json()
+        assert data['success'] and data['per_page'] == per_page
+        assert len(data[key]) <= per_page
+        ids += [item['id'] for item in data[key]]
+        pages += 1
+        if not data['has_more']:
+            assert data['next_cursor'] is None
+            return ids, pages
+        cursor = data['next_cursor']
+
+
+@pytest.mark.parametrize('url, key, make_query, model, sort_key', LISTS)
+def test_cursor_walk_covers_every_row_once(app, client, url, key, make_query, model, sort_key):
+    with app.app_context():
+        sort_column = getattr(model, sort_key)
+        expected = [row.id for row in make_query().order_by(sort_column.desc(), model.id.desc())]
+    ids, pages = walk(client, url, key, 5)
+    assert ids == expected
+    assert pages == len(expected) // 5 + 1
+
+
+def test_ties_on_sort_column_broken_by_id(app, client):
+    same_time = datetime(2001, 1, 1)
+    with app.app_context():
+        for i in range(5):
+            app_module.db.session.add(app_module.Student(
+                name=f'同时加入{i}', university='青海大学', major='数学', email=f'tie{i}@example.com',
+                join_date=same_time))
+        app_module.db.session.commit()
+        tied = [row.id for row in app_module.Student.query.filter_by(join_date=same_time)]
+    ids, _ = walk(client, '/api/students', 'students', 2)
+    assert len(ids) == len(set(ids))
+    assert [i for i in ids if i in tied] == sorted(tied, reverse=True)
+
+
+def test_invalid_cursor_and_total(client):
+    assert not client.get('/api/events?cursor=not-a-cursor').get_json()['success']
+    data = client.get('/api/news?cursor=&per_page=1000&include_total=1').get_json()
+    assert data['per_page'] == app_module.MAX_CURSOR_PAGE_SIZE
+    assert data['total'] == len(data['news'])
+    assert 'total' not in client.get('/api/news?cursor=').get_json()
+
+
+def test_page_numbers_still_supported(client):
+    data = client.get('/api/events?page=2&per_page=5').get_json()
+    assert data['pagination']['page'] == 2 and len(data['events']) == 5
+
+
+def test_rows_without_sort_value_come_last(app, client):
+    with app.app_context():
+        students = [app_module.Student(name=f'无加入时间{i}', university='青海大学', major='数学',
+                                       email=f'no-date{i}@example.com') for i in range(3)]
+        app_module.db.session.add_all(students)
+        app_module.db.session.commit()
+        undated = [student.id for student in students]
+        app_module.db.session.execute(app_module.db.update(app_module.Student).where(
+            app_module.Student.id.in_(undated)).values(join_date=None))
+        app_module.db.session.commit()
+        expected = [row.id for row in app_module.Student.query.order_by(
+            app_module.Student.join_date.desc(), app_module.Student.id.desc())]
+    try:
+        ids, _ = walk(client, '/api/students', 'students', 2)
+        assert ids == expected and ids[-3:] == sorted(undated, reverse=True)
+        page = client.get('/students/more', query_string={'cursor': app_module.encode_cursor(None, undated[-1])})
+        assert page.status_code == 200 and page.get_json()['has_more'] is False
+    finally:
+        with app.app_context():
+            app_module.Student.query.filter(app_module.Student.id.in_(undated)).delete()
+            app_module.db.session.commit()
@@ -0,0 +1,59 @@
+"""列表摘要：保存时生成，列表页和列表API只返回摘要"""
+import pytest
+
+import app as app_module
+from app import make_excerpt
+
+
+@pytest.mark.parametrize('text, expected', [
+    (None, ''),
+    ('<p>第一段</p><p>第二段&amp;结尾</p>', '第一段 第二段&结尾'),
+    ('<script>alert(1)</script>正文<style>p {}</style>', '正文'),
+    ('  多个\n\n  空白  ', '多个 空白'),
+])
+def test_strips_markup(text, expected):
+    assert make_excerpt(text) == expected
+
+
+def test_cuts_on_characters_not_bytes():
+    assert make_excerpt('青海' * 100, length=5) == '青海青海青…'
+
+
+def test_keeps_combining_marks_with_base():
+    assert make_excerpt('abcdéfg', length=5) == 'abcd…'
+
+
+def test_backs_off_to_space_in_latin_words():
+    assert make_excerpt('a' * 145 + ' wonderful world') == 'a' * 145 + '…'
+
+
+def test_excerpt_filled_on_save_and_served_by_api(app, client):
+    with app.app_context():
+        news = app_module.News(title='摘要测试', content='<p>' + '摘要' * 200 + '</p>', author='编辑部',
+                                 category='通知')
+        app_module.db.session.add(news)
+        app_module.db.session.commit()
+        assert news.excerpt == '摘要' * 75 + '…'
+        news.content = '改写后的正文'
+        app_module.db.session.commit()
+        assert news.excerpt == '改写后的正文'
+        news_id = news.id
+    try:
+        items = client.get('/api/news?per_page=50').get_json()['news']
+        assert {item['id']: item['content'] for item in items}[news_id] == '改写后的正文'
+    finally:
+        with app.app_context():
+            app_module.News.query.filter_by(id=news_id).delete()
+            app_module.db.session.commit()
+
+
+def test_backfill_fills_missing_excerpts(app):
+    with app.app_context():
+        event_id, description = app_module.db.session.query(app_module.Event.id, app_module.Event.description).first()
+        app_module.db.session.execute(app_module.db.update(app_module.Event).where(
+            app_module.Event.id == event_id).values(excerpt=None))
+        app_module.db.session.commit()
+    result = app.test_cli_runner().invoke(args=['backfill-excerpts'])
+    assert 'event: 已生成 1 条摘要' in result.output
+    with app.app_context():
+        assert app_module.db.session.get(app_module.Event, event_id).excerpt == make_excerpt(description)
@@ -0,0 +1,107 @@
+"""后台导出任务：提交、轮询、下载、复用、失败和过期清理"""
+import json
+import os
+import time
+
+import pytest
+
+import app as app_module
+
+
+def create_job(client, **data):
+    response = client.post('/admin/students/export/jobs', json=data)
+    assert response.status_code == 202
+    return response.get_json()
+
+
+def wait_for(client, status_url, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = client.get(status_url).get_json()['job']
+        if job['status'] in ('done', 'failed'):
+            return job
+        time.sleep(0.02)
+    pytest.fail('导出任务未在限定时间内完成')
+
+
+def test_job_download_matches_streamed_export(admin_client):
+    created = create_job(admin_client, format='csv', grade='大二')
+    assert not created['reused']
+    job = wait_for(admin_client, created['status_url'])
+    assert job['status'] == 'done' and job['percent'] == 100
+    assert job['processed'] == job['total'] > 0
+
+    downloaded = admin_client.get(created['download_url'])
+    assert downloaded.status_code == 200 and downloaded.mimetype == 'text/csv'
+    streamed = admin_client.get('/admin/students/export?format=csv&grade=大二')
+    assert downloaded.get_data() == streamed.get_data()
+
+
+def test_same_filters_reuse_job(admin_client):
+    first = create_job(admin_client, format='ndjson', grade='大三')
+    wait_for(admin_client, first['status_url'])
+    second = create_job(admin_client, format='ndjson', grade='大三')
+    assert second['reused'] and second['job']['id'] == first['job']['id']
+    other = create_job(admin_client, format='ndjson', grade='大一')
+    assert not other['reused']
+    wait_for(admin_client, other['status_url'])
+
+
+def test_failed_job_leaves_no_file(app, admin_client, monkeypatch):
+    def broken_writer(rows):
+        yield b'partial'
+        raise RuntimeError('磁盘已满')
+
+    monkeypatch.setitem(app_module.EXPORT_WRITERS, 'ndjson', broken_writer)
+    created = create_job(admin_client, format='ndjson', search='失败测试')
+    job = wait_for(admin_client, created['status_url'])
+    assert job['status'] == 'failed' and '磁盘已满' in job['error']
+    path = os.path.join(app.config['EXPORT_FOLDER'], f"{job['id']}.ndjson")
+    assert not os.path.exists(path) and not os.path.exists(path + '.part')
+    assert admin_client.get(created['download_url']).status_code == 302
+
+
+def test_unknown_job_404(admin_client):
+    assert admin_client.get('/admin/students/export/jobs/' + '0' * 32).status_code == 404
+    assert admin_client.get('/admin/students/export/jobs/not-a-job').status_code == 404
+
+
+def test_cleanup_expired_jobs(app, admin_client):
+    created = create_job(admin_client, format='csv', group='B组')
+    wait_for(admin_client, created['status_url'])
+    job = app_module.load_export_job(created['job']['id'])
+    assert os.path.exists(job.path)
+
+    later = time.time() + app.config['EXPORT_RETENTION_SECONDS'] + 1
+    assert app_module.cleanup_export_jobs(now=later) >= 1
+    assert not os.path.exists(job.path) and not os.path.exists(job.state_path)
+    assert admin_client.get(created['status_url']).status_code == 404
+
+
+def test_state_is_shared_through_export_folder(app, admin_client):
+    # 轮询请求只依赖导出目录中的状态文件，不依赖创建任务的进程
+    created = create_job(admin_client, format='csv', grade='大一')
+    wait_for(admin_client, created['status_url'])
+    with open(os.path.join(app.config['EXPORT_FOLDER'], created['job']['id'] + '.json'), encoding='utf-8') as f:
+        state = json.load(f)
+    assert state['status'] == 'done' and state['filters']['grade'] == '大一'
+
+
+@pytest.mark.skipif(app_module.fcntl is None, reason='需要 fcntl 判断进程是否退出')
+def test_job_of_exited_process_is_failed_and_not_reused(app, admin_client):
+    with app.app_context():
+        job = app_module.ExportJob('csv', {'search': '', 'grade': '研一', 'group': ''})
+        job.status = 'running'
+        job.save()  # 模拟已退出的进程留下的状态：没有进程持有锁
+    status = admin_client.get(f'/admin/students/export/jobs/{job.id}').get_json()['job']
+    assert status['status'] == 'failed' and status['finished_at']
+
+    created = create_job(admin_client, format='csv', grade='研一')
+    assert not created['reused']
+    assert wait_for(admin_client, created['status_url'])['status'] == 'done'
+
+
+@pytest.mark.parametrize('body', [['csv'], 'csv', {'format': 'csv', 'grade': ['大一']}])
+def test_rejects_malformed_request(admin_client, body):
+    response = admin_client.post('/admin/students/export/jobs', json=body)
+    assert response.get_json()['success'] is False
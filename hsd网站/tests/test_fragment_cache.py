@@ -0,0 +1,27 @@
+"""{% cache %} 模板片段缓存"""
+from flask import render_template_string
+
+import app as app_module
+
+TEMPLATE = "{% cache ('test', version), 60 %}{{ value }}{% endcache %}"
+
+
+def test_fragment_reused_until_key_changes(app):
+    app_module.fragment_cache.clear()
+    with app.test_request_context():
+        assert render_template_string(TEMPLATE, version=1, value='第一次') == '第一次'
+        assert render_template_string(TEMPLATE, version=1, value='第二次') == '第一次'
+        assert render_template_string(TEMPLATE, version=2, value='第三次') == '第三次'
+    assert app_module.fragment_cache.hits >= 1
+
+
+def test_data_version_changes_after_edit(app, admin_client):
+    with app.test_request_context():
+        before = app_module.template_data_version('timeline')
+    with app.app_context():
+        timeline = app_module.db.session.get(app_module.Timeline, 1)
+        timeline.title = '修改后的大事记'
+        app_module.db.session.commit()
+    with app.test_request_context():
+        assert app_module.template_data_version('timeline') != before
+    assert '修改后的大事记' in admin_client.get('/about').get_data(as_text=True)
@@ -0,0 +1,28 @@
+"""静态站点导出：单进程导出后恢复 url_for 和片段缓存设置，搜索请求指向动态站点"""
+import os
+
+import app as app_module
+
+
+def test_single_process_freeze_restores_app(app, client, tmp_path, monkeypatch):
+    monkeypatch.setitem(app.config, 'FREEZE_DYNAMIC_URL', 'https://dynamic.example.com')
+    global_url_for = app.jinja_env.globals['url_for']
+    fragment_cache_enabled = app.config['FRAGMENT_CACHE_ENABLED']
+    with app.app_context():
+        result = app_module.freeze_site(str(tmp_path), workers=1)
+    assert result['rendered'] > 0 and result['failed'] == 0
+
+    assert 'url_for' not in app.__dict__
+    assert app.jinja_env.globals['url_for'] is global_url_for
+    assert app.config['FRAGMENT_CACHE_ENABLED'] == fragment_cache_enabled
+    page = client.get('/events').get_data(as_text=True)
+    assert 'https://dynamic.example.com' not in page and 'data-search-url="/api/search"' in page
+
+    with open(os.path.join(tmp_path, 'index.html'), encoding='utf-8') as f:
+        frozen = f.read()
+    assert 'data-search-url="https://dynamic.example.com/api/search"' in frozen
+
+
+def test_search_allows_cross_origin_requests(client):
+    response = client.get('/api/search?q=新闻', headers={'Origin': 'https://static.example.com'})
+    assert response.headers['Access-Control-Allow-Origin'] == '*'
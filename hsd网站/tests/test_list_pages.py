@@ -0,0 +1,62 @@
+"""活动/新闻/学生展示页的首屏分页与“加载更多”"""
+import html
+import re
+
+import pytest
+
+import app as app_module
+
+PAGES = [
+    ('/events', 'event-card', lambda: app_module.public_events_query('')),
+    ('/news', 'news-card', lambda: app_module.public_news_query('')),
+    ('/students', 'student-card', lambda: app_module.public_students_query()),
+]
+LOAD_MORE = re.compile(r'data-load-more="([^"]+)"')
+
+
+def count_cards(text, card_class):
+    return text.count(f'shadow-sm {card_class}')
+
+
+@pytest.mark.parametrize('url, card_class, make_query', PAGES)
+def test_load_more_walks_all_rows(app, client, url, card_class, make_query):
+    page_size = app.config['LIST_PAGE_SIZE']
+    with app.app_context():
+        total = make_query().count()
+    assert total > page_size
+
+    text = client.get(url).get_data(as_text=True)
+    assert count_cards(text, card_class) == page_size
+    more_url = html.unescape(LOAD_MORE.search(text).group(1))
+
+    seen = page_size
+    while more_url:
+        data = client.get(more_url).get_json()
+        assert data['success']
+        cards = count_cards(data['html'], card_class)
+        assert 0 < cards <= page_size
+        seen += cards
+        if data['has_more']:
+            # 不执行JS时使用的分页地址与下一次“加载更多”取同一页
+            page = client.get(data['page_url']).get_data(as_text=True)
+            assert count_cards(page, card_class) == count_cards(client.get(data['more_url']).get_json()['html'],
+                                                                card_class)
+        else:
+            assert data['more_url'] is None and data['page_url'] is None
+        more_url = data['more_url']
+    assert seen == total
+
+
+def test_category_filter(app, client, monkeypatch):
+    monkeypatch.setitem(app.config, 'LIST_PAGE_SIZE', 3)
+    text = client.get('/events?category=讲座').get_data(as_text=True)
+    assert set(re.findall(r'<span class="badge bg-primary">([^<]+)</span>', text)) == {'讲座'}
+    more_url = html.unescape(LOAD_MORE.search(text).group(1))
+    assert 'category=' in more_url
+    data = client.get(more_url).get_json()
+    assert set(re.findall(r'<span class="badge bg-primary">([^<]+)</span>', data['html'])) == {'讲座'}
+
+
+@pytest.mark.parametrize('url', ['/events?cursor=bogus', '/news/more?cursor=bogus', '/students?cursor=%%%'])
+def test_invalid_cursor_404(client, url):
+    assert client.get(url).status_code == 404
@@ -0,0 +1,89 @@
+"""写事务遇到数据库锁时的重试，以及只支持 SQLite 的启动检查"""
+import os
+import sqlite3
+import subprocess
+import sys
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+import app as app_module
+
+
+def locked_error(message='database is locked'):
+    return OperationalError('UPDATE student', {}, sqlite3.OperationalError(message))
+
+
+@pytest.fixture
+def fast_retries(app, monkeypatch):
+    monkeypatch.setitem(app.config, 'DB_LOCK_RETRY_DELAY', 0.001)
+    monkeypatch.setitem(app.config, 'SQLITE_PRAGMAS', dict(app.config['SQLITE_PRAGMAS'], busy_timeout=0))
+
+
+def make_transaction(failures, error=None):
+    calls = []
+
+    @app_module.retry_on_lock
+    def transaction():
+        calls.append(1)
+        if len(calls) <= failures:
+            raise error or locked_error()
+        return 'done'
+    return transaction, calls
+
+
+def test_retries_transaction_until_it_commits(app, fast_retries):
+    transaction, calls = make_transaction(2)
+    with app.app_context():
+        assert transaction() == 'done'
+    assert len(calls) == 3
+
+
+def test_gives_up_after_retries(app, fast_retries):
+    transaction, calls = make_transaction(100)
+    with app.app_context(), pytest.raises(OperationalError):
+        transaction()
+    assert len(calls) == app.config['DB_LOCK_RETRIES'] + 1
+
+
+def test_total_wait_is_capped(app, fast_retries, monkeypatch):
+    # 再等一次 busy_timeout 就会超过上限时不再重试
+    monkeypatch.setitem(app.config, 'SQLITE_PRAGMAS', dict(app.config['SQLITE_PRAGMAS'], busy_timeout=5000))
+    monkeypatch.setitem(app.config, 'DB_LOCK_MAX_WAIT', 4)
+    transaction, calls = make_transaction(100)
+    with app.app_context(), pytest.raises(OperationalError):
+        transaction()
+    assert len(calls) == 1
+
+
+def test_other_errors_are_not_retried(app, fast_retries):
+    transaction, calls = make_transaction(1, locked_error('no such table: student'))
+    with app.app_context(), pytest.raises(OperationalError):
+        transaction()
+    assert len(calls) == 1
+
+
+def test_contact_submission_retried_once_saved_once(app, client, fast_retries, monkeypatch):
+    commit = app_module.db.session.commit
+    attempts = []
+
+    def flaky_commit():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise locked_error()
+        commit()
+
+    monkeypatch.setattr(app_module.db.session, 'commit', flaky_commit)
+    response = client.post('/api/contact', json={
+        'name': '重试', 'email': 'retry@example.com', 'subject': '锁重试', 'message': '你好'})
+    monkeypatch.undo()
+    assert response.get_json()['success'] and len(attempts) == 2
+    with app.app_context():
+        assert app_module.ContactMessage.query.filter_by(subject='锁重试').count() == 1
+
+
+def test_rejects_non_sqlite_database_url(app):
+    env = dict(os.environ, DATABASE_URL='postgresql://user@localhost/hsd')
+    result = subprocess.run([sys.executable, '-c', 'import app'], cwd=app.root_path, env=env,
+                            capture_output=True, text=True)
+    assert result.returncode != 0 and 'DATABASE_URL' in result.stderr
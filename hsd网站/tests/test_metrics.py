@@ -0,0 +1,17 @@
+"""/metrics 访问控制"""
+
+
+def test_metrics_admin_only_by_default(client):
+    assert client.get('/metrics', environ_base={'REMOTE_ADDR': '127.0.0.1'}).status_code == 403
+
+
+def test_metrics_for_admin(admin_client):
+    response = admin_client.get('/metrics')
+    assert response.status_code == 200
+    assert 'hsd_request_duration_seconds' in response.get_data(as_text=True)
+
+
+def test_metrics_allowed_network(app, client, monkeypatch):
+    monkeypatch.setitem(app.config, 'METRICS_ALLOWED_NETWORKS', ['10.0.0.0/24'])
+    assert client.get('/metrics', environ_base={'REMOTE_ADDR': '10.0.0.5'}).status_code == 200
+    assert client.get('/metrics', environ_base={'REMOTE_ADDR': '10.0.1.5'}).status_code == 403
@@ -0,0 +1,122 @@
+"""公开页面缓存：LRU/TTL 淘汰、按标签失效，命中时不再渲染页面"""
+import gzip
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+import app as app_module
+
+
+@contextmanager
+def count_statements():
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(Engine, 'before_cursor_execute', record)
+    try:
+        yield statements
+    finally:
+        event.remove(Engine, 'before_cursor_execute', record)
+
+
+def test_lru_evicts_least_recently_used():
+    cache = app_module.PageCache(max_size=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1
+    cache.set('c', 3)
+    assert cache.get('b') is None
+    assert (cache.get('a'), cache.get('c'), len(cache)) == (1, 3, 2)
+
+
+def test_entries_expire_after_ttl():
+    cache = app_module.PageCache(ttl=0.01)
+    cache.set('a', 1)
+    time.sleep(0.02)
+    assert cache.get('a') is None and len(cache) == 0
+
+
+def test_invalidate_drops_tagged_entries_only():
+    cache = app_module.PageCache()
+    cache.set('/events', 1, ('events',))
+    cache.set('/', 2, ('events', 'news'))
+    cache.set('/news', 3, ('news',))
+    cache.invalidate('events')
+    assert (cache.get('/events'), cache.get('/'), cache.get('/news')) == (None, None, 3)
+
+
+@pytest.fixture
+def new_student(app):
+    with app.app_context():
+        student = app_module.Student(name='缓存测试生', university='青海大学', major='物理',
+                                     email='page-cache@example.com', is_approved=True)
+        app_module.db.session.add(student)
+        app_module.db.session.commit()
+        student_id = student.id
+    yield student_id
+    with app.app_context():
+        app_module.Student.query.filter_by(id=student_id).delete()
+        app_module.db.session.commit()
+
+
+def test_page_served_from_cache_until_admin_write(app, client, new_student):
+    with count_statements() as miss:
+        first = client.get('/students')
+    with count_statements() as hit:
+        second = client.get('/students')
+    assert first.status_code == second.status_code == 200
+    assert second.data == first.data and '缓存测试生' in first.get_data(as_text=True)
+    assert len(hit) < len(miss)
+
+    admin = app.test_client()
+    with admin.session_transaction() as session:
+        session['admin_id'] = 1
+        session['user_type'] = 'admin'
+    admin.post(f'/admin/students/{new_student}/delete')
+    assert '缓存测试生' not in client.get('/students').get_data(as_text=True)
+
+
+def test_logged_in_pages_bypass_cache(admin_client):
+    admin_client.get('/about')
+    assert len(app_module.page_cache) == 0
+
+
+def test_variant_built_once_and_shared():
+    cache = app_module.PageCache()
+    variants, calls = {}, []
+
+    def build():
+        calls.append(1)
+        return b'compressed'
+
+    assert cache.variant(variants, 'gzip', build) == b'compressed'
+    assert cache.variant(variants, 'gzip', build) == b'compressed'
+    assert len(calls) == 1 and variants == {'gzip': b'compressed'}
+
+
+def test_concurrent_variants_keep_first_result():
+    cache = app_module.PageCache()
+    variants = {}
+    barrier = threading.Barrier(8)
+
+    def build():
+        barrier.wait()  # 所有线程都在缓存为空时开始生成
+        return object()
+
+    with ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(lambda _: cache.variant(variants, 'br', build), range(8)))
+    assert all(result is variants['br'] for result in results)
+
+
+def test_compressed_page_served_from_cache(client):
+    first = client.get('/about', headers={'Accept-Encoding': 'gzip'})
+    second = client.get('/about', headers={'Accept-Encoding': 'gzip'})
+    assert first.headers['Content-Encoding'] == second.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(second.data) == gzip.decompress(first.data)
@@ -0,0 +1,46 @@
+"""密码哈希进程池：超时、工作进程退出和排队上限都返回503"""
+import os
+import time
+
+import pytest
+
+import app as app_module
+
+
+@pytest.fixture
+def password_pool(app, monkeypatch):
+    monkeypatch.setitem(app.config, 'PASSWORD_HASH_WORKERS', 1)
+    monkeypatch.setitem(app.config, 'PASSWORD_HASH_QUEUE', 0)
+    monkeypatch.setitem(app.config, 'PASSWORD_HASH_TIMEOUT', 0.5)
+    monkeypatch.setitem(app_module._password_pool, 'executor', None)
+    yield
+    executor = app_module._password_pool['executor']
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def test_timeout_returns_busy(app, password_pool):
+    with app.app_context(), pytest.raises(app_module.PasswordHashBusy):
+        app_module.run_password_task(time.sleep, 2)
+
+
+def test_queue_limit_returns_busy(app, password_pool):
+    with app.app_context():
+        future = app_module.submit_password_task(time.sleep, 0.3)
+        with pytest.raises(app_module.PasswordHashBusy):
+            app_module.run_password_task(abs, -1)
+        future.result()
+        assert app_module.run_password_task(abs, -1) == 1
+
+
+def test_broken_pool_is_rebuilt(app, password_pool):
+    with app.app_context():
+        with pytest.raises(app_module.PasswordHashBusy):
+            app_module.run_password_task(os._exit, 1)
+        assert app_module.run_password_task(abs, -2) == 2
+
+
+def test_busy_handler_returns_503(app):
+    with app.test_request_context('/api/login'):
+        response = app_module.password_hash_busy(app_module.PasswordHashBusy())
+    assert response.status_code == 503 and response.headers['Retry-After'] == '5'
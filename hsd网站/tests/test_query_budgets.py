@@ -0,0 +1,105 @@
+"""每个页面/接口的SQL查询数上限
+
+预算按当前实现设定，并且与数据量无关：种子数据超过一页，逐行查询会直接超出预算。
+修改视图导致查询数增加时，要么优化查询，要么在这里有理由地调整预算。
+"""
+import logging
+
+import pytest
+
+import app as app_module
+
+PUBLIC_BUDGETS = {
+    '/': 3,
+    '/about': 4,
+    '/events': 2,
+    '/events/more': 2,
+    '/news': 2,
+    '/news/more': 2,
+    '/students': 2,
+    '/students/more': 2,
+    '/join': 0,
+    '/login': 0,
+    '/api/events': 3,
+    '/api/news': 3,
+    '/api/students': 3,
+    '/api/stats': 5,
+    '/event/1': 1,
+    '/news/1': 1,
+    '/api/search?q=活动': 2,
+}
+
+ADMIN_BUDGETS = {
+    '/admin': 4,
+    '/admin/login': 0,
+    '/admin/applications': 2,
+    '/admin/students': 4,
+    '/admin/students/info': 3,
+    '/admin/students/export?format=csv': 1,
+    '/admin/statistics': 9,
+    '/admin/events': 2,
+    '/admin/events/create': 0,
+    '/admin/news': 2,
+    '/admin/news/create': 0,
+    '/admin/messages': 2,
+    '/admin/contact': 1,
+    '/admin/contact/edit': 1,
+    '/admin/timeline': 2,
+    '/admin/timeline/create': 0,
+    '/admin/team': 2,
+    '/admin/team/create': 0,
+    '/admin/partners': 2,
+    '/admin/partners/create': 0,
+    '/admin/write-buffer': 0,
+    '/metrics': 0,
+    '/admin/events/1/edit': 1,
+    '/admin/news/1/edit': 1,
+    '/admin/students/1/edit': 1,
+    '/admin/timeline/1/edit': 1,
+    '/admin/team/1/edit': 1,
+    '/admin/partners/1/edit': 1,
+}
+
+# 不需要预算的无参数 GET 路由：退出登录只清理会话
+EXEMPT_ROUTES = {'/logout', '/admin/logout'}
+
+
+@pytest.mark.parametrize('url, budget', PUBLIC_BUDGETS.items())
+def test_public_query_budget(client, query_budget, url, budget):
+    with query_budget(budget, url):
+        response = client.get(url)
+        response.get_data()
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize('url, budget', ADMIN_BUDGETS.items())
+def test_admin_query_budget(admin_client, query_budget, url, budget):
+    with query_budget(budget, url):
+        response = admin_client.get(url)
+        response.get_data()
+    assert response.status_code == 200
+
+
+def test_every_get_route_has_budget(app):
+    """新增页面时必须同时给出查询预算"""
+    budgeted = {url.split('?')[0] for url in list(PUBLIC_BUDGETS) + list(ADMIN_BUDGETS)}
+    missing = [rule.rule for rule in app.url_map.iter_rules()
+               if 'GET' in rule.methods and not rule.arguments
+               and rule.rule not in budgeted and rule.rule not in EXEMPT_ROUTES]
+    assert not missing, f'以下路由没有查询预算：{missing}'
+
+
+def test_query_fingerprint_normalizes_literals():
+    fingerprint = app_module.query_fingerprint(
+        "SELECT * FROM student WHERE id IN (?, ?, ?) AND name = 'x''y'\n  AND grade > 10")
+    assert fingerprint == 'SELECT * FROM student WHERE id IN (...) AND name = ? AND grade > ?'
+
+
+def test_audit_logs_repeated_statements(app, caplog):
+    statements = [f'SELECT * FROM student WHERE id = {i}' for i in range(5)] + ['SELECT count(*) FROM event']
+    with app.test_request_context('/students'):
+        app_module.g.sql_statements = statements
+        with caplog.at_level(logging.WARNING, logger=app.logger.name):
+            app_module.audit_queries(app.response_class())
+    assert '5 次: SELECT * FROM student WHERE id = ?' in caplog.text
+    assert 'count(*)' not in caplog.text
@@ -0,0 +1,106 @@
+"""站内搜索：触发器同步全文索引和短词索引，按相关度排序，短词也走索引"""
+import pytest
+
+import app as app_module
+
+
+def index_rows(table, rowid):
+    return app_module.db.session.execute(app_module.db.text(
+        f'SELECT title, body FROM {table} WHERE rowid = :rowid'), {'rowid': rowid}).all()
+
+
+def search(client, q, **params):
+    response = client.get('/api/search', query_string=dict(params, q=q))
+    return [(item['type'], item['id']) for item in response.get_json()['results']]
+
+
+@pytest.fixture
+def news_items(app):
+    """标题含词的新闻排在只有正文含词的新闻前面；第三条未发布"""
+    db = app_module.db
+    with app.app_context():
+        items = [
+            app_module.News(title='正文提到搜索', content='黑颈鹤保护区 Qzx 志愿者招募', author='编辑部',
+                            category='通知'),
+            app_module.News(title='黑颈鹤保护区 Qzx 志愿者', content='招募说明', author='编辑部', category='通知'),
+            app_module.News(title='黑颈鹤保护区草稿', content='未发布', author='编辑部', category='通知',
+                            is_published=False),
+        ]
+        db.session.add_all(items)
+        db.session.commit()
+        ids = [item.id for item in items]
+    yield ids
+    with app.app_context():
+        app_module.News.query.filter(app_module.News.id.in_(ids)).delete()
+        db.session.commit()
+
+
+def test_triggers_keep_both_indexes_in_sync(app):
+    db = app_module.db
+    with app.app_context():
+        event = app_module.Event(title='同步测试', description='描述', location='格尔木', category='讲座',
+                                 event_date=app_module.datetime.utcnow())
+        db.session.add(event)
+        db.session.commit()
+        rowid = event.id * 4 + app_module.SEARCH_KINDS['event']
+        assert index_rows('search_index', rowid) == [('同步测试', '描述 格尔木')]
+        assert index_rows('search_short', rowid)[0][0].split() == ['同', '步', '测', '试', '同步', '步测', '测试']
+
+        event.location = '德令哈'
+        db.session.commit()
+        assert index_rows('search_index', rowid) == [('同步测试', '描述 德令哈')]
+        assert '令哈' in index_rows('search_short', rowid)[0][1].split()
+
+        db.session.delete(event)
+        db.session.commit()
+        assert index_rows('search_index', rowid) == index_rows('search_short', rowid) == []
+
+
+def test_rebuild_matches_triggers(app):
+    with app.app_context():
+        before = app_module.db.session.execute(app_module.db.text(
+            'SELECT rowid, title, body FROM search_short ORDER BY rowid')).all()
+        app_module.rebuild_search_index()
+        after = app_module.db.session.execute(app_module.db.text(
+            'SELECT rowid, title, body FROM search_short ORDER BY rowid')).all()
+    assert after == before and len(after) > 0
+
+
+@pytest.mark.parametrize('q', ['黑颈鹤保护区', '颈鹤', '鹤', 'qz', '保护区 鹤'])
+def test_title_matches_rank_first_and_drafts_hidden(client, news_items, q):
+    first, second, draft = news_items
+    assert search(client, q, type='news') == [('news', second), ('news', first)]
+
+
+def test_short_terms_are_highlighted(client, news_items):
+    item = client.get('/api/search', query_string={'q': '颈鹤', 'type': 'news'}).get_json()['results'][0]
+    assert item['title'] == '黑<mark>颈鹤</mark>保护区 Qzx 志愿者'
+
+
+def test_short_terms_match_whole_characters_only(client, news_items):
+    # “鹤保”是标题中相邻的两个字，“黑鹤”不是
+    assert len(search(client, '鹤保', type='news')) == 2
+    assert search(client, '黑鹤', type='news') == []
+    assert search(client, '?!') == []
+
+
+def test_short_terms_use_index(app):
+    with app.app_context():
+        plan = app_module.db.session.execute(app_module.db.text(
+            'EXPLAIN QUERY PLAN SELECT rowid FROM search_short WHERE search_short MATCH :short'),
+            {'short': app_module.build_short_match_expression(['鹤'])}).all()
+    assert any('VIRTUAL TABLE INDEX' in row[-1] for row in plan)
+
+
+@pytest.mark.parametrize('terms, university', [('学生 大学3', '大学3'), ('学 大学3', '大学3'), ('sTu 大学2', '大学2')])
+def test_student_filter_combines_short_and_long_terms(app, terms, university):
+    with app.app_context():
+        names = {student.name for student in app_module.Student.query.filter(
+            app_module.student_search_filter(terms))}
+        expected = {student.name for student in app_module.Student.query.filter_by(university=university)}
+    assert names == expected and len(names) > 0
+
+
+def test_admin_student_search_with_short_terms(admin_client):
+    page = admin_client.get('/admin/students', query_string={'search': '学生 大学3'}).get_data(as_text=True)
+    assert '学生3' in page and '大学2' not in page
@@ -0,0 +1,60 @@
+"""后台统计：分组聚合与触发器维护的汇总表结果一致"""
+import pytest
+
+import app as app_module
+
+
+def drop_rollup_triggers():
+    for table in app_module.STATS_ROLLUP_METRICS:
+        for action in ('insert', 'delete', 'update'):
+            app_module.db.session.execute(app_module.db.text(f'DROP TRIGGER IF EXISTS {table}_rollup_{action}'))
+    app_module.db.session.commit()
+
+
+@pytest.fixture
+def rollup(app):
+    with app.app_context():
+        app_module.init_stats_rollup()
+        yield
+        drop_rollup_triggers()
+
+
+def test_pending_counts_unapproved_students(app):
+    with app.app_context():
+        stats = app_module.aggregate_statistics()
+        pending = app_module.Student.query.filter_by(is_approved=False).count()
+    assert pending > 0
+    assert stats['pending_students'] == pending
+    assert stats['approved_students'] + stats['pending_students'] == stats['total_students']
+
+
+def test_rollup_matches_aggregate_after_writes(app, admin_client, rollup):
+    assert app_module.rollup_statistics() == app_module.aggregate_statistics()
+    student = app_module.Student(name='统计', university='青海大学', major='化学', email='stats@example.com',
+                                 grade='大四')
+    app_module.db.session.add(student)
+    app_module.db.session.commit()
+    student_id = student.id
+    try:
+        admin_client.post('/admin/students/bulk', json={'action': 'approve', 'ids': [student_id]})
+        admin_client.post('/admin/students/bulk', json={'action': 'reject', 'ids': [student_id]})
+        stats = app_module.rollup_statistics()
+        assert stats == app_module.aggregate_statistics()
+        assert {'grade': '大四', 'count': 1} in stats['student_grades']
+    finally:
+        app_module.Student.query.filter_by(id=student_id).delete()
+        app_module.db.session.commit()
+    assert app_module.rollup_statistics() == app_module.aggregate_statistics()
+
+
+def test_outdated_triggers_are_replaced(app, rollup):
+    db = app_module.db
+    db.session.execute(db.text('DROP TRIGGER student_rollup_insert'))
+    db.session.execute(db.text('CREATE TRIGGER student_rollup_insert AFTER INSERT ON student BEGIN SELECT 1; END'))
+    db.session.execute(db.text("UPDATE stat_rollup SET value = 0 WHERE metric = 'students_pending'"))
+    db.session.commit()
+    app_module.init_stats_rollup()
+    sql = db.session.execute(db.text(
+        "SELECT sql FROM sqlite_master WHERE name = 'student_rollup_insert'")).scalar()
+    assert 'students_pending' in sql
+    assert app_module.rollup_statistics() == app_module.aggregate_statistics()
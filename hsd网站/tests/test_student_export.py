@@ -0,0 +1,54 @@
+"""学生信息流式导出（CSV / NDJSON / XLSX）"""
+import csv
+import io
+import json
+
+from openpyxl import load_workbook
+
+import app as app_module
+
+
+def student_count(app, **filters):
+    with app.app_context():
+        query = app_module.filter_students(app_module.db.session.query(app_module.Student.id), **filters)
+        return query.count()
+
+
+def test_csv_streamed_in_batches(app, admin_client, monkeypatch):
+    monkeypatch.setattr(app_module, 'EXPORT_BATCH_SIZE', 5)
+    response = admin_client.get('/admin/students/export?format=csv')
+    assert response.is_streamed
+    assert response.mimetype == 'text/csv'
+    assert "filename*=UTF-8''" in response.headers['Content-Disposition']
+    chunks = list(response.iter_encoded())
+    assert len(chunks) > 2
+
+    text = b''.join(chunks).decode('utf-8')
+    assert text.startswith('\ufeff')
+    rows = list(csv.reader(io.StringIO(text[1:])))
+    assert rows[0] == [title for _, title, _ in app_module.EXPORT_COLUMNS]
+    assert len(rows) - 1 == student_count(app)
+    ids = [int(row[0]) for row in rows[1:]]
+    assert ids == sorted(ids)
+
+
+def test_ndjson_with_filters(app, admin_client):
+    response = admin_client.get('/admin/students/export?format=ndjson&grade=大一')
+    records = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert records and {record['grade'] for record in records} == {'大一'}
+    assert len(records) == student_count(app, grade='大一')
+    assert set(records[0]) == {name for name, _, _ in app_module.EXPORT_COLUMNS}
+
+
+def test_xlsx_export(app, admin_client):
+    response = admin_client.get('/admin/students/export?format=xlsx&search=学生1')
+    sheet = load_workbook(io.BytesIO(response.get_data()), read_only=True).active
+    rows = list(sheet.iter_rows(values_only=True))
+    assert rows[0] == tuple(title for _, title, _ in app_module.EXPORT_COLUMNS)
+    assert len(rows) - 1 == student_count(app, search='学生1') > 0
+    assert all('学生1' in row[1] for row in rows[1:])
+
+
+def test_unsupported_format(admin_client):
+    response = admin_client.get('/admin/students/export?format=pdf')
+    assert response.status_code == 302
@@ -0,0 +1,80 @@
+"""批量导入学生：按邮箱（不区分大小写）新增或更新、错误报告、密码哈希"""
+import io
+
+from openpyxl import Workbook
+from werkzeug.security import check_password_hash
+
+import app as app_module
+
+
+def upload(client, data, filename, approve=True):
+    return client.post('/admin/students/import', content_type='multipart/form-data', data={
+        'file': (io.BytesIO(data), filename), 'approve': 'y' if approve else ''}).get_json()
+
+
+def student(email):
+    return app_module.Student.query.filter_by(email=email).one_or_none()
+
+
+def test_csv_upsert_and_error_report(app, admin_client):
+    rows = [
+        '姓名,大学,专业,邮箱,年级',
+        '导入新生,青海大学,化学,Imported.New@Example.com ,大一',
+        '学生一改名,大学1,物理,STUDENT1@example.com,',  # 已存在，邮箱大小写不同
+        '格式错误,青海大学,化学,not-an-email,大二',
+        ',青海大学,化学,missing-name@example.com,大二',
+    ]
+    result = upload(admin_client, '\n'.join(rows).encode('utf-8-sig'), 'students.csv')
+    assert result['success']
+    assert result['result'] == {'total': 4, 'created': 1, 'updated': 1, 'failed': 2}
+
+    with app.app_context():
+        created = student('imported.new@example.com')
+        assert created.grade == '大一' and created.is_approved
+        updated = student('student1@example.com')
+        assert updated.name == '学生一改名' and updated.major == '物理'
+        assert updated.bio == '个人简介' * 5  # 文件中没有的列保持原值
+        assert app_module.Student.query.filter(app_module.db.func.lower(app_module.Student.email)
+                                               == 'student1@example.com').count() == 1
+
+    report = admin_client.get(result['report_url']).get_data().decode('utf-8-sig').splitlines()
+    assert report[0] == '行号,错误,原始数据'
+    assert report[1].startswith('4,邮箱格式不正确')
+    assert report[2].startswith('5,姓名不能为空')
+
+
+def test_missing_required_column(admin_client):
+    result = upload(admin_client, '姓名,大学\n张三,青海大学\n'.encode('utf-8'), 'students.csv')
+    assert not result['success'] and '专业' in result['message'] and '邮箱' in result['message']
+
+
+def test_xlsx_with_passwords_uses_password_pool(app, admin_client, monkeypatch):
+    monkeypatch.setitem(app.config, 'PASSWORD_HASH_WORKERS', 1)
+    monkeypatch.setitem(app.config, 'PASSWORD_HASH_METHOD', 'pbkdf2:sha256:1000')
+    monkeypatch.setitem(app_module._password_pool, 'executor', None)
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(['name', 'university', 'major', 'email', 'phone', 'password'])
+    for i in range(app_module.IMPORT_HASH_CHUNK * 2 + 1):
+        sheet.append([f'表格导入{i}', '青海大学', '软件', f'xlsx{i}@example.com', 13800000000 + i, f'pass{i}'])
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+
+    try:
+        result = upload(admin_client, buffer.getvalue(), 'students.xlsx', approve=False)
+    finally:
+        app_module._password_pool['executor'].shutdown()
+    assert result['result']['created'] == app_module.IMPORT_HASH_CHUNK * 2 + 1
+    with app.app_context():
+        for i in (0, app_module.IMPORT_HASH_CHUNK * 2):
+            imported = student(f'xlsx{i}@example.com')
+            assert imported.phone == str(13800000000 + i) and not imported.is_approved
+            assert check_password_hash(imported.password_hash, f'pass{i}')
+
+
+def test_join_normalizes_email(app, client):
+    data = {'name': '大小写', 'university': '青海大学', 'major': '计算机', 'password': 'secret123'}
+    assert client.post('/api/join', json=dict(data, email=' Mixed.Case@Example.COM ')).get_json()['success']
+    assert not client.post('/api/join', json=dict(data, email='mixed.case@example.com')).get_json()['success']
+    with app.app_context():
+        assert student('mixed.case@example.com') is not None
@@ -0,0 +1,83 @@
+"""上传文件按内容去重、引用计数与清理"""
+import io
+import os
+
+import pytest
+
+import app as app_module
+
+Image = pytest.importorskip('PIL.Image')
+
+
+def png_bytes(color='red', size=(1200, 800)):
+    buffer = io.BytesIO()
+    Image.new('RGB', size, color).save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def upload_folder(app, tmp_path, monkeypatch):
+    """上传目录不在 static/uploads 下，路径必须从 UPLOAD_FOLDER 计算"""
+    monkeypatch.setitem(app.config, 'UPLOAD_FOLDER', str(tmp_path / 'uploads'))
+    monkeypatch.setitem(app.config, 'UPLOAD_SWEEP_GRACE', 0)
+    monkeypatch.setattr(app_module, 'schedule_image_processing', lambda *args: None)
+    return tmp_path / 'uploads'
+
+
+def create_news(client, data, title):
+    """后台编辑新闻时上传图片"""
+    news = app_module.News(title=title, content='内容', author='编辑部', category='通知')
+    app_module.db.session.add(news)
+    app_module.db.session.commit()
+    response = client.post(f'/admin/news/{news.id}/edit', content_type='multipart/form-data', data={
+        'title': title, 'content': '内容', 'category': '通知', 'is_published': 'y',
+        'image': (io.BytesIO(data), 'photo.png')})
+    assert response.status_code == 302
+    app_module.db.session.refresh(news)
+    return news
+
+
+def refcount(url):
+    return app_module.UploadedFile.query.filter_by(url=url).one().ref_count
+
+
+def test_same_content_stored_once_and_refcounted(app, admin_client, upload_folder):
+    data = png_bytes('blue')
+    with app.app_context():
+        first = create_news(admin_client, data, '上传测试一')
+        second = create_news(admin_client, data, '上传测试二')
+        url = first.image_url
+        assert second.image_url == url
+        assert url.startswith(app_module.UPLOAD_URL_PREFIX)
+        path = app_module.upload_file_path(url)
+        assert path.startswith(str(upload_folder)) and os.path.exists(path)
+        assert len([name for _, _, files in os.walk(upload_folder) for name in files]) == 1
+        assert refcount(url) == 2
+
+        admin_client.post(f'/admin/news/{first.id}/delete')
+        assert refcount(url) == 1
+        assert app_module.sweep_uploads() == []
+
+        admin_client.post(f'/admin/news/{second.id}/delete')
+        assert refcount(url) == 0
+        assert path in app_module.sweep_uploads()
+        assert not os.path.exists(path)
+        assert app_module.UploadedFile.query.filter_by(url=url).count() == 0
+
+
+def test_image_variants_written_under_upload_folder(app, admin_client, upload_folder):
+    with app.app_context():
+        news = create_news(admin_client, png_bytes('green'), '上传测试三')
+        variants = app_module.generate_image_variants(app_module.upload_file_path(news.image_url))
+        assert variants
+        for variant in variants.values():
+            for fmt in app_module.IMAGE_FORMATS:
+                assert variant[fmt].startswith(app_module.UPLOAD_URL_PREFIX)
+                assert os.path.exists(app_module.upload_file_path(variant[fmt]))
+        admin_client.post(f'/admin/news/{news.id}/delete')
+
+
+def test_upload_path_rejects_traversal(app):
+    with app.app_context():
+        assert app_module.upload_file_path('https://example.com/a.png') is None
+        assert app_module.upload_file_path(app_module.UPLOAD_URL_PREFIX + '../../app.py') is None
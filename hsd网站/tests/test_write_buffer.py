@@ -0,0 +1,104 @@
+"""公开表单写缓冲：受理、批量写入、去重与崩溃恢复"""
+import json
+import logging
+import os
+import time
+
+import pytest
+
+import app as app_module
+
+
+@pytest.fixture
+def write_buffer(app, tmp_path, monkeypatch):
+    """不启动后台线程的写缓冲，测试中手动 flush"""
+    monkeypatch.setitem(app.config, 'WRITE_BUFFER_ENABLED', True)
+    monkeypatch.setitem(app.config, 'WRITE_BUFFER_FOLDER', str(tmp_path / 'buffer'))
+    monkeypatch.setitem(app.config, 'PASSWORD_HASH_WORKERS', 0)
+    buffer = app_module.WriteBuffer()
+    buffer.started = True
+    monkeypatch.setattr(app_module, 'write_buffer', buffer)
+    return buffer
+
+
+def join(client, email):
+    return client.post('/api/join', json={
+        'name': '缓冲测试', 'university': '青海大学', 'major': '计算机', 'email': email, 'password': 'secret123'
+    }).get_json()
+
+
+def student_count(email):
+    return app_module.Student.query.filter_by(email=email).count()
+
+
+def test_join_and_contact_written_in_one_flush(app, client, write_buffer):
+    assert join(client, 'buffered@example.com')['success']
+    assert not join(client, 'buffered@example.com')['success']  # 缓冲区中已有相同邮箱
+    assert client.post('/api/contact', json={
+        'name': '访客', 'email': 'guest@example.com', 'subject': '缓冲留言', 'message': '你好'
+    }).get_json()['success']
+
+    with app.app_context():
+        assert student_count('buffered@example.com') == 0
+        assert write_buffer.metrics()['queue_depth'] == 2
+        assert write_buffer.flush() == 2
+        assert student_count('buffered@example.com') == 1
+        assert app_module.ContactMessage.query.filter_by(subject='缓冲留言').count() == 1
+    assert write_buffer.metrics()['queue_depth'] == 0
+    assert os.listdir(app.config['WRITE_BUFFER_FOLDER']) == []
+    assert not join(client, 'buffered@example.com')['success']  # 已入库
+
+
+def test_duplicate_email_counted_and_logged(app, client, write_buffer, caplog):
+    assert join(client, 'raced@example.com')['success']
+    with app.app_context():
+        # 受理后、写入前同一邮箱已通过其他途径入库
+        app_module.db.session.add(app_module.Student(
+            name='先到者', university='青海大学', major='数学', email='raced@example.com'))
+        app_module.db.session.commit()
+        with caplog.at_level(logging.WARNING, logger=app.logger.name):
+            write_buffer.flush()
+        assert student_count('raced@example.com') == 1
+    metrics = write_buffer.metrics()
+    assert metrics['dropped'] == 1 and metrics['flushed'] == 0
+    assert 'raced@example.com' in caplog.text
+
+
+def test_recover_spill_file(app, write_buffer):
+    folder = app.config['WRITE_BUFFER_FOLDER']
+    os.makedirs(folder)
+    with open(os.path.join(folder, 'crashed.log'), 'w', encoding='utf-8') as f:
+        f.write(json.dumps({'kind': 'contact', 'record': {
+            'name': '访客', 'email': 'guest@example.com', 'subject': '恢复的留言', 'message': '你好',
+            'created_at': '2026-01-01T00:00:00'}}) + '\n')
+        f.write('{"kind": "contact", "rec')  # 崩溃时写了一半的行
+    assert write_buffer.recover() == 1
+    with app.app_context():
+        assert write_buffer.flush() == 1
+        assert app_module.ContactMessage.query.filter_by(subject='恢复的留言').count() == 1
+    assert os.listdir(folder) == []
+
+
+def test_flush_metrics_exported(admin_client, write_buffer):
+    text = admin_client.get('/metrics').get_data(as_text=True)
+    for name in ('hsd_write_buffer_queue_depth', 'hsd_write_buffer_dropped_total',
+                 'hsd_write_buffer_flush_seconds_total', 'hsd_write_buffer_max_flush_seconds'):
+        assert f'\n{name} ' in text
+
+
+def test_first_request_recovers_spill_files(app, client, write_buffer, monkeypatch):
+    monkeypatch.setitem(app.config, 'WRITE_BUFFER_FLUSH_INTERVAL', 0.01)
+    write_buffer.started = False
+    folder = app.config['WRITE_BUFFER_FOLDER']
+    os.makedirs(folder)
+    with open(os.path.join(folder, 'crashed.log'), 'w', encoding='utf-8') as f:
+        f.write(json.dumps({'kind': 'contact', 'record': {
+            'name': '访客', 'email': 'guest@example.com', 'subject': '启动时恢复', 'message': '你好',
+            'created_at': '2026-01-01T00:00:00'}}) + '\n')
+    client.get('/about')
+    assert write_buffer.started
+    deadline = time.monotonic() + 5
+    while os.listdir(folder) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    with app.app_context():
+        assert app_module.ContactMessage.query.filter_by(subject='启动时恢复').count() == 1